@@ -6,6 +6,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from pde_solver.kernels import warm_kernel_cache
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pde_project.settings')
 
 application = get_asgi_application()
+
+# Load the most recently used compiled kernels before the first request needs them
+warm_kernel_cache()
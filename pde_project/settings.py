@@ -25,6 +25,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'pde_solver.metrics.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -94,3 +95,93 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # PDE Solver timeout (seconds)
 PDE_SOLVER_TIMEOUT = 30
+
+# Solves run in pre-forked child processes: a child is killed when it exceeds
+# PDE_SOLVER_TIMEOUT, capped at MEMORY_LIMIT_MB of extra address space (RLIMIT_AS)
+# and recycled after MAX_SOLVES_PER_CHILD solves
+PDE_SOLVER_SANDBOX = {
+    'ENABLED': True,
+    'PROCESSES': 2,
+    'MEMORY_LIMIT_MB': 1024,
+    'MAX_SOLVES_PER_CHILD': 100,
+}
+
+# Solution cache in front of PDESolver.solve_pde: in-process LRU with TTL,
+# optionally backed by a Django cache alias from CACHES (locmem, file, DB table)
+PDE_SOLUTION_CACHE = {
+    'MAX_ENTRIES': 1024,
+    'TIMEOUT': 3600,
+    'BACKEND': None,
+}
+
+# Batch endpoint: maximum items per request, concurrent solves (None: one per
+# sandbox process) and seconds spent canonicalizing items for deduplication
+PDE_SOLVE_BATCH = {
+    'MAX_ITEMS': 1000,
+    'CONCURRENCY': None,
+    'KEY_BUDGET': 2.0,
+}
+
+# Numeric evaluation of symbolic solutions (sweeps and sampling): maximum grid size,
+# number of terms kept from infinite Fourier series by default and at most (``terms``
+# requests are capped at MAX_SERIES_TERMS; points × terms per request at most
+# MAX_SERIES_POINTS, about a second of CPU), points evaluated per chunk and
+# the lambdify backend ('numpy', or 'numexpr' when installed); MAX_JSON_VALUES caps
+# array slices returned as JSON
+PDE_EVALUATION = {
+    'MAX_POINTS': 10_000_000,
+    'SERIES_TERMS': 50,
+    'MAX_SERIES_TERMS': 1000,
+    'MAX_SERIES_POINTS': 100_000_000,
+    'CHUNK_POINTS': 65536,
+    'BACKEND': 'numpy',
+    'MAX_JSON_VALUES': 100_000,
+}
+
+# Server-side plots (needs the optional matplotlib package): grid size for closed-form
+# solutions and the maximum number of rows/columns drawn from stored arrays
+PDE_PLOTS = {
+    'GRID_POINTS': 101,
+    'MAX_PIXELS': 400,
+}
+
+# Seconds the approximate solution count shown on the home and list pages is cached
+PDE_COUNT_CACHE_TIMEOUT = 60
+
+# In-process request/stage histograms served at /metrics/; SERVER_TIMING adds a
+# per-request Server-Timing header with the stage breakdown
+PDE_METRICS = {
+    'ENABLED': True,
+    'SERVER_TIMING': False,
+}
+
+# Thread pool behind the async solve API: WORKERS threads (default: one per sandbox
+# process), at most MAX_PENDING queued or running solves before 503 + Retry-After
+PDE_ASYNC_SOLVE = {
+    'WORKERS': None,
+    'MAX_PENDING': 64,
+    'RETRY_AFTER': 5,
+}
+
+# Progress streams (/api/solve/events/): seconds between keep-alive comments, the
+# CACHES alias holding run and cancel flags (must be shared by all workers for
+# cancels to reach any of them) and how long a run id stays cancellable
+PDE_PROGRESS = {
+    'HEARTBEAT': 15,
+    'CACHE': 'default',
+    'RUN_TIMEOUT': 600,
+}
+
+# Lambdified kernels (method-of-lines right-hand sides, solution evaluation) are kept as
+# generated source under DIRECTORY (None: in memory only), at most MAX_BYTES on disk with
+# least recently used files deleted first and MAX_LOADED per process; each worker loads
+# the WARM_KERNELS most recently used ones when it starts
+PDE_KERNEL_CACHE = {
+    'DIRECTORY': BASE_DIR / 'kernel_cache',
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'MAX_LOADED': 512,
+    'WARM_KERNELS': 64,
+}
+
+# Jobs left in 'running' longer than this (seconds) are requeued when a worker starts
+PDE_JOB_STALE_AFTER = 600
@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import PDESolution
+from .models import PDESolution, SolutionArray, SolveJob
+from .search import search_solutions
+
+
+class SolutionArrayInline(admin.TabularInline):
+    model = SolutionArray
+    fields = ('name', 'shape', 'dtype', 'file', 'created_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
 
 
 @admin.register(PDESolution)
@@ -7,13 +16,14 @@ class PDESolutionAdmin(admin.ModelAdmin):
     list_display = ('equation_preview', 'method_used', 'created_at')
     list_filter = ('method_used', 'created_at')
     search_fields = ('equation', 'solution')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('input_hash', 'created_at', 'updated_at')
+    inlines = [SolutionArrayInline]
     fieldsets = (
         ('Equation Details', {
             'fields': ('equation', 'boundary_conditions', 'initial_conditions')
         }),
         ('Solution', {
-            'fields': ('solution', 'method_used')
+            'fields': ('solution', 'expression', 'method_used', 'input_hash')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -24,3 +34,16 @@ class PDESolutionAdmin(admin.ModelAdmin):
     def equation_preview(self, obj):
         return obj.equation[:50] + '...' if len(obj.equation) > 50 else obj.equation
     equation_preview.short_description = 'Equation'
+    
+    def get_search_results(self, request, queryset, search_term):
+        # The full-text index instead of icontains scans over search_fields
+        if not search_term.strip():
+            return queryset, False
+        return search_solutions(search_term, queryset), False
+
+
+@admin.register(SolveJob)
+class SolveJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'method_used', 'created_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
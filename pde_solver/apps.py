@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class PdeSolverConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pde_solver'
+
+    def ready(self):
+        from .metrics import instrument_connection, metrics_config
+        if metrics_config()['ENABLED']:
+            connection_created.connect(instrument_connection, dispatch_uid='pde_metrics_instrument_connection')
@@ -0,0 +1,111 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .cache import canonical_key, cached_solve_pde
+from .sandbox import SANDBOX_DEFAULTS
+import logging
+
+logger = logging.getLogger(__name__)
+
+BATCH_DEFAULTS = {
+    'MAX_ITEMS': 1000,
+    'CONCURRENCY': None,
+    'KEY_BUDGET': 2.0,
+}
+
+
+def batch_config():
+    config = dict(BATCH_DEFAULTS)
+    config.update(getattr(settings, 'PDE_SOLVE_BATCH', {}))
+    if not config['CONCURRENCY']:
+        # One in-flight solve per sandbox child keeps every process busy
+        sandbox = dict(SANDBOX_DEFAULTS)
+        sandbox.update(getattr(settings, 'PDE_SOLVER_SANDBOX', {}))
+        config['CONCURRENCY'] = sandbox['PROCESSES'] if sandbox['ENABLED'] else 1
+    return config
+
+
+def _item_arguments(item):
+    """(equation, bc, ic) for a batch item, raising ValueError for malformed entries"""
+    if not isinstance(item, dict):
+        raise ValueError("Each item must be an object with an 'equation' key")
+    arguments = tuple(item.get(name) or '' for name in ('equation', 'boundary_conditions', 'initial_conditions'))
+    if not all(isinstance(value, str) for value in arguments):
+        raise ValueError("equation, boundary_conditions and initial_conditions must be strings")
+    if not arguments[0]:
+        raise ValueError("Equation is required")
+    return arguments
+
+
+def iter_batch(items, concurrency=None, key_budget=None):
+    """
+    Solve a list of {equation, boundary_conditions, initial_conditions} items.
+
+    Items with the same canonical form are solved once. Distinct solves fan
+    out over the sandbox process pool through cached_solve_pde, and this yields
+    ``(index, result)`` for every item as its solve finishes. Malformed items
+    produce an error result without being solved. Closing the generator early
+    cancels the solves that have not started yet.
+
+    Canonical keys are computed in this process, each one kept cheap by the
+    parser's limits; once they have taken ``key_budget`` seconds
+    (PDE_SOLVE_BATCH['KEY_BUDGET']) the remaining items are grouped by
+    their exact text instead, so the solves start without further parsing.
+    """
+    groups = {}
+    if key_budget is None:
+        key_budget = batch_config()['KEY_BUDGET']
+    deadline = time.monotonic() + key_budget
+    for index, item in enumerate(items):
+        try:
+            arguments = _item_arguments(item)
+        except ValueError as e:
+            yield index, {'solution': str(e), 'method': 'N/A', 'status': 'error'}
+            continue
+        key = arguments
+        if time.monotonic() < deadline:
+            try:
+                key = canonical_key(*arguments)
+            except ValueError:
+                # Unparseable: only byte-identical items share the (error) result
+                pass
+        groups.setdefault(key, (arguments, []))[1].append(index)
+
+    if not groups:
+        return
+    executor = ThreadPoolExecutor(max_workers=concurrency or batch_config()['CONCURRENCY'])
+    try:
+        futures = {executor.submit(cached_solve_pde, *arguments): indices for arguments, indices in groups.values()}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Batch solve failed: {str(e)}")
+                result = {'solution': f"Error solving PDE: {str(e)}", 'method': 'N/A', 'status': 'error'}
+            for index in futures[future]:
+                yield index, result
+    finally:
+        # Closed early (e.g. the client went away): drop the solves that have not started and do not wait
+        # for the running ones, which are bounded by the sandbox timeout
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_ndjson(items):
+    """NDJSON lines of iter_batch, one ``{"index": i, ...result}`` object each; closing it early cancels the batch"""
+    results = iter_batch(items)
+    try:
+        for index, result in results:
+            yield json.dumps(dict(result, index=index)) + '\n'
+    finally:
+        results.close()
+
+
+def solve_batch(items, concurrency=None, key_budget=None):
+    """Results of iter_batch in item order"""
+    results = [None] * len(items)
+    for index, result in iter_batch(items, concurrency, key_budget):
+        results[index] = result
+    return results
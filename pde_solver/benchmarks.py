@@ -0,0 +1,224 @@
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+import sympy as sp
+
+from .cache import get_solution_cache
+from .classifier import classify
+from .kernels import KernelCache
+from .models import PDESolution
+from .numerics import iter_wave, solve_heat_1d, solve_heat_1d_adaptive, solve_poisson_2d, solve_wave_adaptive
+from .pagination import encode_cursor
+from .parser import parse_expression
+from .solver import PDESolver
+
+
+# A named workload; ``setup`` runs before every timed call and is not measured
+Benchmark = namedtuple('Benchmark', ['name', 'func', 'setup', 'repeat'])
+
+
+def _clear_parse_caches():
+    parse_expression.cache_clear()
+    classify.cache_clear()
+
+
+def _solve(equation, bc="", ic="", mode='symbolic', options=None):
+    def run():
+        result = PDESolver.solve_pde(equation, bc, ic, mode=mode, options=options)
+        if result['status'] != 'success':
+            raise RuntimeError(result['solution'])
+    return run
+
+
+def _heat_1d():
+    u0 = np.sin(np.pi * np.linspace(0.0, 1.0, 100001))
+    solve_heat_1d(u0, 1.0, 1e-5, 1e-5, 100, 'crank-nicolson', 0.0, 0.0, 0)
+
+
+def _heat_1d_adaptive():
+    grid = np.linspace(0.0, 1.0, 2001)
+    solve_heat_1d_adaptive(np.sin(np.pi * grid), 1.0, grid[1], 0.1, rtol=1e-4, atol=1e-6)
+
+
+def _poisson_2d():
+    solve_poisson_2d(257, 257, (1.0, 1.0), np.ones((257, 257)), {}, 'multigrid', 1e-8, None)
+
+
+def _wave_1d():
+    grid = np.linspace(0.0, 1.0, 10001)
+    for _ in iter_wave(np.sin(np.pi * grid), np.zeros_like(grid), 1.0, (grid[1],), 0.5 * grid[1], 1000, every=1000):
+        pass
+
+
+def _wave_1d_adaptive():
+    grid = np.linspace(0.0, 1.0, 10001)
+    solve_wave_adaptive(np.sin(np.pi * grid), np.zeros_like(grid), 1.0, (grid[1],), 0.05, rtol=1e-4, atol=1e-6)
+
+
+def _kernel(cold):
+    """Compile a reaction-diffusion right-hand side into a fresh KernelCache: lambdify, or load from disk"""
+    x, t, u, u_x, u_xx = sp.symbols('x t U U_x U_xx')
+    rhs = sp.expand(0.01 * u_xx - u * u_x + u * (1 - u) * sp.exp(-x ** 2) * sp.cos(t))
+    arguments = [x, t, u, u_x, u_xx]
+    expressions = [rhs] + [rhs.diff(symbol) for symbol in arguments[2:]]
+    state = {}
+
+    def run():
+        if not cold and 'directory' not in state:
+            state['directory'] = tempfile.mkdtemp(prefix='pde-kernels-')
+            KernelCache(state['directory']).compile(arguments, expressions, cse=True)
+        KernelCache(state.get('directory')).compile(arguments, expressions, cse=True)
+    return run
+
+
+def _api(client, cold):
+    def run():
+        if cold:
+            get_solution_cache().clear()
+        response = client.post('/api/solve/', {
+            'equation': 'u_t = u_xx',
+            'boundary_conditions': 'u(0,t)=0, u(1,t)=0',
+            'initial_conditions': 'u(x,0)=sin(pi*x)',
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f'API returned {response.status_code}')
+    return run
+
+
+def _page(client, path, deep=False):
+    """GET a list page; ``deep`` starts past the first 90% of the table (run seed_solutions first)"""
+    state = {}
+
+    def run():
+        url = path
+        if deep:
+            if 'cursor' not in state:
+                depth = PDESolution.objects.count() * 9 // 10
+                row = PDESolution.objects.only('created_at').order_by('-created_at', '-pk')[depth:depth + 1].first()
+                state['cursor'] = encode_cursor(row) if row else ''
+            url = f"{path}?after={state['cursor']}"
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} returned {response.status_code}')
+    return run
+
+
+def default_benchmarks(client=None):
+    """The standard workloads; the API ones are included when a Django test client is given"""
+    benchmarks = [
+        Benchmark('parse_equation', lambda: PDESolver.parse_equation("u_tt = c^2*u_xx + sin(x)*u_x"),
+                  _clear_parse_caches, 200),
+        Benchmark('solve_pde.heat', _solve("u_t = D*u_xx", "u(0,t)=0, u(L,t)=0", "u(x,0)=sin(pi*x/L)"),
+                  _clear_parse_caches, 20),
+        Benchmark('solve_pde.wave', _solve("u_tt = c^2*u_xx", "", "u(x,0)=exp(-x**2), u_t(x,0)=0"),
+                  _clear_parse_caches, 20),
+        Benchmark('solve_pde.laplace', _solve("u_xx + u_yy = 0", "u(0,y)=0, u(1,y)=0, u(x,0)=0, u(x,1)=sin(pi*x)"),
+                  _clear_parse_caches, 20),
+        Benchmark('solve_pde.poisson', _solve("u_xx + u_yy = sin(pi*x)*sin(pi*y)",
+                                              "u(0,y)=0, u(1,y)=0, u(x,0)=0, u(x,1)=0"),
+                  _clear_parse_caches, 20),
+        Benchmark('solve_pde.advection', _solve("u_t + c*u_x = 0", "", "u(x,0)=exp(-x**2)"),
+                  _clear_parse_caches, 20),
+        Benchmark('solve_pde.analysis', _solve("u_t = u_xx + u*(1 - u)"), _clear_parse_caches, 20),
+        Benchmark('solve_pde.heat_numeric', _solve("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)",
+                                                   mode='numeric', options={'nx': 2001, 'steps': 200}),
+                  None, 10),
+        Benchmark('solve_pde.heat_adaptive', _solve("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)",
+                                                    mode='numeric', options={'nx': 2001, 'time_stepping': 'adaptive'}),
+                  None, 10),
+        Benchmark('solve_pde.burgers_numeric', _solve("u_t + u*u_x = D*u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(2*pi*x)",
+                                                      mode='numeric', options={'nx': 2001, 't_end': 0.5, 'params': {'D': 0.01}}),
+                  None, 10),
+        Benchmark('numerics.heat_1d', _heat_1d, None, 10),
+        Benchmark('numerics.heat_1d_adaptive', _heat_1d_adaptive, None, 10),
+        Benchmark('numerics.poisson_2d', _poisson_2d, None, 5),
+        Benchmark('numerics.wave_1d', _wave_1d, None, 5),
+        Benchmark('numerics.wave_1d_adaptive', _wave_1d_adaptive, None, 5),
+        Benchmark('kernels.compile', _kernel(cold=True), None, 20),
+        Benchmark('kernels.load_disk', _kernel(cold=False), None, 50),
+    ]
+    if client is not None:
+        benchmarks += [
+            Benchmark('api.solve_cold', _api(client, cold=True), None, 10),
+            Benchmark('api.solve_cached', _api(client, cold=False), None, 200),
+            Benchmark('views.home', _page(client, '/'), None, 100),
+            Benchmark('views.solution_list', _page(client, '/solutions/'), None, 100),
+            Benchmark('views.solution_list_deep', _page(client, '/solutions/', deep=True), None, 100),
+        ]
+    return benchmarks
+
+
+def peak_alloc_kb(benchmark):
+    """
+    Peak memory allocated during one call of ``benchmark``, in KiB.
+
+    Measured with tracemalloc relative to the memory already in use, so it
+    covers only this benchmark (Python objects and NumPy buffers in this
+    process; sandbox children are not traced). The call is made outside the
+    timed loop because tracing slows allocation down.
+    """
+    if benchmark.setup:
+        benchmark.setup()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        benchmark.func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return max(peak - before, 0) / 1024
+
+
+def run_benchmark(benchmark, repeat=None, warmup=1):
+    """Time a benchmark and return latency percentiles (ms), throughput (calls/s) and peak allocation"""
+    for _ in range(warmup):
+        if benchmark.setup:
+            benchmark.setup()
+        benchmark.func()
+
+    timings = []
+    for _ in range(repeat or benchmark.repeat):
+        if benchmark.setup:
+            benchmark.setup()
+        start = time.perf_counter()
+        benchmark.func()
+        timings.append(time.perf_counter() - start)
+
+    timings = np.array(timings) * 1000.0
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        'repeat': len(timings),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'mean_ms': float(timings.mean()),
+        'throughput': float(len(timings) / (timings.sum() / 1000.0)),
+        'peak_alloc_kb': peak_alloc_kb(benchmark),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Regressions of ``results`` against ``baseline``.
+
+    A benchmark regresses when its median latency or peak allocation grows by more
+    than ``threshold`` (a fraction, 0.25 = 25%). Benchmarks missing from either
+    side are ignored. Returns a list of human readable messages.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ('p50_ms', 'peak_alloc_kb'):
+            before, after = previous.get(metric), current.get(metric)
+            if before and after and after > before * (1 + threshold):
+                regressions.append(f'{name}: {metric} {before:.4g} -> {after:.4g} (+{(after / before - 1) * 100:.0f}%)')
+    return regressions
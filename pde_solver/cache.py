@@ -0,0 +1,198 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import sympy as sp
+from django.conf import settings
+from django.core.cache import caches
+
+from .conditions import split_top_level
+from .metrics import get_registry, record_cache_lookup, stage
+from .sandbox import sandboxed_solve_pde
+from .solver import PDESolver
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when solver output changes so stale entries in shared backends are ignored
+CACHE_VERSION = 2
+
+CACHE_DEFAULTS = {
+    'MAX_ENTRIES': 1024,
+    'TIMEOUT': 3600,
+    'BACKEND': None,
+}
+
+
+def normalize_conditions(conditions_str):
+    """Canonical form of a condition string: whitespace removed, items sorted"""
+    items = (re.sub(r'\s+', '', item) for item in split_top_level(conditions_str or ''))
+    return ';'.join(sorted(items))
+
+
+def canonical_equation(equation):
+    """
+    srepr of ``lhs - rhs`` (of the expression itself when it is not an Eq)
+    or of its negation, whichever sorts first, so ``u_t = u_xx``,
+    ``u_xx = u_t`` and ``u_t - u_xx`` all map to the same text.
+    """
+    difference = equation.lhs - equation.rhs if isinstance(equation, sp.Eq) else equation
+    return min(sp.srepr(difference), sp.srepr(-difference))
+
+
+def canonical_key(equation_str, boundary_conditions_str="", initial_conditions_str=""):
+    """Hash of the parsed equation's canonical_equation plus normalized conditions"""
+    equation, namespace = PDESolver.parse_equation(equation_str)
+    payload = '\n'.join([
+        canonical_equation(equation),
+        normalize_conditions(boundary_conditions_str),
+        normalize_conditions(initial_conditions_str),
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def input_hash(equation_str, boundary_conditions_str="", initial_conditions_str="", mode='symbolic'):
+    """
+    Key identifying a stored solution: canonical_key plus the solve mode.
+
+    Inputs that do not parse still get a key, from their whitespace-normalized
+    text, so identical submissions of them are recognized too. Views call this
+    before solving; the parser's limits keep it cheap for any input.
+    """
+    try:
+        key = canonical_key(equation_str, boundary_conditions_str, initial_conditions_str)
+    except Exception:
+        key = '\n'.join([
+            re.sub(r'\s+', '', equation_str),
+            normalize_conditions(boundary_conditions_str),
+            normalize_conditions(initial_conditions_str),
+        ])
+    return hashlib.sha256(f'{key}\n{mode}'.encode('utf-8')).hexdigest()
+
+
+class SolutionCache:
+    """
+    Two-tier cache for solve_pde results.
+
+    The first tier is an in-process LRU with a size limit and TTL; the optional
+    second tier is a Django cache alias (locmem, file, database, ...) shared
+    between workers. Entries found only in the second tier are promoted.
+    """
+
+    def __init__(self, max_entries=1024, timeout=3600, backend=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls):
+        config = dict(CACHE_DEFAULTS)
+        config.update(getattr(settings, 'PDE_SOLUTION_CACHE', {}))
+        return cls(config['MAX_ENTRIES'], config['TIMEOUT'], config['BACKEND'])
+
+    def _backend_key(self, key):
+        return f'pde_solution:{key}'
+
+    def get(self, key):
+        """Return a cached result or None, counting hits and misses"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    record_cache_lookup('memory')
+                    return dict(result)
+                del self._entries[key]
+                self.evictions += 1
+                get_registry().cache_evictions.inc()
+
+        if self.backend:
+            result = caches[self.backend].get(self._backend_key(key), version=CACHE_VERSION)
+            if result is not None:
+                self._store(key, result)
+                with self._lock:
+                    self.backend_hits += 1
+                record_cache_lookup('backend')
+                return dict(result)
+
+        with self._lock:
+            self.misses += 1
+        record_cache_lookup()
+        return None
+
+    def _store(self, key, result):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+                get_registry().cache_evictions.inc()
+
+    def set(self, key, result):
+        """Store a result in both tiers"""
+        self._store(key, result)
+        if self.backend:
+            caches[self.backend].set(self._backend_key(key), dict(result), self.timeout, version=CACHE_VERSION)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.backend_hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'backend_hits': self.backend_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_solution_cache = None
+
+
+def get_solution_cache():
+    """Process-wide SolutionCache built from settings.PDE_SOLUTION_CACHE"""
+    global _solution_cache
+    if _solution_cache is None:
+        _solution_cache = SolutionCache.from_settings()
+    return _solution_cache
+
+
+def cached_solve_pde(equation_str, boundary_conditions_str="", initial_conditions_str=""):
+    """
+    sandboxed_solve_pde behind the solution cache; only successful results are stored.
+
+    The key is computed in this process, which the parser's limits on
+    expression length, powers and derivative orders keep cheap; everything
+    else, including the error result for unparseable input, comes from the
+    sandbox.
+    """
+    cache = get_solution_cache()
+    try:
+        with stage('cache'):
+            key = canonical_key(equation_str, boundary_conditions_str, initial_conditions_str)
+            result = cache.get(key)
+    except ValueError:
+        # Unparseable input: let solve_pde produce its usual error result
+        return sandboxed_solve_pde(equation_str, boundary_conditions_str, initial_conditions_str)
+
+    if result is None:
+        result = sandboxed_solve_pde(equation_str, boundary_conditions_str, initial_conditions_str)
+        if result['status'] == 'success':
+            cache.set(key, result)
+    return result
@@ -0,0 +1,135 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import sympy as sp
+from sympy import Eq, Derivative
+from sympy.core.function import AppliedUndef
+
+
+# Structural description of a parsed PDE.
+# ``coefficients`` maps derivative keys such as ('t',) or ('x', 'x') (and () for u
+# itself) to their coefficient in ``lhs - rhs``; ``source`` holds the terms free of u.
+Classification = namedtuple('Classification', [
+    'function', 'variables', 'orders', 'order', 'principal', 'type', 'linear', 'family',
+    'coefficients', 'source',
+])
+
+def _derivative_key(derivative, variables):
+    """('x', 'x', 't')-style key for a derivative, letters in the order of u's arguments"""
+    counts = dict(derivative.variable_count)
+    return tuple(str(var) for var in variables for _ in range(counts.get(var, 0)))
+
+
+def _equation_type(principal, order):
+    """Elliptic/parabolic/hyperbolic from the signs of the principal part's eigenvalues"""
+    if order == 1:
+        return 'hyperbolic'
+    if order != 2 or principal is None:
+        return None
+    # Diagonal principal parts (the common case) need no eigenvalue computation
+    eigenvalues = {}
+    if principal.is_diagonal():
+        for value in principal.diagonal():
+            eigenvalues[value] = eigenvalues.get(value, 0) + 1
+    else:
+        eigenvalues = principal.eigenvals()
+    signs = []
+    for value, multiplicity in eigenvalues.items():
+        if value.is_zero:
+            sign = 0
+        elif value.is_positive:
+            sign = 1
+        elif value.is_negative:
+            sign = -1
+        else:
+            return None
+        signs.extend([sign] * multiplicity)
+    positive, negative = signs.count(1), signs.count(-1)
+    if 0 in signs:
+        return 'parabolic'
+    if positive == 0 or negative == 0:
+        return 'elliptic'
+    return 'hyperbolic' if min(positive, negative) == 1 else 'ultrahyperbolic'
+
+
+def _family(variables, coefficients, source, equation_type, linear):
+    """Match the derivative structure against the equation families the solvers know"""
+    if not linear or () in coefficients:
+        return None
+    names = tuple(str(var) for var in variables)
+    keys = set(coefficients)
+    if names == ('x', 't') and keys == {('t',), ('x', 'x')} and equation_type == 'parabolic' and source == 0:
+        return 'heat'
+    if names == ('x', 't') and keys == {('t',), ('x',)} and source == 0:
+        return 'advection'
+    if names in (('x', 't'), ('x', 'y', 't')) and equation_type == 'hyperbolic' and source == 0 and \
+            keys == {('t', 't')} | {(name, name) for name in names[:-1]}:
+        return 'wave'
+    if names == ('x', 'y') and keys == {('x', 'x'), ('y', 'y')} and equation_type == 'elliptic':
+        return 'laplace' if source == 0 else 'poisson'
+    return None
+
+
+@lru_cache(maxsize=1024)
+def classify(equation):
+    """
+    Classify a parsed PDE by walking its Derivative terms once.
+
+    Extracts per-variable derivative orders, the coefficient matrix of the
+    second-order (principal) part, the elliptic/parabolic/hyperbolic type,
+    linearity and, for linear equations with a known structure, the family
+    ('heat', 'wave', 'laplace', 'poisson', 'advection') used to pick a solver.
+    Results are memoized per equation, like parse_expression.
+    """
+    expr = equation.lhs - equation.rhs if isinstance(equation, Eq) else equation
+    functions = expr.atoms(AppliedUndef)
+    if len(functions) != 1:
+        raise ValueError("Equation must contain exactly one unknown function u(...)")
+    function = functions.pop()
+    variables = function.args
+
+    derivatives = [d for d in expr.atoms(Derivative) if d.expr == function]
+    orders = {str(var): 0 for var in variables}
+    for derivative in derivatives:
+        for var, count in derivative.variable_count:
+            orders[str(var)] = max(orders[str(var)], count)
+    order = max((derivative.derivative_count for derivative in derivatives), default=0)
+
+    # Replace u and its derivatives by placeholders so the remaining structure is plain algebra
+    placeholders = {derivative: sp.Dummy() for derivative in derivatives}
+    placeholders[function] = sp.Dummy()
+    reduced = expr.xreplace(placeholders)
+    dummies = list(placeholders.values())
+
+    # The equation is linear when every coefficient is free of u and its derivatives
+    restore = {dummy: term for term, dummy in placeholders.items()}
+    coefficients = {}
+    linear = True
+    for term, dummy in placeholders.items():
+        coefficient = reduced.diff(dummy) if reduced.has(dummy) else sp.Integer(0)
+        if coefficient.has(*dummies):
+            linear = False
+        if coefficient != 0:
+            key = () if term == function else _derivative_key(term, variables)
+            coefficients[key] = coefficient.xreplace(restore)
+    source = reduced.xreplace({dummy: sp.Integer(0) for dummy in dummies})
+
+    principal = None
+    if order == 2:
+        principal = sp.zeros(len(variables), len(variables))
+        index = {str(var): position for position, var in enumerate(variables)}
+        for key, coefficient in coefficients.items():
+            if len(key) == 2:
+                i, j = index[key[0]], index[key[1]]
+                if i == j:
+                    principal[i, i] = coefficient
+                else:
+                    principal[i, j] = principal[j, i] = coefficient / 2
+        if principal.has(function):
+            principal = None
+
+    equation_type = _equation_type(principal, order)
+    family = _family(variables, coefficients, source, equation_type, linear)
+    return Classification(
+        function, variables, orders, order, principal, equation_type, linear, family, coefficients, source
+    )
@@ -0,0 +1,270 @@
+import sympy as sp
+from sympy import Integral, oo
+
+from .conditions import parse_conditions
+from .parser import NAMESPACE
+
+x, y, t, L = NAMESPACE['x'], NAMESPACE['y'], NAMESPACE['t'], NAMESPACE['L']
+
+# Summation index for infinite Fourier series
+n = sp.Symbol('n', integer=True, positive=True)
+
+
+def trig_terms(expr, var):
+    """Split expr into [(coefficient, 'sin'|'cos'|'const', k)] terms in var, or None if it has other forms"""
+    terms = []
+    for term in sp.Add.make_args(sp.expand(expr)):
+        coefficient, rest = term.as_independent(var, as_Add=False)
+        if rest == 1:
+            terms.append((coefficient, 'const', sp.Integer(0)))
+            continue
+        for kind, func in (('sin', sp.sin), ('cos', sp.cos)):
+            if isinstance(rest, func):
+                k = rest.args[0].as_coefficient(var)
+                if k is not None:
+                    terms.append((coefficient, kind, k))
+                    break
+        else:
+            return None
+    return terms
+
+
+def sine_series(expr, var, length):
+    """
+    Fourier sine series of expr on [0, length].
+
+    Returns a list of (coefficient, n) pairs when expr is already a finite sum
+    of sin(nπ·var/length) modes, the general coefficient b_n as an expression
+    in ``n`` when the integral can be evaluated, or None otherwise.
+    """
+    if expr == 0:
+        return []
+    terms = trig_terms(expr, var)
+    if terms is not None:
+        modes = []
+        for coefficient, kind, k in terms:
+            mode = k * length / sp.pi
+            if kind != 'sin' or not (mode.is_integer and mode.is_positive):
+                break
+            modes.append((coefficient, mode))
+        else:
+            return modes
+    coefficient = sp.simplify(2 / length * sp.integrate(expr * sp.sin(n * sp.pi * var / length), (var, 0, length)))
+    if coefficient.has(Integral):
+        return None
+    return coefficient
+
+
+def series_sum(series, mode):
+    """Build Σ b_n·mode(n) from a sine_series result"""
+    if isinstance(series, list):
+        return sp.Add(*(coefficient * mode(index) for coefficient, index in series))
+    return sp.Sum(series * mode(n), (n, 1, oo))
+
+
+def _initial_values(initial_conditions_str, variables):
+    """u(·,0) and u_t(·,0) from the initial conditions, None where not given"""
+    displacement = velocity = None
+    for condition in parse_conditions(initial_conditions_str):
+        if len(condition.args) != len(variables) or condition.args[-1] != 0:
+            return None, None, False
+        if condition.derivative == '':
+            displacement = condition.value
+        elif condition.derivative == 't':
+            velocity = condition.value
+        else:
+            return None, None, False
+    return displacement, velocity, True
+
+
+def _interval(boundary_conditions_str):
+    """(length, left value, right value) for Dirichlet conditions u(0,t), u(ℓ,t); None if absent or unsupported"""
+    left = right = length = None
+    conditions = parse_conditions(boundary_conditions_str)
+    if not conditions:
+        return None
+    for condition in conditions:
+        if condition.derivative or len(condition.args) != 2 or condition.args[1] != t or condition.value.has(t):
+            return False
+        position = condition.args[0]
+        if position == 0:
+            left = condition.value
+        elif position.is_positive:
+            length, right = position, condition.value
+        else:
+            return False
+    if length is None or left is None:
+        return False
+    return length, left, right
+
+
+def heat_solution(classification, boundary_conditions_str, initial_conditions_str):
+    """u_t = α·u_xx: Fourier modes on ℝ, or a sine series on [0, ℓ] with constant Dirichlet ends"""
+    alpha = -classification.coefficients[('x', 'x')] / classification.coefficients[('t',)]
+    initial, velocity, supported = _initial_values(initial_conditions_str, (x, t))
+    if not supported or initial is None or velocity is not None:
+        return None
+
+    interval = _interval(boundary_conditions_str)
+    if interval is False:
+        return None
+    if interval is None:
+        terms = trig_terms(initial, x)
+        if terms is None:
+            return None
+        func = {'sin': sp.sin, 'cos': sp.cos, 'const': lambda arg: 1}
+        return sp.Add(*(c * func[kind](k * x) * sp.exp(-alpha * k ** 2 * t) for c, kind, k in terms))
+
+    # Subtract the linear steady state so the remainder has homogeneous ends
+    length, left, right = interval
+    steady = left + (right - left) * x / length
+    series = sine_series(initial - steady, x, length)
+    if series is None:
+        return None
+    return steady + series_sum(
+        series, lambda m: sp.sin(m * sp.pi * x / length) * sp.exp(-alpha * (m * sp.pi / length) ** 2 * t)
+    )
+
+
+def wave_solution(classification, boundary_conditions_str, initial_conditions_str):
+    """u_tt = c²·u_xx: d'Alembert on ℝ, or a sine series on [0, ℓ] with fixed ends"""
+    if classification.variables != (x, t):
+        return None
+    speed = sp.sqrt(-classification.coefficients[('x', 'x')] / classification.coefficients[('t', 't')])
+    initial, velocity, supported = _initial_values(initial_conditions_str, (x, t))
+    if not supported or initial is None:
+        return None
+    velocity = velocity if velocity is not None else sp.Integer(0)
+
+    interval = _interval(boundary_conditions_str)
+    if interval is False:
+        return None
+    if interval is None:
+        s = sp.Dummy('s')
+        travelling = (initial.subs(x, x - speed * t) + initial.subs(x, x + speed * t)) / 2
+        integral = sp.integrate(velocity.subs(x, s), (s, x - speed * t, x + speed * t))
+        if integral.has(Integral):
+            return None
+        return travelling + integral / (2 * speed)
+
+    length, left, right = interval
+    if left != 0 or right != 0:
+        return None
+    displacement_series = sine_series(initial, x, length)
+    velocity_series = sine_series(velocity, x, length)
+    if displacement_series is None or velocity_series is None:
+        return None
+    frequency = lambda m: m * sp.pi * speed / length
+    return series_sum(
+        displacement_series, lambda m: sp.sin(m * sp.pi * x / length) * sp.cos(frequency(m) * t)
+    ) + series_sum(
+        velocity_series, lambda m: sp.sin(m * sp.pi * x / length) * sp.sin(frequency(m) * t) / frequency(m)
+    )
+
+
+def _rectangle(boundary_conditions_str):
+    """Dirichlet values on all four edges of [0, a]×[0, b] as (a, b, edges), or None"""
+    edges, width, height = {}, None, None
+    for condition in parse_conditions(boundary_conditions_str):
+        if condition.derivative or len(condition.args) != 2:
+            return None
+        px, py = condition.args
+        if px == 0 and py == y:
+            edges['left'] = condition.value
+        elif px.is_positive and py == y:
+            width, edges['right'] = px, condition.value
+        elif py == 0 and px == x:
+            edges['bottom'] = condition.value
+        elif py.is_positive and px == x:
+            height, edges['top'] = py, condition.value
+        else:
+            return None
+    if len(edges) != 4:
+        return None
+    return width, height, edges
+
+
+def laplace_solution(classification, boundary_conditions_str, initial_conditions_str):
+    """u_xx + u_yy = 0 on a rectangle: superposed sine series for each Dirichlet edge"""
+    rectangle = _rectangle(boundary_conditions_str)
+    if rectangle is None:
+        return None
+    a, b, edges = rectangle
+    solution = sp.Integer(0)
+    for edge, along, across, span, extent in (
+        ('bottom', x, lambda m: sp.sinh(m * sp.pi * (b - y) / a), a, b),
+        ('top', x, lambda m: sp.sinh(m * sp.pi * y / a), a, b),
+        ('left', y, lambda m: sp.sinh(m * sp.pi * (a - x) / b), b, a),
+        ('right', y, lambda m: sp.sinh(m * sp.pi * x / b), b, a),
+    ):
+        series = sine_series(edges[edge], along, span)
+        if series is None:
+            return None
+        solution += series_sum(
+            series,
+            lambda m, along=along, across=across, span=span, extent=extent:
+                sp.sin(m * sp.pi * along / span) * across(m) / sp.sinh(m * sp.pi * extent / span),
+        )
+    return solution
+
+
+def poisson_solution(classification, boundary_conditions_str, initial_conditions_str):
+    """u_xx + u_yy = f on a rectangle with u = 0 on the edges and f a finite double sine series"""
+    coefficient = classification.coefficients[('x', 'x')]
+    if classification.coefficients[('y', 'y')] != coefficient:
+        return None
+    rectangle = _rectangle(boundary_conditions_str)
+    if rectangle is None or any(value != 0 for value in rectangle[2].values()):
+        return None
+    a, b, _ = rectangle
+    source = -classification.source / coefficient
+
+    solution = sp.Integer(0)
+    for term in sp.Add.make_args(sp.expand(source)):
+        amplitude, rest = term.as_independent(x, y, as_Add=False)
+        x_part, y_part = rest.as_independent(y, as_Add=False)
+        x_terms, y_terms = trig_terms(x_part, x), trig_terms(y_part, y)
+        if not x_terms or not y_terms or len(x_terms) != 1 or len(y_terms) != 1:
+            return None
+        (cx, kind_x, kx), (cy, kind_y, ky) = x_terms[0], y_terms[0]
+        m_x, m_y = kx * a / sp.pi, ky * b / sp.pi
+        if kind_x != 'sin' or kind_y != 'sin' or not (m_x.is_integer and m_y.is_integer):
+            return None
+        solution += -amplitude * cx * cy * sp.sin(kx * x) * sp.sin(ky * y) / (kx ** 2 + ky ** 2)
+    return solution
+
+
+def advection_solution(classification, boundary_conditions_str, initial_conditions_str):
+    """u_t + c·u_x = 0 on ℝ: the initial profile transported along characteristics"""
+    if boundary_conditions_str.strip():
+        return None
+    speed = classification.coefficients[('x',)] / classification.coefficients[('t',)]
+    initial, velocity, supported = _initial_values(initial_conditions_str, (x, t))
+    if not supported or velocity is not None:
+        return None
+    if initial is None:
+        return sp.Function('F')(x - speed * t)
+    return initial.subs(x, x - speed * t)
+
+
+# Canonical forms served without dsolve: family -> (method label, builder).
+# A builder returns the solution expression or None when the conditions are outside its reach.
+CLOSED_FORMS = {
+    'heat': ("Closed-Form Heat Solution", heat_solution),
+    'wave': ("Closed-Form Wave Solution", wave_solution),
+    'laplace': ("Closed-Form Laplace Solution", laplace_solution),
+    'poisson': ("Closed-Form Poisson Solution", poisson_solution),
+    'advection': ("Method of Characteristics", advection_solution),
+}
+
+
+def closed_form_solution(classification, boundary_conditions_str="", initial_conditions_str=""):
+    """Return (method label, solution expression) for a recognized canonical form, or None"""
+    entry = CLOSED_FORMS.get(classification.family)
+    if entry is None:
+        return None
+    method, builder = entry
+    solution = builder(classification, boundary_conditions_str or '', initial_conditions_str or '')
+    if solution is None:
+        return None
+    return method, solution
@@ -0,0 +1,46 @@
+import re
+from collections import namedtuple
+
+from .parser import parse_expression
+
+
+# A single parsed condition such as ``u(0,t) = 0`` or ``u_t(x,0) = 0``.
+# ``derivative`` holds the subscript letters of the left-hand side ('' for u itself).
+Condition = namedtuple('Condition', ['derivative', 'args', 'value'])
+
+CONDITION_LHS = re.compile(r'^\s*u(?:_([a-z]+))?\s*\((.*)\)\s*$')
+
+
+def split_top_level(text, separators=',;\n'):
+    """Split text on separators that are not nested inside parentheses"""
+    parts = []
+    depth = 0
+    current = ''
+    for char in text:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char in separators and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_conditions(conditions_str):
+    """Parse a boundary/initial condition string into a list of Condition tuples"""
+    conditions = []
+    for item in split_top_level(conditions_str or ''):
+        if '=' not in item:
+            raise ValueError(f"Condition '{item}' must have the form u(...) = value")
+        lhs, rhs = item.split('=', 1)
+        match = CONDITION_LHS.match(lhs)
+        if not match:
+            raise ValueError(f"Unsupported condition left-hand side: '{lhs.strip()}'")
+        args = tuple(parse_expression(arg) for arg in split_top_level(match.group(2), separators=','))
+        value = parse_expression(rhs)
+        conditions.append(Condition(match.group(1) or '', args, value))
+    return conditions
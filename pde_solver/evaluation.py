@@ -0,0 +1,264 @@
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+from django.conf import settings
+from sympy.core.function import AppliedUndef
+
+from .closed_form import n
+from .kernels import compile_kernel
+from .parser import NAMESPACE, VARIABLES
+
+try:
+    import numexpr
+except ImportError:  # pragma: no cover - optional faster backend
+    numexpr = None
+
+EVALUATION_DEFAULTS = {
+    'MAX_POINTS': 10_000_000,
+    'SERIES_TERMS': 50,
+    'MAX_SERIES_TERMS': 1000,
+    'MAX_SERIES_POINTS': 100_000_000,
+    'CHUNK_POINTS': 65536,
+    'BACKEND': 'numpy',
+    'MAX_JSON_VALUES': 100_000,
+}
+
+BACKENDS = ('numpy', 'numexpr')
+
+# Names an expression may be evaluated over: the independent variables and the parameters
+SYMBOLS = {name: value for name, value in NAMESPACE.items() if isinstance(value, sp.Symbol)}
+
+PARAMETERS = tuple(name for name in SYMBOLS if name not in VARIABLES)
+
+
+def evaluation_config():
+    config = dict(EVALUATION_DEFAULTS)
+    config.update(getattr(settings, 'PDE_EVALUATION', {}))
+    return config
+
+
+def solution_expression(text):
+    """
+    Rebuild the SymPy expression of a solver result's ``expression`` string.
+
+    These strings are produced by the solvers (str() of a SymPy expression),
+    never taken from requests, so sympify is safe here; the local namespace
+    maps names back to the parser's symbols so their assumptions match.
+    """
+    return sp.sympify(text, locals=dict(SYMBOLS, n=n))
+
+
+def series_terms(value):
+    """
+    Requested number of series terms (None: the default), capped at
+    PDE_EVALUATION['MAX_SERIES_TERMS']; raises ValueError unless it is a
+    positive integer.
+    """
+    if value is None:
+        return None
+    try:
+        terms = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("terms must be a positive integer")
+    if terms < 1:
+        raise ValueError("terms must be a positive integer")
+    return min(terms, evaluation_config()['MAX_SERIES_TERMS'])
+
+
+def truncate_series(expression, terms):
+    """Cut infinite Fourier sums after ``terms`` terms so they can be evaluated numerically"""
+    return expression.replace(
+        lambda e: isinstance(e, sp.Sum),
+        lambda s: sp.Sum(s.function, *((var, lower, terms if upper == sp.oo else upper) for var, lower, upper in s.limits)),
+    )
+
+
+@lru_cache(maxsize=256)
+def series_count(text):
+    """Number of infinite sums in a solution expression string"""
+    return sum(
+        1 for series in solution_expression(text).atoms(sp.Sum) for _, _, upper in series.limits if upper == sp.oo
+    )
+
+
+def check_series_cost(text, points, terms=None):
+    """
+    Raise ValueError when evaluating ``text`` at ``points`` points would sum
+    more than PDE_EVALUATION['MAX_SERIES_POINTS'] series terms in total, so
+    oversized requests are refused before any evaluation starts.
+    """
+    config = evaluation_config()
+    sums = series_count(text)
+    if not sums:
+        return
+    terms = min(terms or config['SERIES_TERMS'], config['MAX_SERIES_TERMS'])
+    if points * terms * sums > config['MAX_SERIES_POINTS']:
+        raise ValueError(
+            f"{points} points with {terms} series terms is more than {config['MAX_SERIES_POINTS']} "
+            f"term evaluations; request fewer points or terms"
+        )
+
+
+@lru_cache(maxsize=256)
+def compile_solution(text, names, terms=None, backend='numpy'):
+    """
+    Lambdify a solution expression into a vectorized function of ``names``.
+
+    Infinite series are truncated after ``terms`` terms (at most
+    PDE_EVALUATION['MAX_SERIES_TERMS']). The 'numexpr' backend
+    evaluates the whole expression in one multithreaded pass without
+    temporaries; expressions it cannot print (finite sums) fall back to NumPy.
+    Raises ValueError when the expression depends on a name that is not an
+    argument or contains an arbitrary function (e.g. F(x - c*t) without an
+    initial condition). Compiled functions are memoized per (expression,
+    arguments, terms, backend); NumPy kernels also go through the on-disk
+    kernel cache, so other workers and later processes skip lambdify.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}' (choose from {', '.join(BACKENDS)})")
+    if backend == 'numexpr' and numexpr is None:
+        raise ValueError("The numexpr backend is not installed")
+    config = evaluation_config()
+    terms = min(terms or config['SERIES_TERMS'], config['MAX_SERIES_TERMS'])
+    expression = truncate_series(solution_expression(text), terms)
+    if expression.atoms(AppliedUndef):
+        raise ValueError("The solution contains an arbitrary function and cannot be evaluated")
+    arguments = [SYMBOLS[name] for name in names]
+    missing = expression.free_symbols - set(arguments)
+    if missing:
+        raise ValueError(f"Values needed for: {', '.join(sorted(str(s) for s in missing))}")
+    if backend == 'numexpr' and not expression.has(sp.Sum):
+        return sp.lambdify(arguments, expression, modules='numexpr')
+    return compile_kernel(arguments, expression)
+
+
+@lru_cache(maxsize=128)
+def compiled_for_solution(pk, text, names, terms=None, backend='numpy'):
+    """
+    Compiled function of a stored PDESolution, cached per solution id.
+
+    The expression text is part of the key so an edited solution is
+    recompiled; repeated sampling of the same solution skips sympify and
+    lambdify entirely.
+    """
+    return compile_solution(text, names, terms, backend)
+
+
+def _fill(out, func, arrays, chunk_points, axis=0):
+    """Evaluate func into out block by block so temporaries stay around chunk_points elements"""
+    if out.size <= chunk_points or axis >= out.ndim:
+        out[...] = func(*arrays)
+        return
+    inner = out.size // out.shape[axis]
+    step = max(1, chunk_points // inner)
+    for start in range(0, out.shape[axis], step):
+        index = (slice(None),) * axis + (slice(start, start + step),)
+        block = [array[index] if array.shape[axis] > 1 else array for array in arrays]
+        _fill(out[index], func, block, chunk_points, axis + 1)
+
+
+def axis_values(name, spec, max_points=None):
+    """
+    1D float array from a list of values or a {start, stop, num} range.
+
+    Raises ValueError for axes of more than ``max_points`` values
+    (PDE_EVALUATION['MAX_POINTS'] by default), before a range is allocated.
+    """
+    if max_points is None:
+        max_points = evaluation_config()['MAX_POINTS']
+    if isinstance(spec, dict):
+        try:
+            start, stop, num = float(spec['start']), float(spec['stop']), int(spec['num'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Axis '{name}' needs numeric start, stop and num")
+        if num > max_points:
+            raise ValueError(f"Grid has more than {evaluation_config()['MAX_POINTS']} points")
+        values = np.linspace(start, stop, max(num, 0))
+    else:
+        try:
+            values = np.asarray(spec, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError(f"Axis '{name}' must be a list of numbers")
+        if values.size > max_points:
+            raise ValueError(f"Grid has more than {evaluation_config()['MAX_POINTS']} points")
+    if values.ndim != 1 or not values.size:
+        raise ValueError(f"Axis '{name}' must be a non-empty list of numbers")
+    return values
+
+
+def query_axis(name, text, max_points=None):
+    """Axis values from a query string: 'start:stop:num' or a comma separated list"""
+    parts = text.split(':')
+    if len(parts) == 3:
+        return axis_values(name, dict(zip(('start', 'stop', 'num'), parts)), max_points)
+    try:
+        values = [float(value) for value in text.split(',')]
+    except ValueError:
+        raise ValueError(f"Axis '{name}' must be 'start:stop:num' or a comma separated list")
+    return axis_values(name, values, max_points)
+
+
+def bounded_axes(specs, build=axis_values):
+    """
+    (name, values) for each (name, spec) pair, built with ``build`` (axis_values
+    or query_axis). Each axis may only use the points the axes before it leave
+    within PDE_EVALUATION['MAX_POINTS'], so an oversized grid is rejected
+    before its axes are allocated.
+    """
+    limit = evaluation_config()['MAX_POINTS']
+    axes, size = [], 1
+    for name, spec in specs:
+        values = build(name, spec, limit // size)
+        size *= len(values)
+        axes.append((name, values))
+    return axes
+
+
+def evaluate_grid(text, axes, terms=None, dtype=np.float64, fixed=None, backend=None, compiled=None):
+    """
+    Evaluate a solution expression on the outer product of ``axes``.
+
+    ``axes`` is a list of (name, values) pairs; the result has one dimension per
+    axis in that order. ``fixed`` maps further names (parameters) to scalars.
+    Each axis is passed to the compiled function as a broadcastable view and
+    the grid is filled in blocks of PDE_EVALUATION['CHUNK_POINTS'] points, so
+    intermediate arrays stay bounded however large the grid is. ``compiled``
+    replaces compile_solution, e.g. with compiled_for_solution.
+    """
+    config = evaluation_config()
+    fixed = fixed or {}
+    names = tuple(name for name, _ in axes) + tuple(fixed)
+    unknown = [name for name in names if name not in SYMBOLS]
+    if unknown:
+        raise ValueError(f"Unknown axes: {', '.join(unknown)}")
+    if len(set(names)) != len(names):
+        raise ValueError("Each axis may only be given once")
+    shape = tuple(len(values) for _, values in axes)
+    if int(np.prod(shape)) > config['MAX_POINTS']:
+        raise ValueError(f"Grid has more than {config['MAX_POINTS']} points")
+    check_series_cost(text, int(np.prod(shape)), terms)
+
+    func = (compiled or compile_solution)(text, names, terms, backend or config['BACKEND'])
+    arrays = [
+        np.asarray(values, dtype=np.float64).reshape([-1 if i == axis else 1 for i in range(len(axes))])
+        for axis, (_, values) in enumerate(axes)
+    ]
+    arrays += [np.full([1] * len(axes), value, dtype=np.float64) for value in fixed.values()]
+    out = np.empty(shape, dtype=dtype)
+    with np.errstate(all='ignore'):
+        _fill(out, func, arrays, config['CHUNK_POINTS'])
+    return out
+
+
+def sweep_axes(parameters, grid):
+    """Axes for a parameter sweep: the parameters in request order, then grid variables as u's arguments"""
+    if not isinstance(parameters, dict) or not isinstance(grid, dict):
+        raise ValueError("'parameters' and 'grid' must be objects")
+    unknown = [name for name in parameters if name not in PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(unknown)} (allowed: {', '.join(PARAMETERS)})")
+    unknown = [name for name in grid if name not in VARIABLES]
+    if unknown:
+        raise ValueError(f"Unknown grid variables: {', '.join(unknown)}")
+    return bounded_axes(list(parameters.items()) + [(name, grid[name]) for name in VARIABLES if name in grid])
@@ -5,6 +5,15 @@ from .models import PDESolution
 class PDEInputForm(forms.ModelForm):
     """Form for inputting PDE and conditions"""
     
+    mode = forms.ChoiceField(
+        choices=[('symbolic', 'Symbolic'), ('numeric', 'Numeric (finite differences)')],
+        initial='symbolic',
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Solution Method',
+        help_text='Numeric solutions store their grids and time steps as arrays',
+    )
+    
     class Meta:
         model = PDESolution
         fields = ['equation', 'boundary_conditions', 'initial_conditions']
@@ -12,7 +21,7 @@ class PDEInputForm(forms.ModelForm):
             'equation': forms.Textarea(attrs={
                 'class': 'form-control',
                 'rows': 3,
-                'placeholder': 'e.g., d²u/dt² = c²(d²u/dx²)\nOr: u_t = u_xx\nOr: d²u/dx² + d²u/dy² = 0',
+                'placeholder': 'e.g., u_tt = c^2*u_xx\nOr: u_t = u_xx\nOr: u_xx + u_yy = 0',
                 'required': True
             }),
             'boundary_conditions': forms.Textarea(attrs={
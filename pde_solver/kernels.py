@@ -0,0 +1,293 @@
+import builtins
+import hashlib
+import inspect
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import sympy as sp
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the way kernels are generated changes so stale files are never loaded
+KERNEL_VERSION = 1
+
+KERNEL_CACHE_DEFAULTS = {
+    'DIRECTORY': None,
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'MAX_LOADED': 512,
+    'WARM_KERNELS': 64,
+}
+
+# Seconds between mtime updates of a kernel that keeps being used from memory
+TOUCH_INTERVAL = 60
+
+
+def kernel_config():
+    config = dict(KERNEL_CACHE_DEFAULTS)
+    config.update(getattr(settings, 'PDE_KERNEL_CACHE', {}))
+    return config
+
+
+def kernel_key(arguments, expressions, cse=False):
+    """Hash of the arguments' and expressions' srepr, the cse flag, the SymPy version and KERNEL_VERSION"""
+    payload = '\n'.join([
+        str(KERNEL_VERSION), sp.__version__, str(bool(cse)), sp.srepr(tuple(arguments)), sp.srepr(expressions),
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _code_names(code):
+    """Global and attribute names a code object and the code nested in it refer to"""
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if inspect.iscode(constant):
+            names |= _code_names(constant)
+    return names
+
+
+class KernelCache:
+    """
+    Cache of lambdified NumPy kernels, in memory and optionally on disk.
+
+    The generated source of each kernel is written to ``directory`` under
+    its kernel_key, in a subdirectory per SymPy version, and compiled back
+    with the namespace lambdify uses when another process asks for the same
+    expression, which skips lambdify and cse. Files are only read when
+    requested. The directory is kept under ``max_bytes`` by deleting the
+    least recently used files (by mtime, which every load refreshes), so it
+    can be shared by all workers; at most ``max_loaded`` kernels are kept
+    in memory. Kernels whose source refers to anything outside that
+    namespace (e.g. SymPy fallbacks for functions NumPy lacks) stay in
+    memory only.
+    """
+
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024, max_loaded=512):
+        self.directory = Path(directory) / f'sympy-{sp.__version__}' if directory else None
+        self.max_bytes = max_bytes
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._namespace = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.compiles = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls):
+        config = kernel_config()
+        return cls(config['DIRECTORY'], config['MAX_BYTES'], config['MAX_LOADED'])
+
+    def namespace(self):
+        """A fresh copy of the globals lambdify gives NumPy kernels"""
+        if self._namespace is None:
+            self._namespace = sp.lambdify((), 0, 'numpy').__globals__
+        return dict(self._namespace)
+
+    def _path(self, key):
+        return self.directory / f'{key}.py'
+
+    def compile(self, arguments, expressions, cse=False):
+        """sp.lambdify(arguments, expressions, 'numpy', cse=cse), from memory, disk or freshly generated"""
+        key = kernel_key(arguments, expressions, cse)
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is not None:
+                self._loaded.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            if entry[1] + TOUCH_INTERVAL < time.monotonic():
+                self._touch(key)
+            return entry[0]
+
+        kernel = self._load(key)
+        if kernel is None:
+            kernel = sp.lambdify(arguments, expressions, 'numpy', cse=cse)
+            self._store(key, kernel)
+        with self._lock:
+            self._remember(key, kernel)
+        return kernel
+
+    def _remember(self, key, kernel):
+        self._loaded[key] = (kernel, time.monotonic())
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+    def _touch(self, key):
+        with self._lock:
+            if key in self._loaded:
+                self._loaded[key] = (self._loaded[key][0], time.monotonic())
+        if self.directory:
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+
+    def _materialize(self, source):
+        namespace = self.namespace()
+        exec(compile(source, '<kernel>', 'exec'), namespace)
+        return namespace['_lambdifygenerated']
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            source = path.read_text(encoding='utf-8')
+            os.utime(path)
+        except OSError:
+            return None
+        try:
+            kernel = self._materialize(source)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable kernel {path}: {str(e)}")
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        return kernel
+
+    def _store(self, key, kernel):
+        with self._lock:
+            self.compiles += 1
+        if not self.directory:
+            return
+        if not self._portable(kernel):
+            return
+        source = inspect.getsource(kernel)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Written under a temporary name and renamed, so readers never see a partial file
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.directory, suffix='.tmp', delete=False) as f:
+                f.write(source)
+            # NamedTemporaryFile creates 0600 files; workers running as other users must read them
+            os.chmod(f.name, 0o644)
+            os.replace(f.name, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write kernel {key}: {str(e)}")
+            return
+        self._evict()
+
+    def _portable(self, kernel):
+        """True when every name the kernel uses means the same in a fresh namespace as in its globals"""
+        namespace = self.namespace()
+        for name in _code_names(kernel.__code__):
+            if name in namespace:
+                if namespace[name] is not kernel.__globals__.get(name):
+                    return False
+            elif name in kernel.__globals__ or not hasattr(builtins, name):
+                return False
+        return True
+
+    def _files(self):
+        """(mtime, size, path) of every kernel file, oldest first"""
+        files = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return files
+        for entry in entries:
+            if entry.name.endswith('.py'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def _evict(self):
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def warm(self, count):
+        """Load the ``count`` most recently used kernels from disk; returns how many were loaded"""
+        if not self.directory or count <= 0:
+            return 0
+        loaded = 0
+        for _, _, path in reversed(self._files()[-count:]):
+            key = Path(path).stem
+            try:
+                kernel = self._materialize(Path(path).read_text(encoding='utf-8'))
+            except Exception:
+                continue
+            with self._lock:
+                self._remember(key, kernel)
+            loaded += 1
+        return loaded
+
+    def clear(self):
+        with self._lock:
+            self._loaded.clear()
+            self.hits = self.disk_hits = self.compiles = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': len(self._loaded),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'compiles': self.compiles,
+                'evictions': self.evictions,
+            }
+
+
+_kernel_cache = None
+_kernel_cache_lock = threading.Lock()
+
+
+def get_kernel_cache():
+    """Process-wide KernelCache built from settings.PDE_KERNEL_CACHE"""
+    global _kernel_cache
+    with _kernel_cache_lock:
+        if _kernel_cache is None:
+            _kernel_cache = KernelCache.from_settings()
+    return _kernel_cache
+
+
+@receiver(setting_changed)
+def _reset_kernel_cache(setting, **kwargs):
+    """Rebuild the process-wide cache when PDE_KERNEL_CACHE is overridden, e.g. in tests"""
+    global _kernel_cache
+    if setting == 'PDE_KERNEL_CACHE':
+        with _kernel_cache_lock:
+            _kernel_cache = None
+
+
+def compile_kernel(arguments, expressions, cse=False):
+    """Lambdify ``expressions`` into a NumPy function of ``arguments`` through the kernel cache"""
+    return get_kernel_cache().compile(arguments, expressions, cse)
+
+
+def warm_kernel_cache():
+    """
+    Load the most recently used kernels at worker start.
+
+    Called from the WSGI/ASGI entry points and the solve worker processes;
+    sandbox children forked later inherit the loaded kernels. Never raises.
+    """
+    try:
+        loaded = get_kernel_cache().warm(kernel_config()['WARM_KERNELS'])
+    except Exception as e:
+        logger.warning(f"Kernel cache warm-up failed: {str(e)}")
+        return 0
+    if loaded:
+        logger.info(f"Loaded {loaded} cached kernels")
+    return loaded
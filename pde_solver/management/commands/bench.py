@@ -0,0 +1,62 @@
+import json
+import platform
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from pde_solver.benchmarks import compare, default_benchmarks, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the parser, solvers, numeric engines and solve API against a JSON baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', default=str(Path(settings.BASE_DIR) / 'benchmarks.json'),
+                            help='Baseline JSON file to compare against (and to write with --save)')
+        parser.add_argument('--save', action='store_true',
+                            help='Write the results as the new baseline')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed relative growth of median latency and peak allocation (0.25 = 25%%)')
+        parser.add_argument('--filter', default='',
+                            help='Only run benchmarks whose name contains this text')
+        parser.add_argument('--repeat', type=int, default=None,
+                            help='Override the number of timed calls per benchmark')
+        parser.add_argument('--no-api', action='store_true',
+                            help='Skip the end-to-end API benchmarks')
+
+    def handle(self, *args, **options):
+        client = None if options['no_api'] else Client(SERVER_NAME='localhost')
+        benchmarks = [b for b in default_benchmarks(client) if options['filter'] in b.name]
+        if not benchmarks:
+            raise CommandError(f"No benchmark matches '{options['filter']}'")
+
+        results = {}
+        self.stdout.write(f"{'benchmark':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'alloc MiB':>10}")
+        for benchmark in benchmarks:
+            result = run_benchmark(benchmark, options['repeat'])
+            results[benchmark.name] = result
+            alloc = result['peak_alloc_kb'] / 1024
+            self.stdout.write(
+                f"{benchmark.name:<28}{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+                f"{result['p99_ms']:>10.3f}{result['throughput']:>10.1f}{alloc:>10.1f}"
+            )
+
+        baseline_path = Path(options['baseline'])
+        if options['save']:
+            payload = {'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+            baseline_path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+            self.stdout.write(f'Baseline written to {baseline_path}')
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(f'No baseline at {baseline_path}; run with --save to create one')
+            return
+        baseline = json.loads(baseline_path.read_text())['results']
+        regressions = compare(results, baseline, options['threshold'])
+        if regressions:
+            for message in regressions:
+                self.stderr.write(message)
+            raise CommandError(f'{len(regressions)} benchmark regression(s) above {options["threshold"]:.0%}')
+        self.stdout.write('No regressions against the baseline')
@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+from pde_solver.cache import input_hash
+from pde_solver.models import PDESolution, SolutionArray, SolutionSubmission
+
+
+class Command(BaseCommand):
+    help = 'Merge stored solutions with identical inputs into one canonical row each'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows hashed and merged per transaction')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be merged without changing anything')
+        parser.add_argument('--vacuum', action='store_true',
+                            help='Run VACUUM afterwards to return the freed space to the filesystem')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        keys = {}
+        scanned = merged = 0
+        last_pk = 0
+        while True:
+            # Rows saved before input hashes existed; failed solves are left alone
+            batch = list(
+                PDESolution.objects.filter(input_hash__isnull=True, pk__gt=last_pk).exclude(method_used='N/A')
+                .only('equation', 'boundary_conditions', 'initial_conditions', 'created_at')
+                .annotate(has_arrays=Exists(SolutionArray.objects.filter(solution=OuterRef('pk'))))
+                .order_by('pk')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            scanned += len(batch)
+            with transaction.atomic():
+                merged += self.merge_batch(batch, keys, options['dry_run'])
+            self.stdout.write(f'{scanned} rows scanned, {merged} duplicates merged')
+
+        verb = 'Would merge' if options['dry_run'] else 'Merged'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {merged} duplicate solutions out of {scanned} unhashed rows'))
+        if options['vacuum'] and not options['dry_run']:
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+
+    def merge_batch(self, batch, keys, dry_run):
+        """
+        Hash a batch of rows and fold duplicates into their canonical row.
+
+        The canonical row of a key is one already hashed in the database, else
+        the oldest row of the batch (lowest id). Each merged row becomes a
+        SolutionSubmission of the canonical row with its original time, its
+        own submissions move along, and the row is deleted with its arrays.
+        """
+        for row in batch:
+            # input_hash parses the equation; identical texts are hashed once per run
+            text = (row.equation, row.boundary_conditions, row.initial_conditions,
+                    'numeric' if row.has_arrays else 'symbolic')
+            if text not in keys:
+                keys[text] = input_hash(*text)
+            row.input_hash = keys[text]
+        canonical = dict(
+            PDESolution.objects.filter(input_hash__in={row.input_hash for row in batch}).values_list('input_hash', 'pk')
+        )
+
+        new_canonical, submissions, duplicates = [], [], {}
+        for row in batch:
+            target = canonical.setdefault(row.input_hash, row.pk)
+            if target == row.pk:
+                new_canonical.append(row)
+                submissions.append(SolutionSubmission(solution_id=row.pk, created_at=row.created_at))
+            else:
+                duplicates[row.pk] = target
+                submissions.append(SolutionSubmission(solution_id=target, created_at=row.created_at))
+        if dry_run:
+            return len(duplicates)
+
+        by_target = {}
+        for duplicate, target in duplicates.items():
+            by_target.setdefault(target, []).append(duplicate)
+        for target, rows in by_target.items():
+            SolutionSubmission.objects.filter(solution_id__in=rows).update(solution_id=target)
+        PDESolution.objects.filter(pk__in=list(duplicates)).delete()
+        PDESolution.objects.bulk_update(new_canonical, ['input_hash'])
+        SolutionSubmission.objects.bulk_create(submissions)
+        return len(duplicates)
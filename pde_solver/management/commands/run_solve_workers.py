@@ -0,0 +1,73 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pde_solver.kernels import warm_kernel_cache
+from pde_solver.metrics import record_result
+from pde_solver.models import SolveJob
+from pde_solver.sandbox import SandboxPool
+
+
+def run_job(sandbox, equation, boundary_conditions, initial_conditions):
+    """Worker thread entry point; the sandbox returns an error or 'timeout' result instead of raising"""
+    result = sandbox.solve(equation, boundary_conditions, initial_conditions)
+    record_result(result)
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Process queued SolveJob rows in sandboxed solver processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of solver processes')
+        parser.add_argument('--timeout', type=float, default=None,
+                            help='Seconds a job may run before its process is killed (default: PDE_SOLVER_TIMEOUT)')
+        parser.add_argument('--poll-interval', type=float, default=0.5,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is drained instead of polling forever')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        stale_after = getattr(settings, 'PDE_JOB_STALE_AFTER', 600)
+        requeued = SolveJob.requeue_stale(stale_after)
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stale job(s)')
+
+        # Sandbox children are forked from here, so they start with the warmed kernels
+        warm_kernel_cache()
+        timeout = options['timeout'] or getattr(settings, 'PDE_SOLVER_TIMEOUT', 30)
+        sandbox = SandboxPool.from_settings(processes=workers, timeout=timeout)
+        running = {}
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                while True:
+                    # Keep at most one job per process in flight; the database is only touched here
+                    for job in SolveJob.objects.filter(status=SolveJob.QUEUED)[:workers - len(running)]:
+                        if job.claim():
+                            future = pool.submit(
+                                run_job, sandbox, job.equation, job.boundary_conditions, job.initial_conditions
+                            )
+                            running[future] = job
+
+                    if not running:
+                        if options['once']:
+                            break
+                        time.sleep(options['poll_interval'])
+                        continue
+
+                    done, _ = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = running.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {'solution': f'Worker error: {str(e)}', 'method': 'N/A', 'status': 'error'}
+                        job.finish(result)
+                        self.stdout.write(f'Job {job.pk}: {job.status}')
+        finally:
+            sandbox.close()
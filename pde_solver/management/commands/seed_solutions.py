@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from pde_solver.models import PDESolution
+from pde_solver.solver import COMMON_SOLUTIONS
+
+
+class Command(BaseCommand):
+    help = 'Insert synthetic solutions to benchmark the list pages against a large table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100_000,
+                            help='Number of rows to insert')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows per INSERT')
+        parser.add_argument('--solution-size', type=int, default=8192,
+                            help='Approximate length of each stored Markdown solution, in characters')
+
+    def handle(self, *args, **options):
+        if options['count'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--count and --batch-size must be positive')
+        templates = list(COMMON_SOLUTIONS.items())
+        padding = max(1, options['solution_size'] // 64)
+        created = 0
+        while created < options['count']:
+            size = min(options['batch_size'], options['count'] - created)
+            rows = []
+            for i in range(created, created + size):
+                name, info = templates[i % len(templates)]
+                rows.append(PDESolution(
+                    equation=info['form'],
+                    boundary_conditions=info['example_bc'] if i % 2 else '',
+                    initial_conditions=f'u(x,0) = sin({i % 7 + 1}*pi*x)',
+                    solution=f"## {name} #{i}\n\n" + f"{info['general_solution']}\n" * padding,
+                    method_used=f"Seeded {name}",
+                ))
+            with transaction.atomic():
+                PDESolution.objects.bulk_create(rows)
+            created += size
+            self.stdout.write(f'{created}/{options["count"]} solutions inserted')
@@ -0,0 +1,295 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .progress import report_progress
+
+METRICS_DEFAULTS = {
+    'ENABLED': True,
+    'SERVER_TIMING': False,
+    'BUCKETS': (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+}
+
+# (stage, seconds, error) records of the current request or sandboxed solve; None outside both
+_stages = ContextVar('pde_metrics_stages', default=None)
+
+
+def metrics_config():
+    config = dict(METRICS_DEFAULTS)
+    config.update(getattr(settings, 'PDE_METRICS', {}))
+    return config
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues):
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labelvalues, value in values:
+            yield f'{self.name}{_labels(self.labelnames, labelvalues)} {value}'
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram per label combination.
+
+    An observation is a bisect and three additions under a lock; buckets are
+    stored per bin and only made cumulative when rendered.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=METRICS_DEFAULTS['BUCKETS']):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # Bin counts (the last one is +Inf), then sum and count
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labelvalues):
+        series = self._series.get(labelvalues)
+        return series[-1] if series else 0
+
+    def samples(self):
+        with self._lock:
+            series = sorted((labelvalues, list(values)) for labelvalues, values in self._series.items())
+        for labelvalues, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), values):
+                cumulative += count
+                le = 'le="{}"'.format(bound if bound == '+Inf' else repr(float(bound)))
+                yield f'{self.name}_bucket{_labels(self.labelnames, labelvalues, [le])} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labelnames, labelvalues)} {values[-2]!r}'
+            yield f'{self.name}_count{_labels(self.labelnames, labelvalues)} {values[-1]}'
+
+
+class Registry:
+    """The process's metrics, rendered in the Prometheus text exposition format"""
+
+    def __init__(self, buckets=METRICS_DEFAULTS['BUCKETS']):
+        self.buckets = buckets
+        self.request_seconds = Histogram(
+            'pde_http_request_duration_seconds', 'Time to produce a response, by URL name, method and status',
+            ('view', 'method', 'status'), buckets,
+        )
+        self.stage_seconds = Histogram(
+            'pde_stage_duration_seconds', 'Time spent per pipeline stage (parse, classify, solvers, database)',
+            ('stage',), buckets,
+        )
+        self.stage_errors = Counter(
+            'pde_stage_errors_total', 'Exceptions raised inside a pipeline stage', ('stage', 'error'),
+        )
+        self.solves = Counter(
+            'pde_solves_total', 'Solver results by method and status', ('method', 'status'),
+        )
+        self.rejections = Counter(
+            'pde_solve_rejections_total', 'Async solves refused with 503 because the executor queue was full',
+        )
+        self.cache_hits = Counter(
+            'pde_solution_cache_hits_total', 'Solution cache lookups answered, by tier (memory or backend)', ('tier',),
+        )
+        self.cache_misses = Counter(
+            'pde_solution_cache_misses_total', 'Solution cache lookups that found no entry in either tier',
+        )
+        self.cache_evictions = Counter(
+            'pde_solution_cache_evictions_total', 'In-memory solution cache entries dropped for size or expiry',
+        )
+
+    def metrics(self):
+        return [self.request_seconds, self.stage_seconds, self.stage_errors, self.solves, self.rejections,
+                self.cache_hits, self.cache_misses, self.cache_evictions]
+
+    def render(self):
+        lines = []
+        for metric in self.metrics():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide Registry, created on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = Registry(metrics_config()['BUCKETS'])
+    return _registry
+
+
+def record_stage(name, seconds, error=None):
+    """Add one stage timing to the histograms and to the current request's Server-Timing"""
+    registry = get_registry()
+    registry.stage_seconds.observe(seconds, name)
+    if error:
+        registry.stage_errors.inc(name, error)
+    stages = _stages.get()
+    if stages is not None:
+        stages.append((name, seconds, error))
+
+
+@contextmanager
+def stage(name):
+    """Time a block as pipeline stage ``name``; exceptions are counted by type and re-raised"""
+    report_progress('stage', stage=name)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_stage(name, time.perf_counter() - start, type(e).__name__)
+        raise
+    record_stage(name, time.perf_counter() - start)
+
+
+@contextmanager
+def collect_stages():
+    """Collect the stages recorded inside the block, e.g. a sandboxed solve, into a list"""
+    stages = []
+    token = _stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _stages.reset(token)
+
+
+def record_result(result):
+    """Count a solver result by method and status"""
+    get_registry().solves.inc(result.get('method', 'N/A'), result.get('status', 'unknown'))
+
+
+def record_cache_lookup(tier=None):
+    """Count a solution cache lookup: a hit in ``tier`` ('memory' or 'backend'), or a miss"""
+    registry = get_registry()
+    if tier:
+        registry.cache_hits.inc(tier)
+    else:
+        registry.cache_misses.inc()
+
+
+def server_timing(stages, total):
+    """Server-Timing header value: summed duration per stage in ms, then the total"""
+    durations = {}
+    for name, seconds, _ in stages:
+        durations[name] = durations.get(name, 0.0) + seconds
+    parts = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in durations.items()]
+    parts.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(parts)
+
+
+class MetricsMiddleware:
+    """
+    Time each request, under WSGI or ASGI.
+
+    Requests are labelled by URL name rather than path so the number of
+    series stays bounded. With PDE_METRICS['SERVER_TIMING'] the stage
+    breakdown is returned in a Server-Timing header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = metrics_config()
+        self.enabled = config['ENABLED']
+        self.server_timing = config['SERVER_TIMING']
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        start = time.perf_counter()
+        with collect_stages() as stages:
+            response = self.get_response(request)
+        return self.finish(request, response, stages, start)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        start = time.perf_counter()
+        with collect_stages() as stages:
+            response = await self.get_response(request)
+        return self.finish(request, response, stages, start)
+
+    def finish(self, request, response, stages, start):
+        total = time.perf_counter() - start
+        match = request.resolver_match
+        get_registry().request_seconds.observe(
+            total, match.url_name if match and match.url_name else 'unmatched', request.method, response.status_code,
+        )
+        if self.server_timing:
+            response['Server-Timing'] = server_timing(stages, total)
+        return response
+
+
+def _time_query(execute, sql, params, many, context):
+    """execute_wrapper recording each statement as a db_read or db_write stage"""
+    start = time.perf_counter()
+    name = 'db_read' if sql.lstrip()[:6].upper() in ('SELECT', 'PRAGMA') else 'db_write'
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """
+    connection_created receiver installing _time_query on every new connection.
+
+    Wrapping at connection level rather than per request also times queries
+    the async ORM runs in its worker thread; PdeSolverConfig.ready connects
+    it when metrics are enabled.
+    """
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
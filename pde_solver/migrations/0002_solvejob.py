@@ -0,0 +1,34 @@
+# Generated by Django 4.2.8 on 2026-10-16 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pde_solver', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolveJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equation', models.TextField(help_text='The partial differential equation')),
+                ('boundary_conditions', models.TextField(blank=True, help_text='Boundary conditions')),
+                ('initial_conditions', models.TextField(blank=True, help_text='Initial conditions')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=10)),
+                ('solution', models.TextField(blank=True, help_text='The solution to the PDE')),
+                ('method_used', models.CharField(blank=True, help_text='Method used to solve', max_length=100)),
+                ('error', models.TextField(blank=True, help_text='Error message if the solve failed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Solve Job',
+                'verbose_name_plural': 'Solve Jobs',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
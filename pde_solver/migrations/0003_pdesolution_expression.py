@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pde_solver', '0002_solvejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pdesolution',
+            name='expression',
+            field=models.TextField(blank=True, help_text='SymPy form of u when the solution is explicit'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.8 on 2026-10-16 23:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pde_solver', '0003_pdesolution_expression'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolutionArray',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Array name, e.g. 'u', 'x' or 'frames'", max_length=50)),
+                ('file', models.FileField(max_length=255, upload_to='arrays/')),
+                ('shape', models.JSONField(default=list, help_text='Array shape')),
+                ('dtype', models.CharField(help_text="NumPy dtype string, e.g. '<f8'", max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('solution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='arrays', to='pde_solver.pdesolution')),
+            ],
+            options={
+                'ordering': ['solution', 'name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='solutionarray',
+            constraint=models.UniqueConstraint(fields=('solution', 'name'), name='unique_solution_array_name'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.8 on 2026-10-16 23:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pde_solver', '0004_solutionarray'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pdesolution',
+            index=models.Index(fields=['-created_at', '-id'], name='pdesolution_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='pdesolution',
+            index=models.Index(fields=['method_used', '-created_at'], name='pdesolution_method_created'),
+        ),
+    ]
@@ -0,0 +1,112 @@
+from django.db import migrations
+
+TABLE = 'pde_solver_pdesolution'
+
+SQLITE_TABLE = 'pde_solver_pdesolution_fts'
+
+SEARCH_FIELDS = ('equation', 'boundary_conditions', 'initial_conditions', 'method_used', 'solution')
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(equation, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(method_used, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(boundary_conditions, '') || ' ' || coalesce(initial_conditions, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(solution, '')), 'D')"
+)
+
+COLUMNS = ', '.join(SEARCH_FIELDS)
+
+NEW_VALUES = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+
+OLD_VALUES = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+
+# External-content FTS5 table kept in sync by triggers, so bulk_create and
+# queryset.update() are indexed as well as save(); '_' is part of a token so
+# u_xx and u_t are searchable as written
+SQLITE_TRIGGERS = [
+    f"CREATE TRIGGER {SQLITE_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {SQLITE_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES}); END",
+    f"CREATE TRIGGER {SQLITE_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN "
+    f"INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); END",
+    f"CREATE TRIGGER {SQLITE_TABLE}_update AFTER UPDATE ON {TABLE} BEGIN "
+    f"INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES}); "
+    f"INSERT INTO {SQLITE_TABLE}(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES}); END",
+]
+
+SQLITE_REBUILD = f"INSERT INTO {SQLITE_TABLE}({SQLITE_TABLE}) VALUES ('rebuild')"
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5({COLUMNS}, content='{TABLE}', content_rowid='id', "
+    f"tokenize=\"unicode61 tokenchars '_'\")",
+    *SQLITE_TRIGGERS,
+    SQLITE_REBUILD,
+]
+
+SQLITE_REVERSE = [
+    f"DROP TRIGGER IF EXISTS {SQLITE_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {SQLITE_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {SQLITE_TABLE}_update",
+    f"DROP TABLE IF EXISTS {SQLITE_TABLE}",
+]
+
+# A generated column is recomputed by PostgreSQL on every write
+POSTGRES_FORWARD = [
+    f"ALTER TABLE {TABLE} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({POSTGRES_VECTOR}) STORED",
+    f"CREATE INDEX pdesolution_search_vector ON {TABLE} USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS pdesolution_search_vector",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def statements(vendor, forward):
+    if vendor == 'sqlite':
+        return SQLITE_FORWARD if forward else SQLITE_REVERSE
+    if vendor == 'postgresql':
+        return POSTGRES_FORWARD if forward else POSTGRES_REVERSE
+    return []
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # Searches fall back to LIKE scans without FTS5
+                return
+    for statement in statements(connection.vendor, True):
+        schema_editor.execute(statement)
+
+
+def restore_sqlite_triggers(apps, schema_editor):
+    """
+    Recreate the FTS5 sync triggers.
+
+    SQLite applies most ALTERs to pde_solver_pdesolution by copying it into a
+    new table, which drops its triggers (rows and ids are kept, so the index
+    itself stays valid); every later migration that alters the table must
+    run this afterwards.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or SQLITE_TABLE not in connection.introspection.table_names():
+        return
+    for statement in SQLITE_REVERSE[:3] + SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    for statement in statements(schema_editor.connection.vendor, False):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pde_solver', '0005_pdesolution_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.8 on 2026-10-16 23:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from importlib import import_module
+
+# Adding input_hash rebuilds the SQLite table and drops the search triggers
+restore_sqlite_triggers = import_module('pde_solver.migrations.0006_solution_search_index').restore_sqlite_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pde_solver', '0006_solution_search_index'),
+    ]
+
+    operations = [
+        # Runs last when unapplying, after input_hash is removed
+        migrations.RunPython(migrations.RunPython.noop, restore_sqlite_triggers),
+        migrations.AddField(
+            model_name='pdesolution',
+            name='input_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Hash of the normalized equation, conditions and mode; one row per distinct input', max_length=64, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='SolutionSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('solution', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='pde_solver.pdesolution')),
+            ],
+            options={
+                'verbose_name': 'Solution Submission',
+                'verbose_name_plural': 'Solution Submissions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.RunPython(restore_sqlite_triggers, migrations.RunPython.noop),
+    ]
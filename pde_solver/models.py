@@ -1,4 +1,16 @@
-from django.db import models
+import os
+import re
+import shutil
+from datetime import timedelta
+
+import numpy as np
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .metrics import stage
 
 
 class PDESolution(models.Model):
@@ -7,14 +19,209 @@ class PDESolution(models.Model):
     boundary_conditions = models.TextField(blank=True, help_text="Boundary conditions")
     initial_conditions = models.TextField(blank=True, help_text="Initial conditions")
     solution = models.TextField(help_text="The solution to the PDE")
+    expression = models.TextField(blank=True, help_text="SymPy form of u when the solution is explicit")
     method_used = models.CharField(max_length=100, help_text="Method used to solve")
+    input_hash = models.CharField(
+        max_length=64, unique=True, null=True, blank=True, editable=False,
+        help_text="Hash of the normalized equation, conditions and mode; one row per distinct input",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Columns the list pages render; the Markdown solution is only previewed
+    LIST_FIELDS = ('equation', 'boundary_conditions', 'initial_conditions', 'expression', 'method_used', 'created_at')
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "PDE Solution"
         verbose_name_plural = "PDE Solutions"
+        indexes = [
+            # Keyset pagination walks (created_at, id) newest first
+            models.Index(fields=['-created_at', '-id'], name='pdesolution_created_id'),
+            models.Index(fields=['method_used', '-created_at'], name='pdesolution_method_created'),
+        ]
 
     def __str__(self):
         return f"PDE: {self.equation[:50]}... ({self.created_at.strftime('%Y-%m-%d')})"
+
+    def expression_names(self):
+        """Identifiers used in the solution expression, e.g. {'x', 't', 'D', 'exp', 'sin'}"""
+        return set(re.findall(r'[A-Za-z_]\w*', self.expression))
+
+    def save_result(self, result, key):
+        """
+        Fill this unsaved row from a solve_pde result and save it with a submission.
+
+        Only successful results claim ``key`` as their input_hash, so failures
+        are retried by later submits. Returns ``(solution, True)``, or the row a
+        concurrent submit stored under the same key first and False; no
+        submission is recorded for that row.
+        """
+        self.solution = result['solution']
+        self.expression = result.get('expression', '')
+        self.method_used = result['method']
+        if result['status'] == 'success':
+            self.input_hash = key
+        try:
+            with transaction.atomic():
+                self.save()
+                SolutionSubmission.objects.create(solution=self)
+        except IntegrityError:
+            return PDESolution.objects.only('pk').get(input_hash=key), False
+        with stage('store_arrays'):
+            for name, array in result.get('data', {}).items():
+                if np.size(array):
+                    SolutionArray.store(self, name, array)
+        return self, True
+
+
+@receiver(post_delete, sender=PDESolution)
+def delete_plot_files(sender, instance, **kwargs):
+    """Remove the solution's cached plot thumbnails"""
+    shutil.rmtree(default_storage.path(f'plots/{instance.pk}'), ignore_errors=True)
+
+
+class SolutionSubmission(models.Model):
+    """
+    One submission of the solver form.
+
+    Identical inputs are solved once: every submission references the
+    canonical PDESolution with the same input_hash instead of storing a copy.
+    """
+    solution = models.ForeignKey(PDESolution, on_delete=models.CASCADE, related_name='submissions')
+    # Not auto_now_add, so dedupe_solutions can keep the time of merged legacy rows
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Solution Submission"
+        verbose_name_plural = "Solution Submissions"
+
+    def __str__(self):
+        return f"Submission of solution {self.solution_id} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
+class SolutionArray(models.Model):
+    """
+    A numeric result array of a PDESolution, stored as a .npy file under MEDIA_ROOT.
+
+    Only the path, shape and dtype live in the database. Reads memory-map the
+    file, so slicing one time step or a sub-region touches only those pages.
+    """
+    solution = models.ForeignKey(PDESolution, on_delete=models.CASCADE, related_name='arrays')
+    name = models.CharField(max_length=50, help_text="Array name, e.g. 'u', 'x' or 'frames'")
+    file = models.FileField(upload_to='arrays/', max_length=255)
+    shape = models.JSONField(default=list, help_text="Array shape")
+    dtype = models.CharField(max_length=20, help_text="NumPy dtype string, e.g. '<f8'")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['solution', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['solution', 'name'], name='unique_solution_array_name'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} {tuple(self.shape)} {self.dtype} of solution {self.solution_id}"
+
+    @classmethod
+    def store(cls, solution, name, array):
+        """Write array to a .npy file in the FileField's storage and record it"""
+        array = np.ascontiguousarray(array)
+        storage = cls._meta.get_field('file').storage
+        path = storage.get_available_name(f'arrays/{solution.pk}/{name}.npy')
+        os.makedirs(os.path.dirname(storage.path(path)), exist_ok=True)
+        np.save(storage.path(path), array, allow_pickle=False)
+        return cls.objects.create(
+            solution=solution, name=name, file=path, shape=list(array.shape), dtype=array.dtype.str
+        )
+
+    def load(self, mmap=True):
+        """The stored array, memory-mapped read-only by default"""
+        return np.load(self.file.path, mmap_mode='r' if mmap else None, allow_pickle=False)
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+
+
+@receiver(post_delete, sender=SolutionArray)
+def delete_array_file(sender, instance, **kwargs):
+    """Remove the .npy file with its row, including cascaded deletes of the solution"""
+    if instance.file:
+        instance.file.storage.delete(instance.file.name)
+
+
+class SolveJob(models.Model):
+    """A queued PDE solve processed by the run_solve_workers command"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    equation = models.TextField(help_text="The partial differential equation")
+    boundary_conditions = models.TextField(blank=True, help_text="Boundary conditions")
+    initial_conditions = models.TextField(blank=True, help_text="Initial conditions")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    solution = models.TextField(blank=True, help_text="The solution to the PDE")
+    method_used = models.CharField(max_length=100, blank=True, help_text="Method used to solve")
+    error = models.TextField(blank=True, help_text="Error message if the solve failed")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = "Solve Job"
+        verbose_name_plural = "Solve Jobs"
+
+    def __str__(self):
+        return f"Job {self.pk}: {self.equation[:50]} ({self.status})"
+
+    def claim(self):
+        """Atomically move a queued job to running; False if another worker got it first"""
+        started_at = timezone.now()
+        claimed = SolveJob.objects.filter(pk=self.pk, status=self.QUEUED).update(
+            status=self.RUNNING, started_at=started_at
+        )
+        if claimed:
+            self.status, self.started_at = self.RUNNING, started_at
+        return bool(claimed)
+
+    def finish(self, result):
+        """Store a solve_pde result dict and mark the job done or failed"""
+        self.solution = result.get('solution', '')
+        self.method_used = result.get('method', '')
+        self.status = self.DONE if result.get('status') == 'success' else self.FAILED
+        if self.status == self.FAILED:
+            self.error = self.solution
+        self.finished_at = timezone.now()
+        self.save(update_fields=['solution', 'method_used', 'status', 'error', 'finished_at'])
+
+    @classmethod
+    def requeue_stale(cls, max_age):
+        """Return jobs stuck in running for longer than max_age seconds to the queue"""
+        cutoff = timezone.now() - timedelta(seconds=max_age)
+        return cls.objects.filter(status=cls.RUNNING, started_at__lt=cutoff).update(
+            status=cls.QUEUED, started_at=None
+        )
+
+    def as_dict(self):
+        data = {
+            'id': self.pk,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if self.status == self.DONE:
+            data.update(solution=self.solution, method=self.method_used)
+        elif self.status == self.FAILED:
+            data['message'] = self.error
+        return data
@@ -0,0 +1,615 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import lapack
+from scipy.sparse import linalg as splinalg
+
+from .progress import report_progress
+
+
+# Default grid settings for numeric solves; any key can be overridden per call
+NUMERIC_DEFAULTS = {
+    'nx': 101,
+    'ny': 101,
+    'length': 1.0,
+    'height': 1.0,
+    't_end': 0.1,
+    'steps': 100,
+    'scheme': 'crank-nicolson',
+    'snapshots': 0,
+    'linear_solver': 'multigrid',
+    'rtol': 1e-8,
+    'time_stepping': 'fixed',
+    'time_rtol': 1e-4,
+    'time_atol': 1e-6,
+    'ode_solver': 'BDF',
+    'params': {},
+}
+
+HEAT_SCHEMES = ('explicit', 'crank-nicolson')
+
+TIME_STEPPING = ('fixed', 'adaptive')
+
+# Time-stepping loops report a 'step' progress event this many times per solve
+PROGRESS_REPORTS = 20
+
+
+def _boundary_value(value, t):
+    """Evaluate a boundary value that may be a constant or a function of t"""
+    return float(value(t)) if callable(value) else float(value)
+
+
+def solve_heat_1d(u0, alpha, dx, dt, steps, scheme='crank-nicolson', left=0.0, right=0.0, snapshots=0):
+    """
+    Integrate u_t = alpha·u_xx on a uniform 1D grid with Dirichlet boundaries.
+
+    ``u0`` is the initial profile including both boundary points; ``left`` and
+    ``right`` are constants or callables of t. All work arrays are allocated up
+    front, so the time loop itself runs without per-step allocations.
+    Returns a dict of arrays: the final field ``u``, plus ``frames`` and
+    ``times`` holding ``snapshots`` evenly spaced copies of the field.
+    """
+    if scheme not in HEAT_SCHEMES:
+        raise ValueError(f"Unknown heat scheme '{scheme}', expected one of {HEAT_SCHEMES}")
+    if steps < 1:
+        raise ValueError("Number of time steps must be positive")
+
+    u = np.array(u0, dtype=np.float64)
+    if u.ndim != 1 or u.size < 3:
+        raise ValueError("Initial profile must be a 1D array with at least 3 points")
+
+    r = alpha * dt / dx ** 2
+    if scheme == 'explicit' and r > 0.5:
+        raise ValueError(
+            f"Explicit scheme is unstable for alpha·dt/dx² = {r:.3g} > 0.5; "
+            "increase the number of steps or use 'crank-nicolson'"
+        )
+
+    # Preallocated views and buffers reused by every step
+    interior = u[1:-1]
+    lower = u[:-2]
+    upper = u[2:]
+    work = np.empty_like(interior)
+
+    frame_steps = np.linspace(0, steps, snapshots, dtype=np.int64) if snapshots else np.empty(0, dtype=np.int64)
+    frames = np.empty((len(frame_steps), u.size), dtype=np.float64)
+    times = frame_steps * dt
+    next_frame = 0
+
+    if scheme == 'crank-nicolson':
+        # (I - r/2·A) u^{n+1} = (I + r/2·A) u^n; the SPD tridiagonal system is factored once
+        half_r = 0.5 * r
+        diagonal, off_diagonal, info = lapack.dpttrf(
+            np.full(interior.size, 1.0 + r), np.full(interior.size - 1, -half_r)
+        )
+        if info != 0:
+            raise ValueError("Failed to factor the Crank-Nicolson system")
+
+    u[0] = _boundary_value(left, 0.0)
+    u[-1] = _boundary_value(right, 0.0)
+
+    stride = max(1, steps // PROGRESS_REPORTS)
+    for n in range(steps + 1):
+        while next_frame < len(frame_steps) and frame_steps[next_frame] == n:
+            np.copyto(frames[next_frame], u)
+            next_frame += 1
+        if n == steps:
+            break
+        if n % stride == 0:
+            report_progress('step', step=n, steps=steps)
+
+        t_next = (n + 1) * dt
+        left_next = _boundary_value(left, t_next)
+        right_next = _boundary_value(right, t_next)
+
+        # work = u_{i-1} - 2·u_i + u_{i+1}
+        np.add(lower, upper, out=work)
+        work -= interior
+        work -= interior
+
+        if scheme == 'explicit':
+            work *= r
+            interior += work
+        else:
+            work *= half_r
+            work += interior
+            work[0] += half_r * left_next
+            work[-1] += half_r * right_next
+            lapack.dpttrs(diagonal, off_diagonal, work, overwrite_b=1)
+            np.copyto(interior, work)
+
+        u[0] = left_next
+        u[-1] = right_next
+
+    return {
+        'u': u,
+        'frames': frames,
+        'times': times,
+        'r': r,
+    }
+
+
+POISSON_METHODS = ('direct', 'cg', 'multigrid')
+
+POISSON_EDGES = ('left', 'right', 'bottom', 'top')
+
+
+def _axis_operator(n, h, lower, upper):
+    """
+    1D ``-d²/dx²`` stencil over the unknowns of one grid axis.
+
+    Dirichlet ends are eliminated; Neumann ends keep their node with a ghost
+    point, and that row is halved so the operator stays symmetric. Returns the
+    sparse operator, the row weights (0.5 on Neumann rows) and the slice of
+    grid indices that are unknowns.
+    """
+    start = 0 if lower == 'neumann' else 1
+    stop = n if upper == 'neumann' else n - 1
+    size = stop - start
+    main = np.full(size, 2.0)
+    weights = np.ones(size)
+    if lower == 'neumann':
+        main[0] = 1.0
+        weights[0] = 0.5
+    if upper == 'neumann':
+        main[-1] = 1.0
+        weights[-1] = 0.5
+    off = np.full(size - 1, -1.0)
+    operator = sparse.diags([off, main, off], [-1, 0, 1], format='csr') / h ** 2
+    return operator, weights, slice(start, stop)
+
+
+def _axis_prolongation(n, unknowns):
+    """Linear interpolation from every other grid node (plus the last one) restricted to unknowns"""
+    coarse = np.arange(0, n, 2)
+    if coarse[-1] != n - 1:
+        coarse = np.append(coarse, n - 1)
+    fine = np.arange(n)
+    upper = np.clip(np.searchsorted(coarse, fine), 1, len(coarse) - 1)
+    lower = upper - 1
+    weight = (fine - coarse[lower]) / (coarse[upper] - coarse[lower])
+    rows = np.concatenate([fine, fine])
+    cols = np.concatenate([lower, upper])
+    values = np.concatenate([1.0 - weight, weight])
+    full = sparse.csr_matrix((values, (rows, cols)), shape=(n, len(coarse)))
+    full.eliminate_zeros()
+    # Columns are coarse unknowns: coarse nodes on the fine unknown range, mapped to coarse indices
+    coarse_unknowns = np.flatnonzero((coarse >= unknowns.start) & (coarse < unknowns.stop))
+    coarse_slice = slice(int(coarse_unknowns[0]), int(coarse_unknowns[-1]) + 1)
+    return full[unknowns, :][:, coarse_slice], len(coarse), coarse_slice
+
+
+class _Multigrid:
+    """Geometric V-cycle with Galerkin coarse operators, used as a CG preconditioner"""
+    
+    COARSEST_SIZE = 400
+    SMOOTHING_STEPS = 2
+    JACOBI_WEIGHT = 0.8
+
+    def __init__(self, matrix, shape, unknowns):
+        self.levels = []
+        (ny, nx), (y_unknowns, x_unknowns) = shape, unknowns
+        while matrix.shape[0] > self.COARSEST_SIZE and min(nx, ny) > 3:
+            px, nx, x_unknowns = _axis_prolongation(nx, x_unknowns)
+            py, ny, y_unknowns = _axis_prolongation(ny, y_unknowns)
+            prolongation = sparse.kron(py, px, format='csr')
+            restriction = prolongation.T.tocsr()
+            inverse_diagonal = self.JACOBI_WEIGHT / matrix.diagonal()
+            self.levels.append((matrix, inverse_diagonal, prolongation, restriction))
+            matrix = (restriction @ matrix @ prolongation).tocsc()
+        self.coarse_solve = splinalg.factorized(matrix.tocsc())
+
+    def _smooth(self, matrix, inverse_diagonal, x, b):
+        for _ in range(self.SMOOTHING_STEPS):
+            x += inverse_diagonal * (b - matrix @ x)
+        return x
+
+    def _cycle(self, level, b):
+        if level == len(self.levels):
+            return self.coarse_solve(b)
+        matrix, inverse_diagonal, prolongation, restriction = self.levels[level]
+        x = inverse_diagonal * b
+        x = self._smooth(matrix, inverse_diagonal, x, b)
+        x += prolongation @ self._cycle(level + 1, restriction @ (b - matrix @ x))
+        return self._smooth(matrix, inverse_diagonal, x, b)
+
+    def __call__(self, b):
+        return self._cycle(0, b)
+
+
+def _preconditioned_cg(matrix, b, precondition, rtol, maxiter):
+    """Conjugate gradients on an SPD matrix; returns (x, iterations, relative residual)"""
+    x = np.zeros_like(b)
+    r = b.copy()
+    b_norm = np.linalg.norm(b) or 1.0
+    z = precondition(r)
+    p = z.copy()
+    rz = r @ z
+    for iteration in range(1, maxiter + 1):
+        q = matrix @ p
+        step = rz / (p @ q)
+        x += step * p
+        r -= step * q
+        residual = np.linalg.norm(r) / b_norm
+        if residual <= rtol:
+            return x, iteration, residual
+        z = precondition(r)
+        rz, rz_old = r @ z, rz
+        p *= rz / rz_old
+        p += z
+    return x, maxiter, residual
+
+
+def _edge_values(value, size):
+    """Broadcast a scalar or array boundary value to the length of an edge"""
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (size,))
+
+
+def solve_poisson_2d(nx, ny, lengths=(1.0, 1.0), source=None, edges=None, method='multigrid', rtol=1e-8, maxiter=None):
+    """
+    Solve u_xx + u_yy = f on a uniform (ny, nx) grid with a sparse 5-point stencil.
+
+    ``edges`` maps 'left', 'right', 'bottom', 'top' to ``(kind, values)`` where
+    kind is 'dirichlet' (values of u) or 'neumann' (values of u_x on left/right,
+    u_y on bottom/top); missing edges are homogeneous Dirichlet. Values are
+    scalars or arrays over the edge nodes. ``source`` is f on the grid (None for
+    Laplace). ``method`` selects sparse LU ('direct'), Jacobi-preconditioned
+    conjugate gradients ('cg') or multigrid-preconditioned CG ('multigrid').
+    The iterative methods keep memory linear in the number of grid points;
+    sparse LU suffers fill-in and is only practical for moderate grids.
+    """
+    if method not in POISSON_METHODS:
+        raise ValueError(f"Unknown Poisson method '{method}', expected one of {POISSON_METHODS}")
+    if nx < 3 or ny < 3:
+        raise ValueError("Poisson grids need at least 3 points per axis")
+    edges = {name: edges.get(name, ('dirichlet', 0.0)) for name in POISSON_EDGES} if edges else \
+        {name: ('dirichlet', 0.0) for name in POISSON_EDGES}
+    kinds = {name: edges[name][0] for name in POISSON_EDGES}
+    if set(kinds.values()) - {'dirichlet', 'neumann'}:
+        raise ValueError("Boundary edges must be 'dirichlet' or 'neumann'")
+    if 'dirichlet' not in kinds.values():
+        raise ValueError("At least one Dirichlet edge is required for a unique solution")
+
+    hx, hy = lengths[0] / (nx - 1), lengths[1] / (ny - 1)
+    kx, wx, xs = _axis_operator(nx, hx, kinds['left'], kinds['right'])
+    ky, wy, ys = _axis_operator(ny, hy, kinds['bottom'], kinds['top'])
+
+    # Weighted (symmetric) form of -Δ: Ky⊗Wx + Wy⊗Kx, row-major over (y, x)
+    matrix = (sparse.kron(ky, sparse.diags(wx)) + sparse.kron(sparse.diags(wy), kx)).tocsr()
+
+    rhs = np.zeros((ny, nx)) if source is None else -np.broadcast_to(np.asarray(source, dtype=np.float64), (ny, nx))
+    rhs = np.array(rhs[ys, xs])
+    left, right = (_edge_values(edges[name][1], ny)[ys] for name in ('left', 'right'))
+    bottom, top = (_edge_values(edges[name][1], nx)[xs] for name in ('bottom', 'top'))
+    rhs[:, 0] += left / hx ** 2 if kinds['left'] == 'dirichlet' else -2.0 * left / hx
+    rhs[:, -1] += right / hx ** 2 if kinds['right'] == 'dirichlet' else 2.0 * right / hx
+    rhs[0, :] += bottom / hy ** 2 if kinds['bottom'] == 'dirichlet' else -2.0 * bottom / hy
+    rhs[-1, :] += top / hy ** 2 if kinds['top'] == 'dirichlet' else 2.0 * top / hy
+    b = (wy[:, None] * wx[None, :] * rhs).ravel()
+
+    maxiter = maxiter or 10 * b.size
+    if method == 'direct':
+        solution = splinalg.spsolve(matrix.tocsc(), b)
+        iterations, residual = 1, np.linalg.norm(b - matrix @ solution) / (np.linalg.norm(b) or 1.0)
+    elif method == 'cg':
+        inverse_diagonal = 1.0 / matrix.diagonal()
+        solution, iterations, residual = _preconditioned_cg(
+            matrix, b, lambda r: inverse_diagonal * r, rtol, maxiter
+        )
+    else:
+        multigrid = _Multigrid(matrix, (ny, nx), (ys, xs))
+        solution, iterations, residual = _preconditioned_cg(matrix, b, multigrid, rtol, maxiter)
+
+    u = np.zeros((ny, nx))
+    u[ys, xs] = solution.reshape(rhs.shape)
+    for name, index in (('left', (slice(None), 0)), ('right', (slice(None), -1)),
+                        ('bottom', (0, slice(None))), ('top', (-1, slice(None)))):
+        if kinds[name] == 'dirichlet':
+            u[index] = _edge_values(edges[name][1], u[index].size)
+
+    return {
+        'u': u,
+        'iterations': iterations,
+        'residual': residual,
+    }
+
+
+def _stencil_views(u):
+    """Interior view of ``u`` plus (lower, upper) neighbour views along each axis"""
+    interior = (slice(1, -1),) * u.ndim
+    neighbours = []
+    for axis in range(u.ndim):
+        lower, upper = list(interior), list(interior)
+        lower[axis], upper[axis] = slice(None, -2), slice(2, None)
+        neighbours.append((u[tuple(lower)], u[tuple(upper)]))
+    return u[interior], neighbours
+
+
+def iter_wave(u0, v0, c, spacing, dt, steps, every=1):
+    """
+    Leapfrog integration of u_tt = c²·Δu in 1D or 2D, yielding snapshots.
+
+    ``u0`` and ``v0`` are the initial displacement and velocity on the full grid;
+    boundary nodes keep their initial values (fixed Dirichlet ends). Only two
+    field buffers are kept and updated in place, so memory is constant in the
+    number of steps. Yields ``(step, time, u)`` at step 0, every ``every``
+    steps and at the final step; ``u`` is the live buffer and is overwritten by
+    later steps, so copy it if it must outlive the iteration.
+    """
+    current = np.array(u0, dtype=np.float64)
+    if current.ndim not in (1, 2) or min(current.shape) < 3:
+        raise ValueError("Wave solver needs a 1D or 2D grid with at least 3 points per axis")
+    if steps < 1 or every < 1:
+        raise ValueError("Number of steps and snapshot interval must be positive")
+    spacing = np.broadcast_to(np.asarray(spacing, dtype=np.float64), (current.ndim,))
+    courant = c * dt * np.sqrt(np.sum(1.0 / spacing ** 2))
+    if courant > 1.0:
+        raise ValueError(f"Leapfrog scheme is unstable for Courant number {courant:.3g} > 1; increase the number of steps")
+    ratios = (c * dt / spacing) ** 2
+
+    previous = current.copy()
+    buffers = [_stencil_views(previous), _stencil_views(current)]
+    work = np.empty_like(buffers[0][0])
+
+    def add_laplacian(target, views, scale):
+        # target += scale·Σ_axis ratio·(u_lower - 2·u + u_upper) over the interior
+        center, neighbours = views
+        for ratio, (lower, upper) in zip(ratios, neighbours):
+            np.add(lower, upper, out=work)
+            np.subtract(work, center, out=work)
+            np.subtract(work, center, out=work)
+            np.multiply(work, scale * ratio, out=work)
+            target += work
+
+    yield 0, 0.0, current
+
+    # First step from the Taylor expansion u¹ = u⁰ + dt·v⁰ + ½·dt²·c²·Δu⁰ into the spare buffer
+    upcoming = buffers[0][0]
+    upcoming += dt * np.broadcast_to(v0, current.shape)[(slice(1, -1),) * current.ndim]
+    add_laplacian(upcoming, buffers[1], 0.5)
+    previous, current = current, previous
+    buffers.reverse()
+
+    stride = max(1, steps // PROGRESS_REPORTS)
+    for step in range(1, steps + 1):
+        if step % every == 0 or step == steps:
+            yield step, step * dt, current
+        if step == steps:
+            break
+        if step % stride == 0:
+            report_progress('step', step=step, steps=steps)
+        # u^{n+1} = 2·u^n - u^{n-1} + c²dt²·Δu^n, written over the u^{n-1} buffer
+        previous -= current
+        previous -= current
+        previous *= -1.0
+        add_laplacian(buffers[0][0], buffers[1], 1.0)
+        previous, current = current, previous
+        buffers.reverse()
+
+
+# Step size control of the adaptive integrators: safety factor, bounds on the ratio of
+# consecutive steps, and the most steps (accepted or rejected) one solve may take
+ADAPTIVE_SAFETY = 0.9
+ADAPTIVE_MIN_FACTOR = 0.2
+ADAPTIVE_MAX_FACTOR = 5.0
+ADAPTIVE_MAX_STEPS = 100000
+
+# Accepted and rejected step counts, linear solves, and the smallest/largest accepted step
+StepStats = namedtuple('StepStats', ['accepted', 'rejected', 'solves', 'dt_min', 'dt_max'])
+
+
+def _adaptive_steps(advance, state, t_end, dt, output_times, order, rtol, atol):
+    """
+    Error-controlled time loop shared by the adaptive integrators.
+
+    ``advance(state, t, h)`` returns a candidate state at t + h and an
+    estimate of its local error. A step is accepted when the RMS of
+    error / (atol + rtol·|state|) is at most 1; either way the next step is
+    scaled by SAFETY·norm^(-1/(order+1)) within [MIN_FACTOR, MAX_FACTOR].
+    Steps are shortened to land exactly on ``output_times`` (sorted, ending at
+    t_end). Yields ``(t, state)`` at each output time, then returns the list
+    of accepted step sizes and the rejection count. Progress is reported
+    about PROGRESS_REPORTS times, by simulated time.
+    """
+    t = 0.0
+    steps, rejected = [], 0
+    next_report = t_end / PROGRESS_REPORTS
+    outputs = [time for time in output_times if time > 0.0]
+    if len(outputs) < len(output_times):
+        yield t, state
+    for target in outputs:
+        while t < target:
+            if len(steps) + rejected >= ADAPTIVE_MAX_STEPS:
+                raise ValueError(f"Adaptive integration needed more than {ADAPTIVE_MAX_STEPS} steps; loosen the tolerances")
+            h = min(dt, target - t)
+            if h <= 1e-12 * t_end:
+                raise ValueError(f"Adaptive step size underflow at t = {t:.6g}")
+            candidate, error = advance(state, t, h)
+            scale = atol + rtol * np.maximum(np.abs(state), np.abs(candidate))
+            norm = float(np.sqrt(np.mean(np.square(error / scale))))
+            if not np.isfinite(norm):
+                norm = np.inf
+            factor = ADAPTIVE_MAX_FACTOR if norm == 0.0 else \
+                min(ADAPTIVE_MAX_FACTOR, max(ADAPTIVE_MIN_FACTOR, ADAPTIVE_SAFETY * norm ** (-1.0 / (order + 1))))
+            if norm <= 1.0:
+                clipped = h < dt
+                t = target if h == target - t else t + h
+                state = candidate
+                steps.append(h)
+                if t >= next_report:
+                    report_progress('step', step=len(steps), time=t, t_end=t_end)
+                    next_report = t + t_end / PROGRESS_REPORTS
+                # A step shortened to hit an output time says little about the next one
+                dt = max(dt, h * factor) if clipped else h * factor
+            else:
+                rejected += 1
+                dt = h * min(factor, 1.0)
+        yield t, state
+    return steps, rejected
+
+
+def _collect_adaptive(iterator, snapshots):
+    """Run an _adaptive_steps loop; returns the final state, output frames, their times and the step record"""
+    frames, times = [], []
+    while True:
+        try:
+            t, state = next(iterator)
+        except StopIteration as stop:
+            steps, rejected = stop.value
+            break
+        if snapshots:
+            frames.append(state.copy())
+            times.append(t)
+    return state, frames, times, np.array(steps), rejected
+
+
+def _crank_nicolson_step(u, r, left_next, right_next):
+    """One Crank–Nicolson step of the full grid ``u`` with mesh ratio r and new Dirichlet values"""
+    half_r = 0.5 * r
+    diagonal, off_diagonal, info = lapack.dpttrf(np.full(u.size - 2, 1.0 + r), np.full(u.size - 3, -half_r))
+    if info != 0:
+        raise ValueError("Failed to factor the Crank-Nicolson system")
+    rhs = u[:-2] + u[2:]
+    rhs -= 2.0 * u[1:-1]
+    rhs *= half_r
+    rhs += u[1:-1]
+    rhs[0] += half_r * left_next
+    rhs[-1] += half_r * right_next
+    interior, info = lapack.dpttrs(diagonal, off_diagonal, rhs)
+    return np.concatenate(([left_next], interior, [right_next]))
+
+
+def solve_heat_1d_adaptive(u0, alpha, dx, t_end, left=0.0, right=0.0, snapshots=0, rtol=1e-4, atol=1e-6, dt=None):
+    """
+    Integrate u_t = alpha·u_xx with error-controlled Crank–Nicolson steps.
+
+    Each step is taken once with h and twice with h/2; the difference, divided
+    by 3 (Richardson, CN is second order), estimates the local error of the
+    two half steps, which are kept. The implicit scheme is stable for any h,
+    so the step is limited only by accuracy: it grows as the high modes
+    decay, typically to hundreds of times the explicit limit dx²/(2·alpha).
+    The first step defaults to that limit. Returns the same keys as
+    solve_heat_1d plus ``dt``, the accepted step sizes, and ``stats``.
+    """
+    u = np.array(u0, dtype=np.float64)
+    if u.ndim != 1 or u.size < 3:
+        raise ValueError("Initial profile must be a 1D array with at least 3 points")
+    if t_end <= 0:
+        raise ValueError("End time must be positive")
+    u[0] = _boundary_value(left, 0.0)
+    u[-1] = _boundary_value(right, 0.0)
+    solves = [0]
+
+    def advance(u, t, h):
+        r = alpha * h / dx ** 2
+        full = _crank_nicolson_step(u, r, _boundary_value(left, t + h), _boundary_value(right, t + h))
+        half = _crank_nicolson_step(u, 0.5 * r, _boundary_value(left, t + 0.5 * h), _boundary_value(right, t + 0.5 * h))
+        half = _crank_nicolson_step(half, 0.5 * r, _boundary_value(left, t + h), _boundary_value(right, t + h))
+        solves[0] += 3
+        return half, (half - full) / 3.0
+
+    output_times = np.linspace(0.0, t_end, snapshots) if snapshots > 1 else np.array([t_end])
+    dt = min(t_end, dt or 0.5 * dx ** 2 / alpha)
+    u, frames, times, steps, rejected = _collect_adaptive(
+        _adaptive_steps(advance, u, t_end, dt, output_times, 2, rtol, atol), snapshots
+    )
+    return {
+        'u': u,
+        'frames': np.array(frames).reshape(len(frames), u.size),
+        'times': np.array(times),
+        'dt': steps,
+        'stats': StepStats(len(steps), rejected, solves[0], steps.min(), steps.max()),
+    }
+
+
+def solve_wave_adaptive(u0, v0, c, spacing, t_end, snapshots=0, rtol=1e-4, atol=1e-6, dt=None):
+    """
+    Integrate u_tt = c²·Δu in 1D or 2D with error-controlled implicit trapezoidal steps.
+
+    The trapezoidal rule on (u, v)' = (v, c²·Δu), Newmark's average
+    acceleration method, is unconditionally stable and conserves the discrete
+    energy. Unlike leapfrog its step is therefore not tied to the grid by the
+    CFL condition, only to the accuracy of the modes actually present. Steps
+    are controlled by step doubling as in solve_heat_1d_adaptive. Each step
+    solves (I + (h/2)²·K)·u = ... with K = -c²·Δ over the interior: by a
+    tridiagonal factorization per step size in 1D, by Jacobi-preconditioned
+    CG in 2D. Boundary nodes keep their initial values like
+    iter_wave. The first step defaults to the leapfrog CFL limit. Returns
+    ``u``, ``frames``, ``times``, ``dt`` and ``stats`` as
+    solve_heat_1d_adaptive.
+    """
+    u = np.array(u0, dtype=np.float64)
+    if u.ndim not in (1, 2) or min(u.shape) < 3:
+        raise ValueError("Wave solver needs a 1D or 2D grid with at least 3 points per axis")
+    if t_end <= 0:
+        raise ValueError("End time must be positive")
+    spacing = np.broadcast_to(np.asarray(spacing, dtype=np.float64), (u.ndim,))
+    interior = (slice(1, -1),) * u.ndim
+
+    # c²·(-Δ) over the interior, row-major over (y, x) in 2D, and the fixed boundary's share of c²·Δu
+    operators = [_axis_operator(n, h, 'dirichlet', 'dirichlet')[0] for n, h in zip(u.shape, spacing)]
+    stiffness = operators[0]
+    for operator in operators[1:]:
+        stiffness = sparse.kron(stiffness, sparse.identity(operator.shape[0])) + \
+            sparse.kron(sparse.identity(stiffness.shape[0]), operator)
+    stiffness = (c ** 2 * stiffness).tocsr()
+    boundary = u.copy()
+    boundary[interior] = 0.0
+    forcing = c ** 2 * sum((lower + upper) / h ** 2 for h, (lower, upper) in zip(spacing, _stencil_views(boundary)[1]))
+    forcing = forcing.ravel()
+    identity = sparse.identity(stiffness.shape[0], format='csr')
+    systems = {}
+    solves = [0]
+
+    def system(beta):
+        # Only the current h and h/2 are needed again
+        if beta not in systems:
+            if len(systems) > 4:
+                systems.clear()
+            if u.ndim == 1:
+                # SPD tridiagonal: factored by LAPACK in O(n)
+                diagonal, off_diagonal, info = lapack.dpttrf(
+                    1.0 + beta * stiffness.diagonal(), beta * stiffness.diagonal(1)
+                )
+                if info != 0:
+                    raise ValueError("Failed to factor the trapezoidal wave system")
+                systems[beta] = lambda rhs: lapack.dpttrs(diagonal, off_diagonal, rhs)[0]
+            else:
+                # Diagonally dominant, so Jacobi-preconditioned CG converges in a few iterations
+                matrix = (identity + beta * stiffness).tocsr()
+                inverse_diagonal = 1.0 / matrix.diagonal()
+                systems[beta] = lambda rhs: _preconditioned_cg(
+                    matrix, rhs, lambda r: inverse_diagonal * r, 1e-3 * rtol, 10 * rhs.size
+                )[0]
+        return systems[beta]
+
+    def trapezoid(u, v, h):
+        beta = 0.25 * h * h
+        u_next = system(beta)(u - beta * (stiffness @ u) + h * v + 2.0 * beta * forcing)
+        solves[0] += 1
+        return u_next, 2.0 * (u_next - u) / h - v
+
+    def advance(y, t, h):
+        full = np.stack(trapezoid(y[0], y[1], h))
+        half = np.stack(trapezoid(*trapezoid(y[0], y[1], 0.5 * h), 0.5 * h))
+        return half, (half - full) / 3.0
+
+    def field(y):
+        full = boundary.copy()
+        full[interior] = y[0].reshape(full[interior].shape)
+        return full
+
+    state = np.stack([u[interior].ravel(), np.broadcast_to(np.asarray(v0, dtype=np.float64), u.shape)[interior].ravel()])
+    output_times = np.linspace(0.0, t_end, snapshots) if snapshots > 1 else np.array([t_end])
+    dt = min(t_end, dt or 1.0 / (c * np.sqrt(np.sum(1.0 / spacing ** 2))))
+    state, frames, times, steps, rejected = _collect_adaptive(
+        _adaptive_steps(advance, state, t_end, dt, output_times, 2, rtol, atol), snapshots
+    )
+    return {
+        'u': field(state),
+        'frames': np.array([field(frame) for frame in frames]).reshape((len(frames),) + u.shape),
+        'times': np.array(times),
+        'dt': steps,
+        'stats': StepStats(len(steps), rejected, solves[0], steps.min(), steps.max()),
+    }
@@ -0,0 +1,90 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .sandbox import SANDBOX_DEFAULTS
+
+OFFLOAD_DEFAULTS = {
+    'WORKERS': None,
+    'MAX_PENDING': 64,
+    'RETRY_AFTER': 5,
+}
+
+
+def offload_config():
+    config = dict(OFFLOAD_DEFAULTS)
+    config.update(getattr(settings, 'PDE_ASYNC_SOLVE', {}))
+    return config
+
+
+class ExecutorBusy(Exception):
+    """Raised instead of queueing when the executor already holds MAX_PENDING calls"""
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking solver calls made from async views.
+
+    At most ``max_pending`` calls may be queued or running; further submits
+    raise ExecutorBusy at once, so overload turns into quick 503 responses
+    instead of an ever-growing queue. Calls run in a copy of the caller's
+    context, so their stage timings reach the request's Server-Timing.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pde-solve')
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise ExecutorBusy(f"{self.pending} solves are already pending")
+            self.pending += 1
+        try:
+            future = self._executor.submit(contextvars.copy_context().run, func, *args)
+        except RuntimeError:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, func, *args):
+        """Await ``func(*args)`` in the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_solve_executor = None
+_solve_executor_lock = threading.Lock()
+
+
+def get_solve_executor():
+    """
+    Process-wide BoundedExecutor for async solves, created on first use.
+
+    By default there is one thread per sandbox process (the threads only
+    wait on the children) or per CPU when solves run inline.
+    """
+    global _solve_executor
+    with _solve_executor_lock:
+        if _solve_executor is None:
+            config = offload_config()
+            workers = config['WORKERS']
+            if workers is None:
+                sandbox = dict(SANDBOX_DEFAULTS)
+                sandbox.update(getattr(settings, 'PDE_SOLVER_SANDBOX', {}))
+                workers = sandbox['PROCESSES'] if sandbox['ENABLED'] else os.cpu_count() or 1
+            _solve_executor = BoundedExecutor(workers, config['MAX_PENDING'])
+    return _solve_executor
@@ -0,0 +1,103 @@
+import base64
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+
+# One page of a keyset-paginated list: cursors are None at either end
+KeysetPage = namedtuple('KeysetPage', ['object_list', 'next_cursor', 'previous_cursor'])
+
+
+def encode_cursor(obj):
+    """Opaque cursor for a row's (created_at, pk) position"""
+    return base64.urlsafe_b64encode(f'{obj.created_at.isoformat()}|{obj.pk}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(created_at, pk) from a cursor; ValueError if it is malformed"""
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = text.rsplit('|', 1)
+        position = parse_datetime(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError, base64.binascii.Error):
+        raise ValueError("Invalid cursor")
+    if position[0] is None:
+        raise ValueError("Invalid cursor")
+    return position
+
+
+def _keyset_query(queryset, size, after=None, before=None):
+    """The size + 1 rows to fetch for a page, in fetch order"""
+    if before:
+        created_at, pk = decode_cursor(before)
+        return queryset.filter(created_at__gte=created_at).exclude(created_at=created_at, pk__lte=pk) \
+            .order_by('created_at', 'pk')[:size + 1]
+    queryset = queryset.order_by('-created_at', '-pk')
+    if after:
+        created_at, pk = decode_cursor(after)
+        queryset = queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, pk__gte=pk)
+    return queryset[:size + 1]
+
+
+def _keyset_result(rows, size, after=None, before=None):
+    has_more = len(rows) > size
+    if before:
+        rows = rows[:size][::-1]
+        return KeysetPage(
+            rows,
+            encode_cursor(rows[-1]) if rows else None,
+            encode_cursor(rows[0]) if rows and has_more else None,
+        )
+    rows = rows[:size]
+    return KeysetPage(
+        rows,
+        encode_cursor(rows[-1]) if rows and has_more else None,
+        encode_cursor(rows[0]) if rows and after else None,
+    )
+
+
+def keyset_page(queryset, size, after=None, before=None):
+    """
+    A page of ``queryset`` in (-created_at, -pk) order, newest first.
+
+    ``after`` continues past a cursor (older rows) and ``before`` goes back
+    (newer rows). Each page is one indexed range scan of ``size + 1`` rows
+    however deep it is, unlike OFFSET pagination which reads and discards
+    every row in front of the page. The position test is written as a range
+    on created_at minus the tied rows already seen, rather than an OR of two
+    comparisons, so the planner seeks into the index instead of scanning it.
+    """
+    rows = list(_keyset_query(queryset, size, after, before))
+    return _keyset_result(rows, size, after, before)
+
+
+async def akeyset_page(queryset, size, after=None, before=None):
+    """keyset_page for async views, fetching through the async ORM"""
+    rows = [row async for row in _keyset_query(queryset, size, after, before)]
+    return _keyset_result(rows, size, after, before)
+
+
+def approximate_count(model, timeout=60):
+    """
+    Row count of a model's table, cached for ``timeout`` seconds.
+
+    On PostgreSQL the planner's estimate (pg_class.reltuples, kept current by
+    autovacuum/ANALYZE) is used instead of a full COUNT(*); other backends
+    count exactly, but at most once per timeout.
+    """
+    key = f'approximate_count:{model._meta.db_table}'
+    count = cache.get(key)
+    if count is None:
+        count = -1
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                               [model._meta.db_table])
+                row = cursor.fetchone()
+                count = row[0] if row else -1
+        if count < 0:
+            # Never analyzed (reltuples is -1) or not PostgreSQL
+            count = model.objects.count()
+        cache.set(key, count, timeout)
+    return count
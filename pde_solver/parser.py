@@ -0,0 +1,225 @@
+import ast
+import re
+from functools import lru_cache
+
+import sympy as sp
+from sympy import symbols, Function, Eq, Derivative
+
+
+MAX_EXPRESSION_LENGTH = 1000
+
+MAX_EXPONENT = 100
+
+# Largest exact number, in bits, a power of numbers may evaluate to; SymPy computes these
+# eagerly, so nested powers such as (9**99)**99 are bounded by their value, not their exponent
+MAX_POWER_BITS = 4096
+
+# Highest total derivative order accepted in .diff() and Derivative()
+MAX_DERIVATIVE_ORDER = 10
+
+# Symbols and the unknown function are created once and shared by every parse
+x, t, y, z, c, D, k, L = symbols('x t y z c D k L', real=True, positive=True)
+u = Function('u')
+
+# Independent variables in the order they appear as arguments of u
+VARIABLES = {'x': x, 'y': y, 'z': z, 't': t}
+
+NAMESPACE = {
+    'u': u,
+    'x': x,
+    't': t,
+    'y': y,
+    'z': z,
+    'c': c,
+    'D': D,
+    'k': k,
+    'L': L,
+    'pi': sp.pi,
+    'E': sp.E,
+}
+
+FUNCTIONS = {
+    'sin': sp.sin,
+    'cos': sp.cos,
+    'tan': sp.tan,
+    'exp': sp.exp,
+    'log': sp.log,
+    'sqrt': sp.sqrt,
+    'sinh': sp.sinh,
+    'cosh': sp.cosh,
+    'tanh': sp.tanh,
+    'Abs': sp.Abs,
+}
+
+BINARY_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Pow: lambda a, b: a ** b,
+}
+
+UNARY_OPERATORS = {
+    ast.USub: lambda a: -a,
+    ast.UAdd: lambda a: a,
+}
+
+# Shorthand partial derivatives such as u_t, u_xx, u_xy
+SHORTHAND = re.compile(r'^u_([xyzt]+)$')
+
+# A single '=' that is not part of '==', '<=', '>=' or '!='
+ASSIGNMENT = re.compile(r'(?<![=<>!])=(?!=)')
+
+
+@lru_cache(maxsize=256)
+def _derivative(expr, variables, evaluate):
+    """Memoized Derivative construction; the same u_xx-style terms recur across inputs"""
+    return Derivative(expr, *variables, evaluate=evaluate)
+
+
+def _check_power(base, exponent):
+    """Raise ValueError for powers whose exponent or exact value is too large to build"""
+    if exponent.is_Number and abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"Exponent {exponent} is larger than {MAX_EXPONENT}")
+    if base.is_Rational and exponent.is_Number:
+        bits = max(base.p.bit_length(), base.q.bit_length()) * abs(exponent)
+        if bits > MAX_POWER_BITS:
+            raise ValueError(f"Power has more than {MAX_POWER_BITS} bits")
+
+
+def _bounded_derivative(expr, variables):
+    """Unevaluated derivative, raising ValueError when its total order exceeds MAX_DERIVATIVE_ORDER"""
+    derivative = _derivative(expr, variables, False)
+    if isinstance(derivative, Derivative) and derivative.derivative_count > MAX_DERIVATIVE_ORDER:
+        raise ValueError(f"Derivatives of order above {MAX_DERIVATIVE_ORDER} are not supported")
+    return derivative
+
+
+class _Builder(ast.NodeVisitor):
+    """Turn a whitelisted Python AST into a SymPy expression without eval"""
+
+    def __init__(self, arguments):
+        # Arguments of u used for the bare name and the u_xx shorthand
+        self.arguments = arguments
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        return self.visit(node.body)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        return sp.Integer(node.value) if isinstance(node.value, int) else sp.Float(node.value)
+
+    def visit_Name(self, node):
+        if node.id in NAMESPACE:
+            if node.id == 'u':
+                return u(*self.arguments)
+            return NAMESPACE[node.id]
+        match = SHORTHAND.match(node.id)
+        if match:
+            return _derivative(u(*self.arguments), tuple(VARIABLES[name] for name in match.group(1)), False)
+        raise ValueError(f"Unknown name: {node.id}")
+
+    def visit_Tuple(self, node):
+        return tuple(self.visit(element) for element in node.elts)
+
+    def visit_BinOp(self, node):
+        operator = BINARY_OPERATORS.get(type(node.op))
+        if operator is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = self.visit(node.left), self.visit(node.right)
+        if operator is BINARY_OPERATORS[ast.Pow]:
+            _check_power(left, right)
+        return operator(left, right)
+
+    def visit_UnaryOp(self, node):
+        operator = UNARY_OPERATORS.get(type(node.op))
+        if operator is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        return operator(self.visit(node.operand))
+
+    def visit_Compare(self, node):
+        if len(node.ops) != 1 or not isinstance(node.ops[0], ast.Eq):
+            raise ValueError("Only a single '==' comparison is supported")
+        return Eq(self.visit(node.left), self.visit(node.comparators[0]))
+
+    def visit_Call(self, node):
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        args = [self.visit(arg) for arg in node.args]
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            if func.attr != 'diff':
+                raise ValueError(f"Unsupported method: .{func.attr}()")
+            return _bounded_derivative(self.visit(func.value), tuple(args))
+        if not isinstance(func, ast.Name):
+            raise ValueError("Unsupported call")
+        if func.id == 'u':
+            return u(*args)
+        if func.id == 'Eq':
+            if len(args) != 2:
+                raise ValueError("Eq() takes exactly two arguments")
+            return Eq(*args)
+        if func.id == 'Derivative':
+            if not args:
+                raise ValueError("Derivative() needs an expression")
+            return _bounded_derivative(args[0], tuple(args[1:]))
+        if func.id in FUNCTIONS:
+            return FUNCTIONS[func.id](*args)
+        raise ValueError(f"Unknown function: {func.id}")
+
+
+def _shorthand_arguments(trees):
+    """Arguments of u for bare u and u_xx-style names, e.g. u_t = u_xx gives (x, t)"""
+    letters = set()
+    for tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                match = SHORTHAND.match(node.id)
+                if match:
+                    letters.update(match.group(1))
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'u':
+                letters.update(arg.id for arg in node.args if isinstance(arg, ast.Name) and arg.id in VARIABLES)
+    if not letters:
+        letters = {'x', 't'}
+    return tuple(symbol for name, symbol in VARIABLES.items() if name in letters)
+
+
+@lru_cache(maxsize=1024)
+def parse_expression(text):
+    """
+    Parse an expression or equation string into SymPy using a whitelisted AST walk.
+
+    Accepts SymPy-style input (``Eq(u(x, t).diff(t), u(x, t).diff(x, 2))``)
+    and the shorthand ``u_t = u_xx``; a single top-level ``=`` (or ``==``)
+    builds an ``Eq`` and ``^`` means power. Results are memoized, which is safe because SymPy
+    expressions are immutable.
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError("Empty expression")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+
+    # '^' is accepted as power, as in the form examples
+    sides = ASSIGNMENT.split(text.replace('^', '**'))
+    if len(sides) > 2:
+        raise ValueError("Only one '=' is allowed")
+    try:
+        trees = [ast.parse(side.strip(), mode='eval') for side in sides]
+    except SyntaxError as e:
+        raise ValueError(f"Invalid syntax: {e.msg}")
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply")
+
+    builder = _Builder(_shorthand_arguments(trees))
+    try:
+        expressions = [builder.visit(tree) for tree in trees]
+    except (TypeError, AttributeError) as e:
+        raise ValueError(str(e))
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply")
+    return Eq(*expressions) if len(expressions) == 2 else expressions[0]
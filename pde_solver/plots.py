@@ -0,0 +1,164 @@
+import os
+
+import numpy as np
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .evaluation import PARAMETERS, evaluate_grid
+from .parser import VARIABLES
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+except ImportError:  # pragma: no cover - plotting is optional
+    matplotlib = None
+
+PLOT_DEFAULTS = {
+    'GRID_POINTS': 101,
+    'MAX_PIXELS': 400,
+}
+
+PLOT_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+# Figure width and height in inches and resolution per size
+PLOT_SIZES = {
+    'thumb': (3.2, 2.0, 80),
+    'full': (8.0, 5.0, 100),
+}
+
+
+def plot_config():
+    config = dict(PLOT_DEFAULTS)
+    config.update(getattr(settings, 'PDE_PLOTS', {}))
+    return config
+
+
+def plotting_available():
+    return matplotlib is not None
+
+
+def _thin(values, axis, limit):
+    """Every k-th point along axis so at most ``limit`` remain; slicing keeps mmap arrays lazy"""
+    step = max(1, -(-values.shape[axis] // limit))
+    index = [slice(None)] * values.ndim
+    index[axis] = slice(None, None, step)
+    return values[tuple(index)], step
+
+
+def plot_field(solution):
+    """
+    The field to draw for a solution as (kind, (x label, xs), (y label, ys), values), or None.
+
+    Stored numeric results are preferred: frames over time become a heatmap of
+    u(x, t) and a 2D final state a contour plot of u(x, y). Closed-form
+    solutions are evaluated on a GRID_POINTS grid over [0, 1] with parameters
+    set to 1. ``values`` has shape (len(ys), len(xs)).
+    """
+    config = plot_config()
+    arrays = {array.name: array for array in solution.arrays.all()}
+    if 'frames' in arrays and 'times' in arrays and 'x' in arrays and 'y' not in arrays:
+        frames, row_step = _thin(arrays['frames'].load(), 0, config['MAX_PIXELS'])
+        frames, column_step = _thin(frames, 1, config['MAX_PIXELS'])
+        xs = np.asarray(arrays['x'].load()[::column_step])
+        ts = np.asarray(arrays['times'].load()[::row_step])
+        return 'heatmap', ('x', xs), ('t', ts), np.asarray(frames)
+    if 'u' in arrays and 'x' in arrays and 'y' in arrays and len(arrays['u'].shape) == 2:
+        u, row_step = _thin(arrays['u'].load(), 0, config['MAX_PIXELS'])
+        u, column_step = _thin(u, 1, config['MAX_PIXELS'])
+        xs = np.asarray(arrays['x'].load()[::column_step])
+        ys = np.asarray(arrays['y'].load()[::row_step])
+        return 'contour', ('x', xs), ('y', ys), np.asarray(u)
+
+    if not solution.expression:
+        return None
+    names = [name for name in (*VARIABLES, *PARAMETERS) if name in solution.expression_names()]
+    variables = [name for name in names if name in VARIABLES]
+    if variables not in (['x', 't'], ['x', 'y']):
+        return None
+    grid = np.linspace(0.0, 1.0, config['GRID_POINTS'])
+    vertical = variables[1]
+    values = evaluate_grid(
+        solution.expression, [(vertical, grid), ('x', grid)],
+        fixed={name: 1.0 for name in names if name in PARAMETERS},
+    )
+    return ('heatmap' if vertical == 't' else 'contour'), ('x', grid), (vertical, grid), values
+
+
+def render_field(field, path, output, size):
+    """Draw a plot_field result into ``path`` with a headless Agg canvas"""
+    kind, (x_label, xs), (y_label, ys), values = field
+    width, height, dpi = PLOT_SIZES[size]
+    figure = Figure(figsize=(width, height), dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    values = np.ma.masked_invalid(values)
+    if kind == 'heatmap':
+        mesh = axes.pcolormesh(xs, ys, values, shading='auto', cmap='viridis')
+    else:
+        mesh = axes.contourf(xs, ys, values, levels=20, cmap='viridis')
+    if size == 'thumb':
+        axes.set_axis_off()
+        figure.subplots_adjust(0, 0, 1, 1)
+    else:
+        axes.set_xlabel(x_label)
+        axes.set_ylabel(y_label)
+        figure.colorbar(mesh, ax=axes, label='u')
+    figure.savefig(path, format=output)
+
+
+def plot_name(solution, output, size):
+    """Storage name of a cached plot; the update time is part of it so edited solutions are redrawn"""
+    return f'plots/{solution.pk}/{size}-{int(solution.updated_at.timestamp())}.{output}'
+
+
+def plot_file(solution, output='png', size='thumb'):
+    """
+    Absolute path of the cached plot, rendering it on first use; None if there is nothing to plot.
+
+    Files are written under a temporary name and renamed, so concurrent
+    requests never serve a partial image; stale versions are removed. A
+    render of a newer version may remove the returned file at any time, so
+    callers read it through open_plot.
+    """
+    if not plotting_available():
+        raise RuntimeError("Plotting needs matplotlib; install it with 'pip install matplotlib'")
+    if output not in PLOT_FORMATS or size not in PLOT_SIZES:
+        raise ValueError(f"Plots are {', '.join(PLOT_FORMATS)} in sizes {', '.join(PLOT_SIZES)}")
+    path = default_storage.path(plot_name(solution, output, size))
+    if os.path.exists(path):
+        return path
+
+    field = plot_field(solution)
+    if field is None:
+        return None
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    for stale in os.listdir(directory):
+        stale = os.path.join(directory, stale)
+        if stale != path and os.path.basename(stale).startswith(f'{size}-') and stale.endswith(f'.{output}'):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                # Already removed by a concurrent render
+                pass
+    partial = f'{path}.{os.getpid()}.tmp'
+    render_field(field, partial, output, size)
+    os.replace(partial, path)
+    return path
+
+
+def open_plot(solution, output='png', size='thumb'):
+    """plot_file opened for reading, or None; a file removed before it could be opened is rendered again"""
+    path = plot_file(solution, output, size)
+    if path is None:
+        return None
+    try:
+        return open(path, 'rb')
+    except FileNotFoundError:
+        path = plot_file(solution, output, size)
+        return open(path, 'rb') if path else None
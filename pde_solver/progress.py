@@ -0,0 +1,206 @@
+import asyncio
+import json
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.urls import reverse
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_DEFAULTS = {
+    'HEARTBEAT': 15,
+    'CACHE': 'default',
+    'RUN_TIMEOUT': 600,
+}
+
+# Events after which a run's stream ends
+FINAL_EVENTS = ('done', 'cancelled', 'error')
+
+# (callback, cancelled) of a solve whose progress is being streamed; None otherwise
+_progress = ContextVar('pde_progress', default=None)
+
+
+def progress_config():
+    config = dict(PROGRESS_DEFAULTS)
+    config.update(getattr(settings, 'PDE_PROGRESS', {}))
+    return config
+
+
+@contextmanager
+def progress_listener(callback, cancelled=None):
+    """
+    Send the progress events reported inside the block to ``callback(event, data)``.
+
+    ``cancelled`` is an optional callable polled by the sandbox while it waits
+    for a child; see SolveRun.
+    """
+    token = _progress.set((callback, cancelled) if callback is not None else None)
+    try:
+        yield
+    finally:
+        _progress.reset(token)
+
+
+def current_listener():
+    """(callback, cancelled) installed by progress_listener, or None"""
+    return _progress.get()
+
+
+def report_progress(event, **data):
+    """Pass a progress event to the current listener; a single ContextVar lookup when there is none"""
+    listener = _progress.get()
+    if listener is not None:
+        listener[0](event, data)
+
+
+def _run_key(run_id):
+    return f'pde_run:{run_id}'
+
+
+def _cancel_key(run_id):
+    return f'pde_run_cancel:{run_id}'
+
+
+def sse_event(event, data):
+    """One Server-Sent Events message; json.dumps output never contains a newline"""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def cancel_run(run_id):
+    """
+    Ask a streamed run to stop; False if no such run is active.
+
+    The flag lives in the PDE_PROGRESS['CACHE'] alias, so with a cache
+    shared between workers any process can cancel any run.
+    """
+    cache = caches[progress_config()['CACHE']]
+    if cache.get(_run_key(run_id)) is None:
+        return False
+    cache.set(_cancel_key(run_id), True, progress_config()['RUN_TIMEOUT'])
+    return True
+
+
+class SolveRun:
+    """
+    A solve whose progress is streamed to the client as Server-Sent Events.
+
+    ``solve()`` and ``save(result)`` run on a worker thread; every event
+    they report (stage starts, classification, numeric time steps, the
+    result before it is saved, the stored solution) is queued with the time
+    elapsed since the run was created. The response reads the queue with
+    ``stream()`` under WSGI or ``astream()`` under ASGI. Cancelling kills
+    the sandbox child at once and skips the save.
+    """
+
+    def __init__(self, solve, save):
+        self.id = uuid.uuid4().hex
+        self.solve = solve
+        self.save = save
+        self.started = time.monotonic()
+        self.finished = False
+        self.abandoned = False
+        self._config = progress_config()
+        self._cache = caches[self._config['CACHE']]
+        self._events = queue.Queue()
+        self._loop = None
+        self._wakeup = None
+
+    def emit(self, event, data=None):
+        data = dict(data or {})
+        data['elapsed'] = round(time.monotonic() - self.started, 3)
+        self._events.put((event, data))
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def cancelled(self):
+        return self.abandoned or bool(self._cache.get(_cancel_key(self.id)))
+
+    def start(self, executor):
+        """Register the run as cancellable and submit it; raises ExecutorBusy like executor.submit"""
+        self._cache.set(_run_key(self.id), True, self._config['RUN_TIMEOUT'])
+        try:
+            executor.submit(self.run)
+        except Exception:
+            self._cache.delete(_run_key(self.id))
+            raise
+
+    def run(self):
+        # metrics imports this module for report_progress
+        from .metrics import stage
+        close_old_connections()
+        try:
+            with progress_listener(self.emit, self.cancelled):
+                result = self.solve()
+                if result['status'] == 'cancelled' or self.cancelled():
+                    self.emit('cancelled')
+                    return
+                self.emit('result', {key: result[key] for key in ('status', 'method', 'solution')})
+                with stage('save'):
+                    solution, created = self.save(result)
+            self.emit('done', {
+                'id': solution.pk, 'url': reverse('solution_detail', args=[solution.pk]), 'reused': not created,
+            })
+        except Exception as e:
+            logger.error(f"Streamed solve {self.id} failed: {str(e)}")
+            self.emit('error', {'message': str(e)})
+        finally:
+            self._cache.delete_many([_run_key(self.id), _cancel_key(self.id)])
+            close_old_connections()
+
+    def opening(self):
+        return sse_event('run', {'id': self.id, 'cancel_url': reverse('cancel_solve_run', args=[self.id])})
+
+    def _drain(self):
+        while True:
+            try:
+                event, data = self._events.get_nowait()
+            except queue.Empty:
+                return
+            if event in FINAL_EVENTS:
+                self.finished = True
+            yield sse_event(event, data)
+
+    def stream(self):
+        """Blocking iterator of SSE messages; closing it early cancels the run"""
+        try:
+            yield self.opening()
+            while not self.finished:
+                try:
+                    event, data = self._events.get(timeout=self._config['HEARTBEAT'])
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if event in FINAL_EVENTS:
+                    self.finished = True
+                yield sse_event(event, data)
+        finally:
+            self.abandoned = not self.finished
+
+    async def astream(self):
+        """Async iterator of SSE messages for ASGI servers; closing it early cancels the run"""
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        try:
+            yield self.opening()
+            while True:
+                self._wakeup.clear()
+                for message in self._drain():
+                    yield message
+                if self.finished:
+                    return
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._config['HEARTBEAT'])
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+        finally:
+            self._loop = None
+            self.abandoned = not self.finished
@@ -0,0 +1,233 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+
+from .metrics import collect_stages, record_result, record_stage
+from .progress import current_listener, progress_listener
+from .solver import PDESolver
+import logging
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource limits are POSIX only
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+SANDBOX_DEFAULTS = {
+    'ENABLED': True,
+    'PROCESSES': 2,
+    'MEMORY_LIMIT_MB': 1024,
+    'MAX_SOLVES_PER_CHILD': 100,
+}
+
+
+def _address_space_bytes():
+    """Current virtual memory size of this process, or 0 where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _child_main(conn, memory_limit_bytes):
+    """Sandboxed child loop: receive solve_pde arguments, send back results"""
+    if resource is not None and memory_limit_bytes:
+        # The limit is headroom on top of what the forked child already maps
+        limit = _address_space_bytes() + memory_limit_bytes
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    while True:
+        try:
+            args, streamed = conn.recv()
+        except (EOFError, OSError):
+            break
+        # Progress events are sent as they happen when the parent streams them
+        send_progress = (lambda event, data: conn.send(('progress', event, data))) if streamed else None
+        # Stage timings go back with the result; the child's own metrics are never scraped
+        with collect_stages() as stages, progress_listener(send_progress):
+            try:
+                result = PDESolver.solve_pde(*args)
+            except MemoryError:
+                result = {'solution': 'Error solving PDE: memory limit exceeded', 'method': 'N/A', 'status': 'error'}
+        conn.send(('result', result, stages))
+    conn.close()
+
+
+class _Child:
+    """Handle on one pre-forked solver process"""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.solves = 0
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class SandboxPool:
+    """
+    Pre-forked pool of child processes that run PDESolver.solve_pde.
+
+    Each child runs under an RLIMIT_AS memory cap, a solve that exceeds the
+    wall-clock timeout kills its child, and children are recycled after
+    ``max_solves`` solves to bound memory growth. A replacement is forked
+    whenever a child is killed or retired, so the pool size stays constant.
+    """
+
+    # Seconds between checks of a solve's cancelled() callable
+    CANCEL_POLL_INTERVAL = 0.1
+
+    def __init__(self, processes=2, timeout=30, memory_limit_mb=1024, max_solves=100):
+        self.timeout = timeout
+        self.memory_limit_bytes = int(memory_limit_mb * 1024 * 1024) if memory_limit_mb else 0
+        self.max_solves = max_solves
+        self._idle = queue.Queue()
+        self._children = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(processes):
+            self._idle.put(self._spawn())
+
+    @classmethod
+    def from_settings(cls, **overrides):
+        """Pool configured by PDE_SOLVER_SANDBOX and PDE_SOLVER_TIMEOUT; keyword arguments override them"""
+        config = dict(SANDBOX_DEFAULTS)
+        config.update(getattr(settings, 'PDE_SOLVER_SANDBOX', {}))
+        arguments = {
+            'processes': config['PROCESSES'],
+            'timeout': getattr(settings, 'PDE_SOLVER_TIMEOUT', 30),
+            'memory_limit_mb': config['MEMORY_LIMIT_MB'],
+            'max_solves': config['MAX_SOLVES_PER_CHILD'],
+        }
+        arguments.update(overrides)
+        return cls(**arguments)
+
+    def _spawn(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_child_main, args=(child_conn, self.memory_limit_bytes), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        child = _Child(process, parent_conn)
+        with self._lock:
+            self._children.add(child)
+        return child
+
+    def _replace(self, child, kill=False):
+        with self._lock:
+            self._children.discard(child)
+        child.stop(kill=kill)
+        return self._spawn()
+
+    def solve(self, equation_str, boundary_conditions_str="", initial_conditions_str="", mode='symbolic', options=None,
+              progress=None, cancelled=None):
+        """
+        Run solve_pde in a child; returns a result dict with status 'timeout' if it ran too long.
+
+        ``progress(event, data)`` receives the child's progress events as they
+        arrive. ``cancelled()`` is polled every CANCEL_POLL_INTERVAL seconds;
+        once it returns true the child is killed and replaced, and a result
+        with status 'cancelled' is returned.
+        """
+        if self._closed:
+            raise RuntimeError("Sandbox pool is closed")
+        child = self._idle.get()
+        try:
+            args = (equation_str, boundary_conditions_str, initial_conditions_str, mode, options)
+            child.conn.send((args, progress is not None))
+            deadline = time.monotonic() + self.timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Solve exceeded {self.timeout} s, killing child {child.process.pid}")
+                    child = self._replace(child, kill=True)
+                    return {
+                        'solution': f"Solving the PDE took longer than {self.timeout} seconds and was stopped",
+                        'method': 'N/A',
+                        'status': 'timeout',
+                    }
+                if cancelled is not None:
+                    if cancelled():
+                        child = self._replace(child, kill=True)
+                        return {'solution': "The solve was cancelled", 'method': 'N/A', 'status': 'cancelled'}
+                    remaining = min(remaining, self.CANCEL_POLL_INTERVAL)
+                if not child.conn.poll(remaining):
+                    continue
+                message = child.conn.recv()
+                if message[0] == 'progress':
+                    progress(message[1], message[2])
+                    continue
+                _, result, stages = message
+                break
+            for name, seconds, error in stages:
+                record_stage(name, seconds, error)
+            child.solves += 1
+            if child.solves >= self.max_solves:
+                child = self._replace(child)
+            return result
+        except (EOFError, OSError) as e:
+            # The child died mid-solve, typically killed for exceeding its memory limit
+            logger.error(f"Sandboxed solve failed: {str(e)}")
+            child = self._replace(child, kill=True)
+            return {
+                'solution': "Error solving PDE: the solver process exited unexpectedly",
+                'method': 'N/A',
+                'status': 'error',
+            }
+        finally:
+            self._idle.put(child)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            children, self._children = list(self._children), set()
+        for child in children:
+            child.stop()
+
+
+_sandbox_pool = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox_pool():
+    """Process-wide SandboxPool, created on first use (after any server fork)"""
+    global _sandbox_pool
+    with _sandbox_lock:
+        if _sandbox_pool is None:
+            _sandbox_pool = SandboxPool.from_settings()
+    return _sandbox_pool
+
+
+def sandboxed_solve_pde(equation_str, boundary_conditions_str="", initial_conditions_str="", mode='symbolic', options=None):
+    """
+    solve_pde in the sandbox pool, or inline when PDE_SOLVER_SANDBOX['ENABLED'] is off.
+
+    A progress_listener around the call receives the child's progress events
+    and can cancel the solve; inline solves report progress but run to the end.
+    """
+    config = dict(SANDBOX_DEFAULTS)
+    config.update(getattr(settings, 'PDE_SOLVER_SANDBOX', {}))
+    if not config['ENABLED']:
+        result = PDESolver.solve_pde(equation_str, boundary_conditions_str, initial_conditions_str, mode, options)
+    else:
+        progress, cancelled = current_listener() or (None, None)
+        result = get_sandbox_pool().solve(
+            equation_str, boundary_conditions_str, initial_conditions_str, mode, options, progress, cancelled
+        )
+    record_result(result)
+    return result
@@ -0,0 +1,87 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+# Text columns of PDESolution covered by the full-text index, in index order
+SEARCH_FIELDS = ('equation', 'boundary_conditions', 'initial_conditions', 'method_used', 'solution')
+
+SQLITE_TABLE = 'pde_solver_pdesolution_fts'
+
+# Weights per column for ranking: matches in the equation count most
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(equation, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(method_used, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(boundary_conditions, '') || ' ' || coalesce(initial_conditions, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(solution, '')), 'D')"
+)
+
+# Detected backend per database, so searching does not introspect on every request
+_backends = {}
+
+
+def search_terms(text):
+    """Words of a search string; identifiers like u_xx stay whole, operators and quotes are dropped"""
+    return re.findall(r'\w+', text or '')[:20]
+
+
+def search_backend():
+    """
+    'postgres' (tsvector column with a GIN index), 'fts5' (SQLite virtual
+    table) or 'like' when the database has neither; the index objects are
+    created by migration 0006 where the backend supports them.
+    """
+    key = (connection.alias, str(connection.settings_dict['NAME']))
+    if key not in _backends:
+        if connection.vendor == 'postgresql':
+            _backends[key] = 'postgres'
+        elif connection.vendor == 'sqlite' and SQLITE_TABLE in connection.introspection.table_names():
+            _backends[key] = 'fts5'
+        else:
+            _backends[key] = 'like'
+    return _backends[key]
+
+
+def search_solutions(text, queryset):
+    """
+    Solutions in ``queryset`` containing every word of ``text``, best matches first.
+
+    The last word also matches as a prefix so partial input finds results.
+    Results are annotated with ``rank`` (lower is better); an empty search
+    matches nothing.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+    backend = search_backend()
+    table = queryset.model._meta.db_table
+
+    if backend == 'fts5':
+        match = ' AND '.join(f'"{term}"' for term in terms) + '*'
+        # A join, not a correlated rank subquery: FTS5 ranks all matches in one
+        # pass, where a subquery would rerun the MATCH once per matching row
+        return queryset.extra(
+            tables=[SQLITE_TABLE],
+            where=[f'{SQLITE_TABLE}.rowid = {table}.id', f'{SQLITE_TABLE} MATCH %s'],
+            params=[match],
+            select={'rank': f'{SQLITE_TABLE}.rank'},
+        ).order_by('rank', '-created_at', '-pk')
+
+    if backend == 'postgres':
+        tsquery = ' & '.join(terms) + ':*'
+        return queryset.filter(
+            RawSQL(f"{table}.search_vector @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+        ).annotate(
+            # ts_rank grows with relevance; negate it so ascending rank is best first on every backend
+            rank=RawSQL(f"-ts_rank({table}.search_vector, to_tsquery('simple', %s))", [tsquery],
+                        output_field=FloatField())
+        ).order_by('rank', '-created_at', '-pk')
+
+    condition = reduce(and_, (
+        reduce(or_, (Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS)) for term in terms
+    ))
+    return queryset.filter(condition).annotate(rank=RawSQL('0', [], output_field=FloatField())) \
+        .order_by('-created_at', '-pk')
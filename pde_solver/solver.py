@@ -1,6 +1,19 @@
 import sympy as sp
-from sympy import symbols, Function, Eq, dsolve, Derivative, sin, cos, exp, pi
+import numpy as np
+from sympy import Eq, dsolve, Derivative
+from sympy.core.function import AppliedUndef
 from django.conf import settings
+from .classifier import classify
+from .closed_form import closed_form_solution
+from .conditions import parse_conditions
+from .method_of_lines import compile_evolution, solve_method_of_lines, supports_method_of_lines
+from .metrics import stage
+from .parser import NAMESPACE, parse_expression
+from .progress import report_progress
+from .numerics import (
+    NUMERIC_DEFAULTS, TIME_STEPPING, iter_wave, solve_heat_1d, solve_heat_1d_adaptive, solve_poisson_2d,
+    solve_wave_adaptive,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,86 +37,75 @@ class PDESolver:
     def parse_equation(equation_str):
         """Parse a PDE string into SymPy equation"""
         try:
-            # Define symbols and function
-            x, t, y, z, c, D, k, L = symbols('x t y z c D k L', real=True, positive=True)
-            u = Function('u')
-            
-            # Create namespace for eval
-            namespace = {
-                'u': u,
-                'x': x,
-                't': t,
-                'y': y,
-                'z': z,
-                'c': c,
-                'D': D,
-                'k': k,
-                'L': L,
-                'sin': sin,
-                'cos': cos,
-                'exp': exp,
-                'pi': pi,
-                'Eq': Eq,
-                'Derivative': Derivative,
-                'symbols': symbols,
-                'Function': Function,
-                'sp': sp,
-            }
-            
-            # Parse the equation
-            equation = eval(equation_str, namespace)
-            return equation, namespace
-        except Exception as e:
+            return parse_expression(equation_str), NAMESPACE
+        except ValueError as e:
             raise ValueError(f"Error parsing PDE: {str(e)}")
     
     @staticmethod
-    def solve_pde(equation_str, boundary_conditions_str="", initial_conditions_str=""):
-        """Solve a PDE with optional boundary and initial conditions"""
+    def solve_pde(equation_str, boundary_conditions_str="", initial_conditions_str="", mode='symbolic', options=None):
+        """
+        Solve a PDE with optional boundary and initial conditions.
+
+        The equation is classified first. In symbolic mode canonical forms whose
+        conditions admit a closed form are solved directly (see closed_form.py);
+        other recognized families go straight to their entry in SOLVER_BACKENDS,
+        and SymPy's dsolve/pdsolve is only tried for the rest. With
+        ``mode='numeric'`` supported families are integrated on a grid and the
+        arrays are returned under the ``data`` key.
+        """
         try:
             # Parse the equation
-            equation, namespace = PDESolver.parse_equation(equation_str)
+            with stage('parse'):
+                equation, namespace = PDESolver.parse_equation(equation_str)
+            with stage('classify'):
+                classification = classify(equation)
+            report_progress('classified', family=classification.family, type=classification.type, order=int(classification.order))
+            data = None
+            expression = None
             
-            # Try to solve the PDE
-            u = namespace['u']
-            
-            # Attempt symbolic solution
-            try:
-                # For simple cases, dsolve can handle some PDEs
-                solution = dsolve(equation, u)
-                solution_str = str(solution)
-                method = "SymPy dsolve"
-            except (NotImplementedError, AttributeError, TypeError, ValueError):
-                # If direct solving fails, try to identify and solve the PDE type
-                equation_lower = equation_str.lower()
-                
-                # Heat Equation: u_t = u_xx or similar
-                if ('u_t' in equation_lower or '.diff(t)' in equation_lower) and \
-                   ('u_xx' in equation_lower or '.diff(x, 2)' in equation_lower):
-                    solution_str = PDESolver.solve_heat_equation(equation_str, boundary_conditions_str, initial_conditions_str, namespace)
-                    method = "Heat Equation Solver"
-                
-                # Wave Equation: u_tt = u_xx or similar
-                elif ('u_tt' in equation_lower or '.diff(t, 2)' in equation_lower) and \
-                     ('u_xx' in equation_lower or '.diff(x, 2)' in equation_lower):
-                    solution_str = PDESolver.solve_wave_equation(equation_str, boundary_conditions_str, initial_conditions_str, namespace)
-                    method = "Wave Equation Solver"
-                
-                # Laplace Equation: u_xx + u_yy = 0
-                elif ('u_xx' in equation_lower and 'u_yy' in equation_lower) or \
-                     ('.diff(x, 2)' in equation_lower and '.diff(y, 2)' in equation_lower):
-                    solution_str = PDESolver.solve_laplace_equation(equation_str, boundary_conditions_str, namespace)
-                    method = "Laplace Equation Solver"
-                
-                else:
+            closed_form = None
+            if mode == 'symbolic':
+                with stage('closed_form'):
+                    closed_form = closed_form_solution(classification, boundary_conditions_str, initial_conditions_str)
+            backend = SOLVER_BACKENDS.get((classification.family, mode))
+            if backend is None and mode == 'numeric' and supports_method_of_lines(classification):
+                # Any other evolution equation in x and t is discretized generically
+                backend = METHOD_OF_LINES_BACKEND
+            if closed_form is not None:
+                method, expression = closed_form
+                with stage('render'):
+                    solution_str = PDESolver.format_closed_form(
+                        equation, classification, expression, boundary_conditions_str, initial_conditions_str
+                    )
+            elif backend is not None:
+                # Recognized family: dispatch straight to its solver without a dsolve attempt
+                method, solver = backend
+                with stage(mode):
+                    solution_str, data = solver(equation_str, equation, boundary_conditions_str, initial_conditions_str, namespace, options)
+            else:
+                solution_str = None
+                if mode != 'numeric':
+                    try:
+                        with stage('dsolve'):
+                            solution_str, method = PDESolver.solve_symbolic(equation, classification)
+                    except (NotImplementedError, AttributeError, TypeError, ValueError) as e:
+                        report_progress('fallback', reason=f"dsolve failed: {type(e).__name__}")
+                if solution_str is None:
                     # Unknown PDE type
-                    solution_str = PDESolver.analyze_pde(equation_str, equation, namespace)
+                    with stage('analysis'):
+                        solution_str = PDESolver.analyze_pde(equation_str, equation, namespace)
                     method = "PDE Analysis"
             
-            return {
+            result = {
                 'solution': solution_str,
                 'method': method,
                 'status': 'success'
             }
+            if expression is not None:
+                result['expression'] = str(expression)
+            if data is not None:
+                result['data'] = data
+            return result
         
         except Exception as e:
             return {
@@ -112,6 +114,29 @@ class PDESolver:
                 'status': 'error'
             }
     
+    @staticmethod
+    def format_closed_form(equation, classification, expression, boundary_conditions_str, initial_conditions_str):
+        """Markdown report for a solution built by closed_form.py"""
+        arguments = ', '.join(str(var) for var in classification.variables)
+        solution = f"**✓ {classification.family.capitalize()} Equation Solved in Closed Form**\n\n"
+        solution += f"**PDE:** {sp.sstr(equation)}\n\n"
+        if initial_conditions_str:
+            solution += f"**Initial Condition:** {initial_conditions_str}\n\n"
+        if boundary_conditions_str:
+            solution += f"**Boundary Conditions:** {boundary_conditions_str}\n\n"
+        solution += "**Solution:**\n"
+        solution += f"u({arguments}) = {sp.sstr(expression)}\n"
+        return solution
+    
+    @staticmethod
+    def solve_symbolic(equation, classification):
+        """Try SymPy's dsolve for ODEs and pdsolve for first-order PDEs"""
+        if len(classification.variables) == 1:
+            return str(dsolve(equation, classification.function)), "SymPy dsolve"
+        if classification.order == 1:
+            return str(sp.pdsolve(equation, classification.function)), "SymPy pdsolve"
+        raise NotImplementedError("No symbolic solver for higher-order PDEs")
+    
     @staticmethod
     def solve_heat_equation(equation_str, boundary_conditions_str, initial_conditions_str, namespace):
         """Solve heat equation: ∂u/∂t = α·∂²u/∂x²"""
@@ -136,6 +161,176 @@ class PDESolver:
         
         return solution
     
+    @staticmethod
+    def numeric_options(options=None):
+        """Merge user supplied numeric options over NUMERIC_DEFAULTS"""
+        merged = dict(NUMERIC_DEFAULTS)
+        merged.update(options or {})
+        if merged['time_stepping'] not in TIME_STEPPING:
+            raise ValueError(f"Unknown time stepping '{merged['time_stepping']}', expected one of {TIME_STEPPING}")
+        return merged
+    
+    @staticmethod
+    def step_statistics(stats, t_end):
+        """Markdown lines describing an adaptive run's StepStats"""
+        lines = f"**Time stepping:** adaptive, {stats.accepted} steps to t = {t_end:g} "
+        lines += f"({stats.rejected} rejected, {stats.solves} linear solves)\n"
+        lines += f"**Step size:** {stats.dt_min:.3g} to {stats.dt_max:.3g}\n"
+        return lines
+    
+    @staticmethod
+    def numeric_parameters(namespace, options):
+        """Map parameter symbols (D, c, k, L, ...) to numeric values for substitution"""
+        values = {'L': options['length']}
+        values.update(options['params'])
+        return {namespace[name]: value for name, value in values.items() if name in namespace}
+    
+    @staticmethod
+    def derivative_coefficient(equation, namespace, options, *variables):
+        """Return the numeric coefficient of a derivative of u in ``lhs - rhs``"""
+        expr = equation.lhs - equation.rhs if isinstance(equation, Eq) else equation
+        functions = expr.atoms(AppliedUndef)
+        if len(functions) != 1:
+            raise ValueError("Numeric solvers need exactly one unknown function u(...)")
+        u_applied = functions.pop()
+        coefficient = sp.expand(expr).coeff(Derivative(u_applied, *variables))
+        coefficient = coefficient.subs(PDESolver.numeric_parameters(namespace, options))
+        if coefficient.free_symbols:
+            names = ', '.join(sorted(str(s) for s in coefficient.free_symbols))
+            raise ValueError(f"Provide numeric values for parameters: {names}")
+        return float(coefficient)
+    
+    @staticmethod
+    def condition_function(value, variable, namespace, options):
+        """Compile a condition value into a NumPy function of one variable"""
+        value = value.subs(PDESolver.numeric_parameters(namespace, options))
+        return sp.lambdify(variable, value, 'numpy')
+    
+    @staticmethod
+    def solve_heat_numeric(equation, boundary_conditions_str, initial_conditions_str, namespace, options=None):
+        """Solve the 1D heat equation with finite differences (explicit or Crank–Nicolson)"""
+        options = PDESolver.numeric_options(options)
+        x, t = namespace['x'], namespace['t']
+        
+        alpha = -PDESolver.derivative_coefficient(equation, namespace, options, (x, 2)) / \
+            PDESolver.derivative_coefficient(equation, namespace, options, t)
+        if alpha <= 0:
+            raise ValueError("Heat equation requires a positive diffusion coefficient")
+        
+        length = float(options['length'])
+        nx, steps = int(options['nx']), int(options['steps'])
+        grid = np.linspace(0.0, length, nx)
+        dx = grid[1] - grid[0]
+        dt = float(options['t_end']) / steps
+        
+        # Initial profile u(x,0); defaults to the fundamental mode sin(πx/L)
+        profile = sp.sin(sp.pi * x / length)
+        for condition in parse_conditions(initial_conditions_str):
+            if not condition.derivative and len(condition.args) == 2 and condition.args[1] == 0:
+                profile = condition.value
+        u0 = np.broadcast_to(PDESolver.condition_function(profile, x, namespace, options)(grid), grid.shape)
+        
+        # Dirichlet values u(0,t) and u(L,t); homogeneous unless given
+        left, right = 0.0, 0.0
+        parameters = PDESolver.numeric_parameters(namespace, options)
+        for condition in parse_conditions(boundary_conditions_str):
+            if condition.derivative or len(condition.args) != 2:
+                continue
+            position = condition.args[0].subs(parameters)
+            boundary = PDESolver.condition_function(condition.value, t, namespace, options)
+            if position == 0:
+                left = boundary
+            elif position == length:
+                right = boundary
+        
+        if options['time_stepping'] == 'adaptive':
+            result = solve_heat_1d_adaptive(
+                u0, alpha, dx, float(options['t_end']), left=left, right=right, snapshots=int(options['snapshots']),
+                rtol=float(options['time_rtol']), atol=float(options['time_atol'])
+            )
+        else:
+            result = solve_heat_1d(
+                u0, alpha, dx, dt, steps,
+                scheme=options['scheme'], left=left, right=right, snapshots=int(options['snapshots'])
+            )
+        data = {'x': grid, 'u': result['u'], 'frames': result['frames'], 'times': result['times']}
+        
+        solution = "**✓ Heat/Diffusion Equation Solved Numerically**\n\n"
+        solution += f"**PDE:** ∂u/∂t = {alpha:g}·∂²u/∂x²\n\n"
+        if options['time_stepping'] == 'adaptive':
+            data['dt'] = result['dt']
+            solution += "**Scheme:** crank-nicolson finite differences, step doubling error control\n"
+            solution += f"**Grid:** {nx} points on [0, {length:g}]\n"
+            solution += PDESolver.step_statistics(result['stats'], options['t_end']) + "\n"
+        else:
+            solution += f"**Scheme:** {options['scheme']} finite differences\n"
+            solution += f"**Grid:** {nx} points on [0, {length:g}], {steps} steps to t = {options['t_end']:g}\n"
+            solution += f"**Mesh ratio:** α·dt/dx² = {result['r']:.4g}\n\n"
+        solution += f"**max |u(x, t_end)|:** {np.abs(result['u']).max():.6g}\n"
+        
+        return solution, data
+    
+    @staticmethod
+    def solve_laplace_numeric(equation, boundary_conditions_str, namespace, options=None):
+        """Solve the 2D Laplace/Poisson equation u_xx + u_yy = f on a sparse 5-point grid"""
+        options = PDESolver.numeric_options(options)
+        x, y = namespace['x'], namespace['y']
+        parameters = PDESolver.numeric_parameters(namespace, options)
+        
+        expr = equation.lhs - equation.rhs if isinstance(equation, Eq) else equation
+        u_applied = next(iter(expr.atoms(AppliedUndef)), None)
+        if u_applied is None:
+            raise ValueError("Numeric solvers need an unknown function u(x, y)")
+        u_xx, u_yy = Derivative(u_applied, (x, 2)), Derivative(u_applied, (y, 2))
+        expr = sp.expand(expr)
+        coefficient = PDESolver.derivative_coefficient(equation, namespace, options, (x, 2))
+        if coefficient == 0 or coefficient != PDESolver.derivative_coefficient(equation, namespace, options, (y, 2)):
+            raise ValueError("Poisson solver needs equal coefficients on u_xx and u_yy")
+        remainder = (expr - expr.coeff(u_xx) * u_xx - expr.coeff(u_yy) * u_yy).subs(parameters)
+        if remainder.has(u_applied):
+            raise ValueError("Poisson solver only supports u_xx + u_yy = f(x, y)")
+        
+        width, height = float(options['length']), float(options['height'])
+        nx, ny = int(options['nx']), int(options['ny'])
+        x_grid, y_grid = np.linspace(0.0, width, nx), np.linspace(0.0, height, ny)
+        mesh_x, mesh_y = np.meshgrid(x_grid, y_grid)
+        source = None
+        if remainder != 0:
+            source = np.broadcast_to(sp.lambdify((x, y), -remainder / coefficient, 'numpy')(mesh_x, mesh_y), mesh_x.shape)
+        
+        # Edges: u(0,y), u(L,y), u(x,0), u(x,H) are Dirichlet; u_x(...)/u_y(...) are Neumann
+        edges = {}
+        for condition in parse_conditions(boundary_conditions_str):
+            if len(condition.args) != 2 or condition.derivative not in ('', 'x', 'y'):
+                continue
+            px, py = (arg.subs(parameters) for arg in condition.args)
+            kind = 'neumann' if condition.derivative else 'dirichlet'
+            if px.is_number and condition.derivative in ('', 'x') and float(px) in (0.0, width):
+                edge, along, grid = ('left' if float(px) == 0.0 else 'right'), y, y_grid
+            elif py.is_number and condition.derivative in ('', 'y') and float(py) in (0.0, height):
+                edge, along, grid = ('bottom' if float(py) == 0.0 else 'top'), x, x_grid
+            else:
+                raise ValueError(f"Boundary condition is not on the domain edge: u_{condition.derivative}{condition.args}")
+            values = PDESolver.condition_function(condition.value, along, namespace, options)(grid)
+            edges[edge] = (kind, np.broadcast_to(values, grid.shape))
+        
+        result = solve_poisson_2d(
+            nx, ny, lengths=(width, height), source=source, edges=edges,
+            method=options['linear_solver'], rtol=float(options['rtol'])
+        )
+        data = {'x': x_grid, 'y': y_grid, 'u': result['u']}
+        
+        solution = "**✓ Laplace/Poisson Equation Solved Numerically**\n\n"
+        solution += "**PDE:** ∂²u/∂x² + ∂²u/∂y² = " + ("0" if source is None else "f(x,y)") + "\n\n"
+        solution += f"**Linear solver:** {options['linear_solver']} ({result['iterations']} iterations, "
+        solution += f"relative residual {result['residual']:.2e})\n"
+        solution += f"**Grid:** {nx}×{ny} points on [0, {width:g}]×[0, {height:g}]\n"
+        if boundary_conditions_str:
+            solution += f"**Boundary Conditions:** {boundary_conditions_str}\n"
+        solution += f"\n**u range:** [{result['u'].min():.6g}, {result['u'].max():.6g}]\n"
+        
+        return solution, data
+    
     @staticmethod
     def solve_wave_equation(equation_str, boundary_conditions_str, initial_conditions_str, namespace):
         """Solve wave equation: ∂²u/∂t² = c²·∂²u/∂x²"""
@@ -160,6 +355,190 @@ class PDESolver:
         
         return solution
     
+    @staticmethod
+    def wave_problem(equation, boundary_conditions_str, initial_conditions_str, namespace, options):
+        """
+        Discretize u_tt = c²·Δu in 1D (u(x,t)) or 2D (u(x,y,t)).
+
+        Returns ``(grids, u0, v0, c, spacing)``: the coordinate arrays, the
+        initial displacement (with the fixed boundary values written in) and
+        velocity, the wave speed and the grid spacing per array axis.
+        """
+        x, y, t = namespace['x'], namespace['y'], namespace['t']
+        parameters = PDESolver.numeric_parameters(namespace, options)
+        
+        expr = equation.lhs - equation.rhs if isinstance(equation, Eq) else equation
+        u_applied = next(iter(expr.atoms(AppliedUndef)), None)
+        if u_applied is None:
+            raise ValueError("Numeric solvers need an unknown function u(x, t) or u(x, y, t)")
+        space = [x, y] if y in u_applied.args else [x]
+        c_squared = -PDESolver.derivative_coefficient(equation, namespace, options, (x, 2)) / \
+            PDESolver.derivative_coefficient(equation, namespace, options, (t, 2))
+        if len(space) == 2 and c_squared != -PDESolver.derivative_coefficient(equation, namespace, options, (y, 2)) / \
+                PDESolver.derivative_coefficient(equation, namespace, options, (t, 2)):
+            raise ValueError("Wave solver needs equal coefficients on u_xx and u_yy")
+        if c_squared <= 0:
+            raise ValueError("Wave equation requires a positive c²")
+        
+        extents = [float(options['length']), float(options['height'])][:len(space)]
+        sizes = [int(options['nx']), int(options['ny'])][:len(space)]
+        grids = [np.linspace(0.0, extent, size) for extent, size in zip(extents, sizes)]
+        mesh = np.meshgrid(*grids) if len(space) == 2 else grids
+        # Arrays are indexed (y, x), so spacing runs over the grids in reverse
+        spacing = [grid[1] - grid[0] for grid in reversed(grids)]
+        
+        # u(·,0) and u_t(·,0); defaults to the fundamental mode at rest
+        displacement = sp.Mul(*(sp.sin(sp.pi * var / extent) for var, extent in zip(space, extents)))
+        velocity = sp.Integer(0)
+        for condition in parse_conditions(initial_conditions_str):
+            if len(condition.args) == len(space) + 1 and condition.args[-1] == 0:
+                if condition.derivative == '':
+                    displacement = condition.value
+                elif condition.derivative == 't':
+                    velocity = condition.value
+        field = lambda value: np.broadcast_to(
+            sp.lambdify(space, value.subs(parameters), 'numpy')(*mesh), mesh[0].shape
+        )
+        u0, v0 = np.array(field(displacement)), field(velocity)
+        
+        # Dirichlet ends are fixed in time, so boundary values are written into u0
+        for condition in parse_conditions(boundary_conditions_str):
+            if condition.derivative or len(condition.args) != len(space) + 1:
+                continue
+            value = condition.value.subs(parameters)
+            if value.has(t):
+                raise ValueError("Wave solver only supports time-independent boundary values")
+            for axis, (arg, extent) in enumerate(zip(condition.args, extents)):
+                position = arg.subs(parameters)
+                if position.is_number and float(position) in (0.0, extent):
+                    index = [slice(None)] * len(space)
+                    index[len(space) - 1 - axis] = 0 if float(position) == 0.0 else -1
+                    u0[tuple(index)] = field(value)[tuple(index)]
+        
+        return grids, u0, v0, float(np.sqrt(c_squared)), spacing
+    
+    @staticmethod
+    def stream_wave_numeric(equation, boundary_conditions_str, initial_conditions_str, namespace, options=None, every=1):
+        """
+        Set up a leapfrog run for u_tt = c²·Δu in 1D (u(x,t)) or 2D (u(x,y,t)).
+
+        Returns ``(grids, snapshots)``: the coordinate arrays and the
+        ``iter_wave`` generator yielding ``(step, time, u)`` every ``every`` steps,
+        so callers can stream frames while the run is in progress.
+        """
+        options = PDESolver.numeric_options(options)
+        grids, u0, v0, c, spacing = PDESolver.wave_problem(
+            equation, boundary_conditions_str, initial_conditions_str, namespace, options
+        )
+        steps = int(options['steps'])
+        dt = float(options['t_end']) / steps
+        snapshots = iter_wave(u0, v0, c, spacing, dt, steps, every=every)
+        return grids, snapshots
+    
+    @staticmethod
+    def solve_wave_numeric(equation, boundary_conditions_str, initial_conditions_str, namespace, options=None):
+        """Solve the 1D/2D wave equation with the leapfrog scheme, or adaptive trapezoidal steps"""
+        options = PDESolver.numeric_options(options)
+        steps, snapshots = int(options['steps']), int(options['snapshots'])
+        if options['time_stepping'] == 'adaptive':
+            grids, u0, v0, c, spacing = PDESolver.wave_problem(
+                equation, boundary_conditions_str, initial_conditions_str, namespace, options
+            )
+            result = solve_wave_adaptive(
+                u0, v0, c, spacing, float(options['t_end']), snapshots=snapshots,
+                rtol=float(options['time_rtol']), atol=float(options['time_atol'])
+            )
+            data = {'x': grids[0], 'u': result['u'], 'frames': result['frames'], 'times': result['times'], 'dt': result['dt']}
+        else:
+            every = max(1, steps // (snapshots - 1)) if snapshots > 1 else steps
+            grids, stream = PDESolver.stream_wave_numeric(
+                equation, boundary_conditions_str, initial_conditions_str, namespace, options, every=every
+            )
+            
+            frames, times = [], []
+            for step, time, u in stream:
+                if snapshots and len(frames) < snapshots:
+                    frames.append(u.copy())
+                    times.append(time)
+            data = {'x': grids[0], 'u': u.copy(), 'frames': np.array(frames), 'times': np.array(times)}
+        if len(grids) == 2:
+            data['y'] = grids[1]
+        
+        dimensions = '×'.join(str(grid.size) for grid in grids)
+        solution = "**✓ Wave Equation Solved Numerically**\n\n"
+        solution += "**PDE:** ∂²u/∂t² = c²·" + ("(∂²u/∂x² + ∂²u/∂y²)" if len(grids) == 2 else "∂²u/∂x²") + "\n\n"
+        if options['time_stepping'] == 'adaptive':
+            solution += "**Scheme:** implicit trapezoidal (average acceleration), step doubling error control\n"
+            solution += f"**Grid:** {dimensions} points\n"
+            solution += PDESolver.step_statistics(result['stats'], options['t_end']) + "\n"
+        else:
+            solution += "**Scheme:** second-order leapfrog\n"
+            solution += f"**Grid:** {dimensions} points, {steps} steps to t = {options['t_end']:g}\n\n"
+        if initial_conditions_str:
+            solution += f"**Initial Conditions:** {initial_conditions_str}\n"
+        if boundary_conditions_str:
+            solution += f"**Boundary Conditions:** {boundary_conditions_str}\n"
+        solution += f"\n**max |u(·, t_end)|:** {np.abs(data['u']).max():.6g}\n"
+        
+        return solution, data
+    
+    @staticmethod
+    def solve_method_of_lines_numeric(equation, boundary_conditions_str, initial_conditions_str, namespace, options=None):
+        """Solve u_t = F(x, t, u, u_x, u_xx) by the method of lines with a stiff ODE integrator"""
+        options = PDESolver.numeric_options(options)
+        x, t = namespace['x'], namespace['t']
+        parameters = PDESolver.numeric_parameters(namespace, options)
+        
+        expr = equation.lhs - equation.rhs if isinstance(equation, Eq) else equation
+        functions = expr.atoms(AppliedUndef)
+        if len(functions) != 1:
+            raise ValueError("Numeric solvers need exactly one unknown function u(x, t)")
+        with stage('compile'):
+            evolution = compile_evolution(expr.subs(parameters), functions.pop())
+        
+        length = float(options['length'])
+        grid = np.linspace(0.0, length, int(options['nx']))
+        
+        # Initial profile u(x,0); defaults to the fundamental mode sin(πx/L)
+        profile = sp.sin(sp.pi * x / length)
+        for condition in parse_conditions(initial_conditions_str):
+            if not condition.derivative and len(condition.args) == 2 and condition.args[1] == 0:
+                profile = condition.value
+        u0 = np.broadcast_to(PDESolver.condition_function(profile, x, namespace, options)(grid), grid.shape)
+        
+        # u(0,t) = g or u_x(0,t) = g at either end; an end without a condition keeps its initial value
+        ends = {0.0: ('dirichlet', None), length: ('dirichlet', None)}
+        for condition in parse_conditions(boundary_conditions_str):
+            if condition.derivative not in ('', 'x') or len(condition.args) != 2:
+                continue
+            position = condition.args[0].subs(parameters)
+            if position.is_number and float(position) in ends:
+                kind = 'neumann' if condition.derivative else 'dirichlet'
+                ends[float(position)] = (kind, PDESolver.condition_function(condition.value, t, namespace, options))
+        
+        result = solve_method_of_lines(
+            evolution, grid, u0, float(options['t_end']), left=ends[0.0], right=ends[length],
+            snapshots=int(options['snapshots']), method=options['ode_solver'],
+            rtol=float(options['time_rtol']), atol=float(options['time_atol'])
+        )
+        data = {'x': grid, 'u': result['u'], 'frames': result['frames'], 'times': result['times']}
+        
+        names = {symbol: sp.Symbol(symbol.name.lower()) for symbol in evolution.expression.free_symbols if symbol.name.startswith('U')}
+        stats = result['stats']
+        solution = "**✓ Equation Solved Numerically by the Method of Lines**\n\n"
+        solution += f"**PDE:** u_t = {sp.sstr(evolution.expression.xreplace(names))}\n\n"
+        solution += f"**Scheme:** centered finite differences in x, {options['ode_solver']} in t\n"
+        solution += f"**Grid:** {grid.size} points on [0, {length:g}] to t = {options['t_end']:g}\n"
+        solution += f"**Integrator:** {stats.nfev} right-hand side evaluations, {stats.njev} Jacobians, "
+        solution += f"{stats.nlu} LU factorizations\n\n"
+        if initial_conditions_str:
+            solution += f"**Initial Conditions:** {initial_conditions_str}\n"
+        if boundary_conditions_str:
+            solution += f"**Boundary Conditions:** {boundary_conditions_str}\n"
+        solution += f"\n**u(x, t_end) range:** [{result['u'].min():.6g}, {result['u'].max():.6g}]\n"
+        
+        return solution, data
+    
     @staticmethod
     def solve_laplace_equation(equation_str, boundary_conditions_str, namespace):
         """Solve Laplace equation: ∂²u/∂x² + ∂²u/∂y² = 0"""
@@ -187,12 +566,11 @@ class PDESolver:
         """Analyze PDE type and provide solution guidance"""
         analysis = "### PDE Analysis\n\n"
         
-        # Detect common PDE types from both notation styles
-        equation_lower = equation_str.lower()
+        classification = classify(equation)
+        family = classification.family
         
         # Check for Heat/Diffusion Equation
-        if ('u_t' in equation_lower or '.diff(t)' in equation_lower) and \
-           ('u_xx' in equation_lower or '.diff(x, 2)' in equation_lower):
+        if family == 'heat':
             analysis += "**✓ Detected: Heat/Diffusion Equation**\n\n"
             analysis += "**Standard Form:** ∂u/∂t = α·∂²u/∂x²\n\n"
             analysis += "**General Solution:** \n"
@@ -202,8 +580,7 @@ class PDESolver:
             analysis += "- u(x,0) = f(x) → Initial condition\n"
         
         # Check for Wave Equation
-        elif ('u_tt' in equation_lower or '.diff(t, 2)' in equation_lower) and \
-             ('u_xx' in equation_lower or '.diff(x, 2)' in equation_lower):
+        elif family == 'wave':
             analysis += "**✓ Detected: Wave Equation**\n\n"
             analysis += "**Standard Form:** ∂²u/∂t² = c²·∂²u/∂x²\n\n"
             analysis += "**General Solution (D'Alembert):**\n"
@@ -213,8 +590,7 @@ class PDESolver:
             analysis += "- u_t(x,0) = g(x) → Initial velocity\n"
         
         # Check for Laplace Equation
-        elif ('u_xx' in equation_lower and 'u_yy' in equation_lower) or \
-             ('.diff(x, 2)' in equation_lower and '.diff(y, 2)' in equation_lower):
+        elif family == 'laplace':
             analysis += "**✓ Detected: Laplace Equation**\n\n"
             analysis += "**Standard Form:** ∂²u/∂x² + ∂²u/∂y² = 0\n\n"
             analysis += "**General Solution:**\n"
@@ -222,8 +598,26 @@ class PDESolver:
             analysis += "**Boundary Conditions (Dirichlet):**\n"
             analysis += "u(x,0) = f(x), u(x,L) = 0, u(0,y) = 0, u(L,y) = 0\n"
         
+        # Check for Poisson Equation
+        elif family == 'poisson':
+            analysis += "**✓ Detected: Poisson Equation**\n\n"
+            analysis += "**Standard Form:** ∂²u/∂x² + ∂²u/∂y² = f(x,y)\n\n"
+            analysis += f"**Source term:** f(x,y) = {-classification.source / classification.coefficients[('x', 'x')]}\n\n"
+            analysis += "**Solution:** particular solution plus a harmonic function fitted to the boundary values;\n"
+            analysis += "use the numeric mode for a grid solution\n"
+        
+        # Check for Advection Equation
+        elif family == 'advection':
+            analysis += "**✓ Detected: Advection Equation**\n\n"
+            analysis += "**Standard Form:** ∂u/∂t + c·∂u/∂x = 0\n\n"
+            analysis += "**General Solution:**\n"
+            analysis += "u(x,t) = f(x - ct), the initial profile transported with speed c\n"
+        
         else:
             analysis += "**ℹ️ PDE Type:** Not automatically identified\n\n"
+            analysis += f"**Order:** {classification.order}\n"
+            analysis += f"**Classification:** {classification.type or 'undetermined'}\n"
+            analysis += f"**Linear:** {'yes' if classification.linear else 'no'}\n\n"
             analysis += "The equation format may be:\n"
             analysis += "- A non-standard PDE type\n"
             analysis += "- Too complex for direct symbolic solving\n"
@@ -242,6 +636,31 @@ class PDESolver:
         return analysis
 
 
+# Solver backends by (equation family, mode): (method label, solver). Each solver is
+# called as solver(equation_str, equation, bc, ic, namespace, options) -> (solution, data)
+SOLVER_BACKENDS = {
+    ('heat', 'symbolic'): ("Heat Equation Solver", lambda equation_str, equation, bc, ic, namespace, options: (
+        PDESolver.solve_heat_equation(equation_str, bc, ic, namespace), None)),
+    ('wave', 'symbolic'): ("Wave Equation Solver", lambda equation_str, equation, bc, ic, namespace, options: (
+        PDESolver.solve_wave_equation(equation_str, bc, ic, namespace), None)),
+    ('laplace', 'symbolic'): ("Laplace Equation Solver", lambda equation_str, equation, bc, ic, namespace, options: (
+        PDESolver.solve_laplace_equation(equation_str, bc, namespace), None)),
+    ('heat', 'numeric'): ("Finite Difference Heat Solver", lambda equation_str, equation, bc, ic, namespace, options:
+        PDESolver.solve_heat_numeric(equation, bc, ic, namespace, options)),
+    ('wave', 'numeric'): ("Leapfrog Wave Solver", lambda equation_str, equation, bc, ic, namespace, options:
+        PDESolver.solve_wave_numeric(equation, bc, ic, namespace, options)),
+    ('laplace', 'numeric'): ("Sparse Poisson Solver", lambda equation_str, equation, bc, ic, namespace, options:
+        PDESolver.solve_laplace_numeric(equation, bc, namespace, options)),
+    ('poisson', 'numeric'): ("Sparse Poisson Solver", lambda equation_str, equation, bc, ic, namespace, options:
+        PDESolver.solve_laplace_numeric(equation, bc, namespace, options)),
+    ('advection', 'numeric'): ("Method of Lines Solver", lambda equation_str, equation, bc, ic, namespace, options:
+        PDESolver.solve_method_of_lines_numeric(equation, bc, ic, namespace, options)),
+}
+
+# Numeric backend for evolution equations outside the families above (see supports_method_of_lines)
+METHOD_OF_LINES_BACKEND = SOLVER_BACKENDS[('advection', 'numeric')]
+
+
 # Common PDE solutions for quick reference
 COMMON_SOLUTIONS = {
     'Heat Equation': {
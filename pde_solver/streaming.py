@@ -0,0 +1,141 @@
+import io
+import zlib
+
+import numpy as np
+
+from .evaluation import check_series_cost, evaluate_grid, evaluation_config
+
+FORMATS = ('raw', 'npy')
+
+DTYPES = {'float64': '<f8', 'float32': '<f4'}
+
+
+def parse_slice(text):
+    """slice from 'start:stop:step' (parts optional) or a single index"""
+    if not text:
+        return slice(None)
+    try:
+        bounds = [int(bound) if bound.strip() else None for bound in text.split(':')]
+    except ValueError:
+        raise ValueError(f"Invalid range '{text}'; use start:stop:step")
+    if len(bounds) == 1:
+        return slice(bounds[0], bounds[0] + 1 if bounds[0] != -1 else None)
+    if len(bounds) > 3 or bounds[2:] == [0] or any(b is not None and b < 0 for b in bounds[2:]):
+        raise ValueError(f"Invalid range '{text}'; use start:stop:step with a positive step")
+    return slice(*bounds)
+
+
+def _block_mean(block, factor, axes):
+    """Average non-overlapping blocks of ``factor`` points along ``axes``; trailing points are dropped"""
+    for axis in axes:
+        size = block.shape[axis] // factor * factor
+        block = np.take(block, np.arange(size), axis=axis)
+        shape = block.shape[:axis] + (size // factor, factor) + block.shape[axis + 1:]
+        block = block.reshape(shape).mean(axis=axis + 1)
+    return block
+
+
+class FieldStream:
+    """
+    A selected part of a solution field, produced block by block.
+
+    ``read(start, stop)`` returns rows [start, stop) of the selection along the
+    first axis; only one block of about PDE_EVALUATION['CHUNK_POINTS'] values
+    is held at a time, so memory stays constant however large the field is.
+    ``steps`` selects rows of the first axis (time steps for stored frames),
+    ``stride`` keeps every k-th point of the other axes and ``downsample``
+    averages k-point blocks along them; 1D fields apply stride and downsample
+    to their only axis.
+    """
+
+    def __init__(self, read, shape, dtype='<f8', downsample=1):
+        self.read = read
+        self.selected_shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.downsample = max(1, int(downsample))
+        self.axes = tuple(range(1, len(shape))) if len(shape) > 1 else (0,)
+        self.shape = tuple(
+            size // self.downsample if axis in self.axes else size for axis, size in enumerate(self.selected_shape)
+        )
+
+    @classmethod
+    def from_array(cls, values, steps=None, stride=1, downsample=1, dtype='<f8'):
+        """Stream a (memory-mapped) array; basic slicing keeps the selection a lazy view"""
+        stride = max(1, int(stride))
+        if values.ndim == 0:
+            values = values.reshape(1)
+        if values.ndim > 1:
+            index = (steps or slice(None),) + (slice(None, None, stride),) * (values.ndim - 1)
+        else:
+            index = (slice(None, None, stride),)
+        selected = values[index]
+        return cls(lambda start, stop: np.asarray(selected[start:stop]), selected.shape, dtype, downsample)
+
+    @classmethod
+    def from_expression(cls, text, axes, fixed=None, terms=None, steps=None, stride=1, downsample=1, dtype='<f8'):
+        """Stream a symbolic solution evaluated on the outer product of ``axes``, first axis outermost"""
+        stride = max(1, int(stride))
+        if len(axes) > 1:
+            axes = [(axes[0][0], axes[0][1][steps or slice(None)])] + \
+                [(name, values[::stride]) for name, values in axes[1:]]
+        else:
+            axes = [(axes[0][0], axes[0][1][::stride])]
+        shape = tuple(len(values) for _, values in axes)
+        if not all(shape):
+            raise ValueError("The selection is empty")
+        if int(np.prod(shape)) > evaluation_config()['MAX_POINTS']:
+            raise ValueError(f"Grid has more than {evaluation_config()['MAX_POINTS']} points")
+        # Blocks are evaluated one by one, so the series cost is checked for the whole field here
+        check_series_cost(text, int(np.prod(shape)), terms)
+        # Compile (and validate the names) before the response starts
+        evaluate_grid(text, [(name, values[:1]) for name, values in axes], terms, fixed=fixed)
+
+        def read(start, stop):
+            block_axes = [(axes[0][0], axes[0][1][start:stop])] + axes[1:]
+            return evaluate_grid(text, block_axes, terms, fixed=fixed)
+        return cls(read, shape, dtype, downsample)
+
+    def blocks(self):
+        """Yield the selection as contiguous arrays of the output dtype, first axis in order"""
+        rows = self.selected_shape[0]
+        if len(self.selected_shape) == 1:
+            # Keep downsampling blocks whole when splitting a 1D field
+            step = max(self.downsample, evaluation_config()['CHUNK_POINTS'] // self.downsample * self.downsample)
+        else:
+            inner = int(np.prod(self.selected_shape[1:])) or 1
+            step = max(1, evaluation_config()['CHUNK_POINTS'] // inner)
+        for start in range(0, rows, step):
+            block = self.read(start, min(rows, start + step))
+            if self.downsample > 1:
+                block = _block_mean(block, self.downsample, self.axes)
+            yield np.ascontiguousarray(block, dtype=self.dtype)
+
+    def npy_header(self):
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header, {'descr': self.dtype.str, 'fortran_order': False, 'shape': self.shape}
+        )
+        return header.getvalue()
+
+    def iter_bytes(self, output='raw', compress=False):
+        """Raw little-endian bytes (optionally after a .npy header), gzip-compressed chunk by chunk if asked"""
+        chunks = (block.tobytes() for block in self.blocks())
+        if output == 'npy':
+            chunks = _prepend(self.npy_header(), chunks)
+        if not compress:
+            return chunks
+        return _gzip(chunks)
+
+
+def _prepend(first, chunks):
+    yield first
+    yield from chunks
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
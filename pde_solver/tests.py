@@ -3,12 +3,58 @@ Tests for the PDE Solver application.
 To run: python manage.py test
 """
 
-from django.test import TestCase, Client
+import asyncio
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from io import StringIO
+from pathlib import Path
+from django.test import TestCase, TransactionTestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
-from pde_solver.models import PDESolution
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from pde_solver.models import PDESolution, SolutionArray, SolutionSubmission, SolveJob
 from pde_solver.solver import PDESolver
 from pde_solver.forms import PDEInputForm
+from pde_solver.cache import SolutionCache, canonical_key, cached_solve_pde, get_solution_cache, input_hash
+from pde_solver.sandbox import SandboxPool, sandboxed_solve_pde
+from pde_solver.batch import solve_batch
+from pde_solver.parser import parse_expression
+from pde_solver.classifier import classify
+from pde_solver.closed_form import closed_form_solution
+from pde_solver.benchmarks import Benchmark, compare, run_benchmark
+from pde_solver.evaluation import compiled_for_solution, evaluate_grid, series_terms, sweep_axes, truncate_series
+from pde_solver.streaming import FieldStream
+from pde_solver.offload import BoundedExecutor, ExecutorBusy
+from pde_solver.metrics import Counter, Histogram, collect_stages, get_registry, stage
+from pde_solver.search import search_backend, search_solutions
+from pde_solver.pagination import approximate_count, decode_cursor, encode_cursor, keyset_page
+from pde_solver.plots import plot_field, plot_file, plotting_available
+from pde_solver.method_of_lines import compile_evolution, difference_matrix, solve_method_of_lines
+from pde_solver.kernels import KernelCache, get_kernel_cache, kernel_key
+from unittest import mock
+from pde_solver.numerics import iter_wave, solve_heat_1d, solve_heat_1d_adaptive, solve_poisson_2d, solve_wave_adaptive
+import numpy as np
+import sympy as sp
+
+
+# Generated kernels stay in memory instead of the repository's kernel_cache/;
+# KernelCacheTestCase exercises the disk tier in temporary directories
+_kernel_settings = override_settings(PDE_KERNEL_CACHE={'DIRECTORY': None})
+
+
+def setUpModule():
+    _kernel_settings.enable()
+
+
+def tearDownModule():
+    _kernel_settings.disable()
 
 
 class PDESolverTestCase(TestCase):
@@ -41,6 +87,505 @@ class PDESolverTestCase(TestCase):
         self.assertIn('status', result)
 
 
+class ParserTestCase(TestCase):
+    """Test restricted expression parser"""
+    
+    def test_shorthand_matches_sympy_form(self):
+        """Test u_t = u_xx parses to the same equation as the SymPy spelling"""
+        self.assertEqual(
+            parse_expression("u_t = u_xx"),
+            parse_expression("Eq(Derivative(u(x, t), t), Derivative(u(x, t), x, 2))"),
+        )
+        self.assertEqual(
+            parse_expression("u_xx + u_yy = 0"),
+            parse_expression("Eq(u(x, y).diff(x, 2) + u(x, y).diff(y, 2), 0)"),
+        )
+    
+    def test_caret_is_power(self):
+        """Test ^ binds like ** in condition values"""
+        self.assertEqual(parse_expression("2^3*x"), parse_expression("8*x"))
+    
+    def test_rejects_unsafe_input(self):
+        """Test names, attributes and syntax outside the whitelist are rejected"""
+        for text in ("__import__('os')", "u.__class__", "lambda: 1", "x if x else t", "2**10**9"):
+            with self.assertRaises(ValueError):
+                parse_expression(text)
+    
+    def test_rejects_expensive_input(self):
+        """Test nested powers and high derivative orders fail fast instead of being evaluated"""
+        for text in ("(((9**99)**99)**99)**99", "(2**99)**99", "sin(x).diff(x, 99999999)",
+                     "Derivative(u(x, t), x, 11)", "u(x, t).diff(x, 6).diff(x, 6)"):
+            started = time.monotonic()
+            with self.assertRaises(ValueError):
+                parse_expression(text)
+            self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(parse_expression("(2**10)**10"), parse_expression("2**100"))
+        self.assertEqual(parse_expression("sin(x).diff(x, 2)").doit(), -parse_expression("sin(x)"))
+    
+    def test_results_are_memoized(self):
+        """Test repeated inputs return the cached expression"""
+        self.assertIs(parse_expression("u_t = D*u_xx"), parse_expression("u_t = D*u_xx"))
+
+
+class ClassifierTestCase(TestCase):
+    """Test structural PDE classification"""
+    
+    def test_standard_families(self):
+        """Test family, type and linearity of the standard equations"""
+        cases = {
+            "u_t = D*u_xx": ('heat', 'parabolic'),
+            "u_tt = c**2*u_xx": ('wave', 'hyperbolic'),
+            "u_tt = u_xx + u_yy": ('wave', 'hyperbolic'),
+            "u_xx + u_yy = 0": ('laplace', 'elliptic'),
+            "u_xx + u_yy = x*y": ('poisson', 'elliptic'),
+            "u_t + c*u_x = 0": ('advection', 'hyperbolic'),
+            "u_xx + 2*u_xy + u_yy = 0": (None, 'parabolic'),
+        }
+        for text, (family, equation_type) in cases.items():
+            classification = classify(parse_expression(text))
+            self.assertEqual((classification.family, classification.type), (family, equation_type), text)
+            self.assertTrue(classification.linear)
+    
+    def test_orders_and_coefficients(self):
+        """Test per-variable orders and principal part coefficients"""
+        classification = classify(parse_expression("u_tt = c**2*u_xx"))
+        self.assertEqual(classification.orders, {'x': 2, 't': 2})
+        self.assertEqual(classification.principal.diagonal().tolist(), [[-parse_expression("c**2"), 1]])
+    
+    def test_nonlinear(self):
+        """Test nonlinear equations are not assigned a family"""
+        for text in ("u_t + u*u_x = 0", "u_t = u_xx + u*(1 - u)"):
+            classification = classify(parse_expression(text))
+            self.assertFalse(classification.linear)
+            self.assertIsNone(classification.family)
+    
+    def test_known_families_skip_dsolve(self):
+        """Test recognized equations are dispatched without a dsolve attempt"""
+        with mock.patch('pde_solver.solver.dsolve') as dsolve:
+            result = PDESolver.solve_pde("u_tt = u_xx")
+        dsolve.assert_not_called()
+        self.assertEqual(result['method'], 'Wave Equation Solver')
+
+
+class ClosedFormTestCase(TestCase):
+    """Test closed-form solutions built directly from the conditions"""
+    
+    def solve(self, equation, bc="", ic=""):
+        classification = classify(parse_expression(equation))
+        method, expression = closed_form_solution(classification, bc, ic)
+        return expression
+    
+    def assertSolves(self, expression, expected):
+        self.assertEqual((expression - parse_expression(expected)).simplify(), 0)
+    
+    def test_heat_sine_modes(self):
+        """Test sine initial data on a Dirichlet interval decays mode by mode"""
+        expression = self.solve("u_t = D*u_xx", "u(0,t)=0, u(L,t)=0", "u(x,0)=3*sin(pi*x/L)")
+        self.assertSolves(expression, "3*sin(pi*x/L)*exp(-D*pi**2*t/L**2)")
+    
+    def test_heat_steady_state(self):
+        """Test constant Dirichlet ends are handled through the linear steady state"""
+        expression = self.solve("u_t = u_xx", "u(0,t)=1, u(1,t)=2", "u(x,0)=1 + x + sin(pi*x)")
+        self.assertSolves(expression, "1 + x + sin(pi*x)*exp(-pi**2*t)")
+    
+    def test_heat_fourier_series(self):
+        """Test general initial data becomes a sine series with integrated coefficients"""
+        expression = self.solve("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=x*(1 - x)")
+        self.assertTrue(expression.has(sp.Sum))
+    
+    def test_wave(self):
+        """Test the fixed-end sine series and d'Alembert's formula"""
+        expression = self.solve("u_tt = c^2*u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x), u_t(x,0)=0")
+        self.assertSolves(expression, "sin(pi*x)*cos(pi*c*t)")
+        expression = self.solve("u_tt = 4*u_xx", "", "u(x,0)=exp(-x**2)")
+        self.assertSolves(expression, "(exp(-(x - 2*t)**2) + exp(-(x + 2*t)**2))/2")
+    
+    def test_laplace_and_poisson(self):
+        """Test rectangle problems with sine edge data and sine sources"""
+        expression = self.solve("u_xx + u_yy = 0", "u(0,y)=0, u(1,y)=0, u(x,0)=0, u(x,1)=sin(pi*x)")
+        self.assertSolves(expression, "sin(pi*x)*sinh(pi*y)/sinh(pi)")
+        expression = self.solve("u_xx + u_yy = sin(pi*x)*sin(pi*y)", "u(0,y)=0, u(1,y)=0, u(x,0)=0, u(x,1)=0")
+        self.assertSolves(expression, "-sin(pi*x)*sin(pi*y)/(2*pi**2)")
+    
+    def test_advection(self):
+        """Test the initial profile is carried along characteristics"""
+        self.assertSolves(self.solve("u_t + 2*u_x = 0", "", "u(x,0)=exp(-x**2)"), "exp(-(x - 2*t)**2)")
+    
+    def test_unsupported_conditions(self):
+        """Test conditions outside the closed forms fall back to the templates"""
+        classification = classify(parse_expression("u_t = u_xx"))
+        self.assertIsNone(closed_form_solution(classification, "u_x(0,t)=0, u_x(1,t)=0", "u(x,0)=x"))
+        self.assertIsNone(closed_form_solution(classification, "", ""))
+    
+    def test_solve_pde_skips_dsolve(self):
+        """Test solve_pde serves canonical forms without dsolve or pdsolve"""
+        with mock.patch('pde_solver.solver.dsolve') as dsolve, mock.patch('sympy.pdsolve') as pdsolve:
+            heat = PDESolver.solve_pde("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")
+            advection = PDESolver.solve_pde("u_t + c*u_x = 0", "", "u(x,0)=sin(x)")
+        dsolve.assert_not_called()
+        pdsolve.assert_not_called()
+        self.assertEqual(heat['method'], 'Closed-Form Heat Solution')
+        self.assertEqual(heat['expression'], 'exp(-pi**2*t)*sin(pi*x)')
+        self.assertEqual(advection['method'], 'Method of Characteristics')
+
+
+class NumericHeatTestCase(TestCase):
+    """Test finite-difference heat equation engine"""
+    
+    def test_schemes_match_analytic_solution(self):
+        """Test explicit and Crank-Nicolson against sin(pi*x)*exp(-pi^2*t)"""
+        x = np.linspace(0, 1, 101)
+        exact = np.sin(np.pi * x) * np.exp(-np.pi ** 2 * 0.1)
+        for scheme, steps in (('explicit', 2000), ('crank-nicolson', 100)):
+            result = solve_heat_1d(np.sin(np.pi * x), 1.0, x[1], 0.1 / steps, steps, scheme=scheme)
+            self.assertLess(np.abs(result['u'] - exact).max(), 1e-3)
+    
+    def test_explicit_stability_limit(self):
+        """Test explicit scheme rejects unstable mesh ratios"""
+        x = np.linspace(0, 1, 101)
+        with self.assertRaises(ValueError):
+            solve_heat_1d(np.sin(np.pi * x), 1.0, x[1], 0.01, 10, scheme='explicit')
+    
+    def test_solve_pde_numeric_mode(self):
+        """Test numeric mode dispatches heat equations to the grid solver"""
+        result = PDESolver.solve_pde(
+            "Eq(u(x, t).diff(t), D*u(x, t).diff(x, 2))",
+            "u(0,t) = 0, u(L,t) = 0",
+            "u(x,0) = sin(pi*x)",
+            mode='numeric',
+            options={'params': {'D': 0.5}, 'snapshots': 5},
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['method'], 'Finite Difference Heat Solver')
+        self.assertEqual(result['data']['frames'].shape, (5, 101))
+        self.assertAlmostEqual(result['data']['u'].max(), np.exp(-0.5 * np.pi ** 2 * 0.1), places=3)
+
+
+class NumericPoissonTestCase(TestCase):
+    """Test sparse 2D Laplace/Poisson solver"""
+    
+    def test_methods_agree_with_harmonic_solution(self):
+        """Test all linear solvers against sin(pi*x)*sinh(pi*y)/sinh(pi)"""
+        x = np.linspace(0, 1, 65)
+        mesh_x, mesh_y = np.meshgrid(x, x)
+        exact = np.sin(np.pi * mesh_x) * np.sinh(np.pi * mesh_y) / np.sinh(np.pi)
+        for method in ('direct', 'cg', 'multigrid'):
+            result = solve_poisson_2d(65, 65, edges={'top': ('dirichlet', np.sin(np.pi * x))}, method=method)
+            self.assertLess(np.abs(result['u'] - exact).max(), 1e-3)
+    
+    def test_requires_dirichlet_edge(self):
+        """Test pure Neumann problems are rejected"""
+        edges = {name: ('neumann', 0.0) for name in ('left', 'right', 'bottom', 'top')}
+        with self.assertRaises(ValueError):
+            solve_poisson_2d(9, 9, edges=edges)
+    
+    def test_solve_pde_numeric_mode_with_neumann(self):
+        """Test boundary conditions are parsed into Dirichlet and Neumann edges"""
+        result = PDESolver.solve_pde(
+            "Eq(u(x, y).diff(x, 2) + u(x, y).diff(y, 2), 4)",
+            "u_x(0,y) = 0, u_x(1,y) = 2, u_y(x,0) = 0, u(x,1) = x^2 + 1",
+            mode='numeric',
+            options={'nx': 41, 'ny': 41},
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['method'], 'Sparse Poisson Solver')
+        mesh_x, mesh_y = np.meshgrid(result['data']['x'], result['data']['y'])
+        self.assertLess(np.abs(result['data']['u'] - mesh_x ** 2 - mesh_y ** 2).max(), 1e-6)
+
+
+class NumericWaveTestCase(TestCase):
+    """Test leapfrog wave equation stepper"""
+    
+    def test_standing_wave_snapshots(self):
+        """Test snapshots follow sin(pi*x)*cos(pi*t) and are yielded every N steps"""
+        x = np.linspace(0, 1, 201)
+        snapshots = list(
+            (step, time, np.abs(u - np.sin(np.pi * x) * np.cos(np.pi * time)).max())
+            for step, time, u in iter_wave(np.sin(np.pi * x), 0.0, 1.0, x[1], 0.004, 250, every=100)
+        )
+        self.assertEqual([step for step, _, _ in snapshots], [0, 100, 200, 250])
+        self.assertLess(max(error for _, _, error in snapshots), 1e-4)
+    
+    def test_courant_limit(self):
+        """Test unstable time steps are rejected"""
+        x = np.linspace(0, 1, 101)
+        with self.assertRaises(ValueError):
+            next(iter_wave(np.sin(np.pi * x), 0.0, 1.0, x[1], 0.1, 10))
+    
+    def test_solve_pde_numeric_mode_2d(self):
+        """Test numeric mode dispatches 2D wave equations to the leapfrog solver"""
+        result = PDESolver.solve_pde(
+            "Eq(u(x, y, t).diff(t, 2), u(x, y, t).diff(x, 2) + u(x, y, t).diff(y, 2))",
+            mode='numeric',
+            options={'nx': 51, 'ny': 41, 't_end': 1.0, 'steps': 400},
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['method'], 'Leapfrog Wave Solver')
+        mesh_x, mesh_y = np.meshgrid(result['data']['x'], result['data']['y'])
+        exact = np.sin(np.pi * mesh_x) * np.sin(np.pi * mesh_y) * np.cos(np.sqrt(2) * np.pi)
+        self.assertLess(np.abs(result['data']['u'] - exact).max(), 1e-3)
+
+
+class AdaptiveTimeSteppingTestCase(TestCase):
+    """Test error-controlled adaptive time stepping"""
+    
+    def test_heat_matches_analytic_solution_in_few_steps(self):
+        """Test adaptive Crank-Nicolson meets the tolerance with far fewer steps than the explicit limit"""
+        x = np.linspace(0, 1, 101)
+        result = solve_heat_1d_adaptive(np.sin(np.pi * x), 1.0, x[1], 0.1, snapshots=3, rtol=1e-4, atol=1e-6)
+        exact = np.sin(np.pi * x) * np.exp(-np.pi ** 2 * 0.1)
+        self.assertLess(np.abs(result['u'] - exact).max(), 1e-3)
+        self.assertLess(result['stats'].accepted, 50)
+        self.assertAlmostEqual(result['dt'].sum(), 0.1)
+        self.assertEqual(list(result['times']), [0.0, 0.05, 0.1])
+        self.assertEqual(result['frames'].shape, (3, 101))
+    
+    def test_heat_steps_grow_and_reject_after_step_change(self):
+        """Test a discontinuous profile forces small, partly rejected steps that then grow"""
+        x = np.linspace(0, 1, 101)
+        result = solve_heat_1d_adaptive((x > 0.5).astype(float), 1.0, x[1], 0.1, dt=1e-2)
+        self.assertGreater(result['stats'].rejected, 0)
+        self.assertGreater(result['stats'].dt_max, 10 * result['stats'].dt_min)
+    
+    def test_wave_standing_wave_1d_and_2d(self):
+        """Test trapezoidal steps follow the standing wave in 1D and 2D"""
+        x = np.linspace(0, 1, 201)
+        result = solve_wave_adaptive(np.sin(np.pi * x), 0.0, 1.0, (x[1],), 1.0, snapshots=2, rtol=1e-5, atol=1e-7)
+        self.assertLess(np.abs(result['u'] + np.sin(np.pi * x)).max(), 1e-3)
+        self.assertEqual(result['frames'].shape, (2, 201))
+        
+        y = np.linspace(0, 1, 31)
+        mesh_x, mesh_y = np.meshgrid(y, y)
+        u0 = np.sin(np.pi * mesh_x) * np.sin(np.pi * mesh_y)
+        result = solve_wave_adaptive(u0, 0.0, 1.0, (y[1], y[1]), 0.5, rtol=1e-5, atol=1e-7)
+        self.assertEqual(result['u'].shape, (31, 31))
+        self.assertLess(np.abs(result['u'] - u0 * np.cos(np.sqrt(2) * np.pi * 0.5)).max(), 5e-3)
+        self.assertEqual(result['stats'].solves, 3 * (result['stats'].accepted + result['stats'].rejected))
+    
+    def test_solve_pde_adaptive_option(self):
+        """Test numeric mode reports step statistics and stores the accepted step sizes"""
+        for equation in ("u_t = u_xx", "u_tt = u_xx"):
+            result = PDESolver.solve_pde(equation, "", "", mode='numeric', options={'time_stepping': 'adaptive'})
+            self.assertEqual(result['status'], 'success')
+            self.assertIn('**Time stepping:** adaptive', result['solution'])
+            self.assertAlmostEqual(result['data']['dt'].sum(), 0.1)
+    
+    def test_unknown_time_stepping(self):
+        """Test an unknown time_stepping option is reported as an error"""
+        result = PDESolver.solve_pde("u_t = u_xx", "", "", mode='numeric', options={'time_stepping': 'rk45'})
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('time stepping', result['solution'])
+
+
+class MethodOfLinesTestCase(TestCase):
+    """Test the generic method-of-lines engine"""
+    
+    def evolution(self, equation_str):
+        equation = parse_expression(equation_str)
+        return compile_evolution(equation.lhs - equation.rhs, classify(equation).function)
+    
+    def test_difference_matrices_are_exact_on_quadratics(self):
+        """Test the generated 3-point stencils differentiate x^2 exactly at interior nodes"""
+        x = np.linspace(0, 1, 11)
+        np.testing.assert_allclose(difference_matrix(11, x[1], 1) @ x ** 2, 2 * x[1:-1], atol=1e-12)
+        np.testing.assert_allclose(difference_matrix(11, x[1], 2) @ x ** 2, 2.0, atol=1e-9)
+    
+    def test_heat_with_dirichlet_and_neumann_ends(self):
+        """Test BDF integration against exact solutions of u_t = u_xx"""
+        x = np.linspace(0, 1, 101)
+        evolution = self.evolution("u_t = u_xx")
+        result = solve_method_of_lines(evolution, x, np.sin(np.pi * x), 0.1, snapshots=3)
+        self.assertLess(np.abs(result['u'] - np.sin(np.pi * x) * np.exp(-np.pi ** 2 * 0.1)).max(), 1e-4)
+        self.assertEqual(result['frames'].shape, (3, 101))
+        self.assertEqual(result['stats'].njev, 1)
+        # u = x²/2 + t has u_x(0,t) = 0 and u_x(1,t) = 1
+        result = solve_method_of_lines(evolution, x, x ** 2 / 2, 0.1, left=('neumann', 0.0), right=('neumann', 1.0))
+        self.assertLess(np.abs(result['u'] - x ** 2 / 2 - 0.1).max(), 1e-9)
+    
+    def test_rejects_non_evolution_equations(self):
+        """Test u_t must appear linearly and parameters need values"""
+        with self.assertRaises(ValueError):
+            self.evolution("u_t**2 = u_xx")
+        with self.assertRaises(ValueError):
+            self.evolution("u_t = D*u_xx")
+    
+    def test_solve_pde_burgers(self):
+        """Test numeric mode sends Burgers' equation to the method of lines"""
+        result = PDESolver.solve_pde(
+            "u_t + u*u_x = D*u_xx", "u(0,t) = 0, u(1,t) = 0", "u(x,0) = sin(2*pi*x)",
+            mode='numeric', options={'params': {'D': 0.01}, 't_end': 0.5, 'nx': 201, 'snapshots': 5},
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['method'], 'Method of Lines Solver')
+        self.assertIn('u_t = -u*u_x + 0.01*u_xx', result['solution'])
+        u = result['data']['u']
+        self.assertEqual(result['data']['frames'].shape, (5, 201))
+        # The odd initial profile stays odd about x = 1/2 while it steepens and decays
+        np.testing.assert_allclose(u, -u[::-1], atol=1e-6)
+        self.assertLess(np.abs(u).max(), 1.0)
+    
+    def test_solve_pde_reaction_diffusion_and_advection(self):
+        """Test a Fisher front with Neumann ends and an advected pulse"""
+        result = PDESolver.solve_pde(
+            "u_t = D*u_xx + u*(1 - u)", "u_x(0,t) = 0, u_x(L,t) = 0", "u(x,0) = exp(-x**2)",
+            mode='numeric', options={'params': {'D': 0.01}, 'length': 10, 'nx': 201, 't_end': 5},
+        )
+        self.assertEqual(result['status'], 'success')
+        u = result['data']['u']
+        self.assertGreater(u[0], 0.99)
+        self.assertLess(u.max(), 1.0 + 1e-6)
+        
+        result = PDESolver.solve_pde(
+            "u_t + c*u_x = 0", "", "u(x,0) = exp(-20*(x - 1)**2)",
+            mode='numeric', options={'params': {'c': 1}, 'length': 4, 'nx': 401, 't_end': 1},
+        )
+        self.assertEqual(result['method'], 'Method of Lines Solver')
+        self.assertAlmostEqual(result['data']['x'][np.argmax(result['data']['u'])], 2.0, places=1)
+    
+    def test_unsupported_equations_fall_back_to_analysis(self):
+        """Test third-order and two-dimensional equations still get the analysis"""
+        for equation in ("u_t = u_xxx", "u_xx + u_yy = u"):
+            result = PDESolver.solve_pde(equation, mode='numeric')
+            self.assertEqual(result['method'], 'PDE Analysis')
+        result = PDESolver.solve_pde("u_t = u_xx + u", mode='numeric', options={'ode_solver': 'euler'})
+        self.assertEqual(result['status'], 'error')
+
+
+class KernelCacheTestCase(TestCase):
+    """Test the on-disk cache of lambdified kernels"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.x, self.u = sp.symbols('x U')
+    
+    def test_kernels_persist_across_processes(self):
+        """Test a second cache loads the generated source instead of compiling"""
+        expressions = [self.u * (1 - self.u) + sp.sin(self.x), sp.exp(-self.x ** 2) * self.u]
+        grid = np.linspace(0.0, 1.0, 11)
+        first = KernelCache(self.tmp.name)
+        expected = first.compile([self.x, self.u], expressions, cse=True)(grid, grid)
+        second = KernelCache(self.tmp.name)
+        kernel = second.compile([self.x, self.u], expressions, cse=True)
+        np.testing.assert_allclose(kernel(grid, grid), expected)
+        self.assertEqual((first.stats()['compiles'], second.stats()['compiles'], second.stats()['disk_hits']), (1, 0, 1))
+        path = first._path(kernel_key([self.x, self.u], expressions, cse=True))
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+        self.assertIs(second.compile([self.x, self.u], expressions, cse=True), kernel)
+        self.assertEqual(second.stats()['hits'], 1)
+        self.assertNotEqual(kernel_key([self.x, self.u], expressions, cse=True),
+                            kernel_key([self.x, self.u], expressions, cse=False))
+    
+    def test_eviction_removes_least_recently_used(self):
+        """Test the directory is kept under max_bytes by deleting the oldest files"""
+        cache = KernelCache(self.tmp.name, max_bytes=10 ** 6)
+        files = []
+        for power in range(1, 4):
+            cache.compile([self.u], self.u ** power)
+            files.append(cache._path(kernel_key([self.u], self.u ** power)))
+            os.utime(files[-1], (1000 + power, 1000 + power))
+        # Room for every file but the oldest once U**4 (as long as U**3) is added
+        sizes = [path.stat().st_size for path in files]
+        cache.max_bytes = sizes[1] + 2 * sizes[2]
+        cache.compile([self.u], self.u ** 4)
+        self.assertFalse(files[0].exists())
+        self.assertTrue(files[1].exists() and files[2].exists())
+        self.assertEqual(cache.stats()['evictions'], 1)
+    
+    def test_warm_loads_most_recent_kernels(self):
+        """Test warm-up loads the most recently used kernels into memory"""
+        writer = KernelCache(self.tmp.name)
+        for power in range(1, 4):
+            writer.compile([self.u], self.u ** power)
+        recent = writer._path(kernel_key([self.u], self.u ** 2))
+        os.utime(recent, (time.time() + 60, time.time() + 60))
+        reader = KernelCache(self.tmp.name)
+        self.assertEqual(reader.warm(1), 1)
+        self.assertEqual(reader.compile([self.u], self.u ** 2)(3.0), 9.0)
+        self.assertEqual(reader.stats()['hits'], 1)
+        self.assertEqual(KernelCache(None).warm(5), 0)
+    
+    def test_non_portable_kernels_stay_in_memory(self):
+        """Test kernels needing more than the NumPy namespace are not written"""
+        cache = KernelCache(self.tmp.name)
+        kernel = cache.compile([self.x], sp.erf(self.x))
+        self.assertAlmostEqual(float(kernel(0.5)), 0.5204998778, places=8)
+        self.assertFalse(cache.directory.exists() and any(cache.directory.iterdir()))
+    
+    def test_tests_keep_kernels_in_memory(self):
+        """Test the suite's PDE_KERNEL_CACHE override reaches the process-wide cache"""
+        self.assertIsNone(get_kernel_cache().directory)
+        with self.settings(PDE_KERNEL_CACHE={'DIRECTORY': self.tmp.name}):
+            self.assertEqual(get_kernel_cache().directory.parent, Path(self.tmp.name))
+        self.assertIsNone(get_kernel_cache().directory)
+
+
+class SolutionCacheTestCase(TestCase):
+    """Test content-addressed solution cache"""
+    
+    def setUp(self):
+        get_solution_cache().clear()
+    
+    def test_canonical_key_ignores_formatting(self):
+        """Test whitespace, term order and condition order map to one key"""
+        self.assertEqual(
+            canonical_key("Eq(u(x, y).diff(x, 2) + u(x, y).diff(y, 2), 0)", "u(0,y) = 0, u(x,0) = 1"),
+            canonical_key("Eq(u(x,y).diff(y,2)+u(x,y).diff(x,2), 0)", "u(x, 0)=1,u(0, y)=0"),
+        )
+        self.assertNotEqual(
+            canonical_key("Eq(u(x, t).diff(t), u(x, t).diff(x, 2))"),
+            canonical_key("Eq(u(x, t).diff(t, 2), u(x, t).diff(x, 2))"),
+        )
+        self.assertEqual(canonical_key("u_t = u_xx"), canonical_key("u_xx = u_t"))
+        self.assertEqual(canonical_key("u_t = u_xx"), canonical_key("u_t - u_xx"))
+        self.assertNotEqual(canonical_key("u_t = u_xx"), canonical_key("u_t = -u_xx"))
+    
+    def test_lru_eviction_and_ttl(self):
+        """Test size-bounded eviction and expiry"""
+        cache = SolutionCache(max_entries=2, timeout=60)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, {'status': 'success'})
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        expired = SolutionCache(timeout=-1)
+        expired.set('a', {'status': 'success'})
+        self.assertIsNone(expired.get('a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+    
+    def test_backend_tier(self):
+        """Test entries are shared through a Django cache alias"""
+        writer = SolutionCache(backend='default')
+        writer.set('key', {'status': 'success', 'solution': 'u'})
+        reader = SolutionCache(backend='default')
+        self.assertEqual(reader.get('key')['solution'], 'u')
+        self.assertEqual(reader.stats()['backend_hits'], 1)
+    
+    def test_cached_solve_pde_counts_hits(self):
+        """Test repeated solves are served from the cache"""
+        first = cached_solve_pde("Eq(u(x, t).diff(t), u(x, t).diff(x, 2))")
+        second = cached_solve_pde("Eq(u(x,t).diff(t), u(x,t).diff(x,2))")
+        self.assertEqual(first, second)
+        stats = get_solution_cache().stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+    
+    def test_unparseable_input_is_solved_in_sandbox(self):
+        """Test keys of pathological input fail fast and the error result comes from the sandbox"""
+        equation = "u_t = (((9**99)**99)**99)**99"
+        started = time.monotonic()
+        input_hash(equation)
+        with mock.patch('pde_solver.cache.sandboxed_solve_pde', wraps=sandboxed_solve_pde) as solve:
+            result = cached_solve_pde(equation)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result['status'], 'error')
+        solve.assert_called_once_with(equation, "", "")
+    
+    def test_swapped_sides_hit_cache(self):
+        """Test an equation written with its sides swapped is served from the cache"""
+        first = cached_solve_pde("u_t = u_xx")
+        self.assertEqual(cached_solve_pde("u_xx = u_t"), first)
+        self.assertEqual(get_solution_cache().stats()['hits'], 1)
+
+
 class PDEModelTestCase(TestCase):
     """Test PDESolution model"""
     
@@ -73,6 +618,1127 @@ class PDEModelTestCase(TestCase):
         self.assertEqual(solutions[0].equation, "u_tt = u_xx")
 
 
+class SandboxPoolTestCase(TestCase):
+    """Test sandboxed solver processes"""
+    
+    def setUp(self):
+        self.pool = SandboxPool(processes=1, timeout=1, max_solves=2)
+        self.addCleanup(self.pool.close)
+    
+    def test_solve_in_child(self):
+        """Test results come back from the child process"""
+        result = self.pool.solve("Eq(u(x, t).diff(t), u(x, t).diff(x, 2))")
+        self.assertEqual(result['method'], 'Heat Equation Solver')
+    
+    def test_timeout_kills_and_replaces_child(self):
+        """Test slow solves return a timeout result and the pool keeps working"""
+        pid = next(iter(self.pool._children)).process.pid
+        result = self.pool.solve("u_t = u_xx", mode='numeric', options={'nx': 10 ** 6, 'steps': 10 ** 4})
+        self.assertEqual(result['status'], 'timeout')
+        self.assertNotEqual(next(iter(self.pool._children)).process.pid, pid)
+        self.assertEqual(self.pool.solve("Eq(u(x, t).diff(t), u(x, t).diff(x, 2))")['status'], 'success')
+    
+    def test_child_recycled_after_max_solves(self):
+        """Test children are replaced after max_solves solves"""
+        pid = next(iter(self.pool._children)).process.pid
+        for _ in range(2):
+            self.pool.solve("Eq(u(x, t).diff(t), u(x, t).diff(x, 2))")
+        self.assertNotEqual(next(iter(self.pool._children)).process.pid, pid)
+
+
+class BenchmarkTestCase(TestCase):
+    """Test the benchmark harness and the bench command"""
+    
+    def test_run_benchmark(self):
+        """Test percentiles, throughput and the per-benchmark peak allocation are reported"""
+        result = run_benchmark(Benchmark('noop', lambda: None, None, 5))
+        self.assertEqual(result['repeat'], 5)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertGreater(result['throughput'], 0)
+        self.assertLess(result['peak_alloc_kb'], 64)
+        
+        result = run_benchmark(Benchmark('alloc', lambda: np.ones(1 << 20), None, 2))
+        self.assertGreaterEqual(result['peak_alloc_kb'], 8192)
+        # The larger peak of the previous benchmark is not carried over
+        self.assertLess(run_benchmark(Benchmark('noop', lambda: None, None, 2))['peak_alloc_kb'], 64)
+    
+    def test_compare(self):
+        """Test regressions above the threshold are reported"""
+        baseline = {'a': {'p50_ms': 1.0, 'peak_alloc_kb': 1000}, 'b': {'p50_ms': 1.0, 'peak_alloc_kb': 1000}}
+        results = {'a': {'p50_ms': 1.2, 'peak_alloc_kb': 1000}, 'b': {'p50_ms': 2.0, 'peak_alloc_kb': 1000}}
+        regressions = compare(results, baseline, 0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('b: p50_ms'))
+    
+    def test_command_saves_and_compares(self):
+        """Test the bench command writes a baseline and fails on a regression"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            options = {'baseline': path, 'filter': 'parse_equation', 'repeat': 3, 'no_api': True, 'stdout': StringIO()}
+            call_command('bench', save=True, **options)
+            with open(path) as f:
+                self.assertIn('parse_equation', json.load(f)['results'])
+            call_command('bench', **options)
+            with self.assertRaises(CommandError):
+                call_command('bench', threshold=-1, stderr=StringIO(), **options)
+
+
+class SolveJobTestCase(TestCase):
+    """Test queued solve jobs and the worker command"""
+    
+    def test_submit_and_poll(self):
+        """Test jobs are queued, processed by the worker and reported when done"""
+        response = self.client.post(reverse('submit_solve_job'), {
+            'equation': 'Eq(u(x, t).diff(t), u(x, t).diff(x, 2))',
+        })
+        self.assertEqual(response.status_code, 202)
+        poll_url = response.json()['poll_url']
+        self.assertEqual(self.client.get(poll_url).json()['status'], SolveJob.QUEUED)
+        
+        call_command('run_solve_workers', workers=1, once=True, stdout=StringIO())
+        data = self.client.get(poll_url).json()
+        self.assertEqual(data['status'], SolveJob.DONE)
+        self.assertEqual(data['method'], 'Heat Equation Solver')
+    
+    def test_failed_job(self):
+        """Test unparseable equations end in the failed state"""
+        job = SolveJob.objects.create(equation='invalid equation syntax')
+        call_command('run_solve_workers', workers=1, once=True, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, SolveJob.FAILED)
+        self.assertIn('message', job.as_dict())
+    
+    def test_slow_job_times_out(self):
+        """Test a job running past the timeout is killed and marked failed"""
+        job = SolveJob.objects.create(equation='Eq(u(x, t).diff(t), u(x, t).diff(x, 2))')
+        # The children are forked inside the command, so they inherit the patched solver
+        with mock.patch('pde_solver.sandbox.PDESolver.solve_pde', side_effect=lambda *args: time.sleep(30)):
+            call_command('run_solve_workers', workers=1, once=True, timeout=0.5, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, SolveJob.FAILED)
+        self.assertIn('longer than', job.error)
+        self.assertIsNotNone(job.finished_at)
+    
+    def test_claim_is_exclusive(self):
+        """Test a job can only be claimed once"""
+        job = SolveJob.objects.create(equation='u_t = u_xx')
+        self.assertTrue(job.claim())
+        self.assertFalse(SolveJob.objects.get(pk=job.pk).claim())
+    
+    def test_submit_requires_equation(self):
+        """Test submit endpoint validates input"""
+        response = self.client.post(reverse('submit_solve_job'), {'equation': ''})
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchSolveTestCase(TestCase):
+    """Test the batch solve endpoint"""
+    
+    def post(self, items, **extra):
+        return self.client.post(reverse('solve_batch_api'), json.dumps(items), content_type='application/json', **extra)
+    
+    def test_results_in_order_with_dedupe(self):
+        """Test equivalent items are solved once and results follow input order"""
+        items = [
+            {'equation': 'u_t = u_xx', 'initial_conditions': 'u(x,0)=sin(pi*x)'},
+            {'equation': 'u_tt = u_xx'},
+            {'equation': 'u_t  =  u_xx', 'initial_conditions': 'u(x,0) = sin(pi*x)'},
+            {'equation': ''},
+            'u_t = u_xx',
+        ]
+        with mock.patch('pde_solver.batch.cached_solve_pde', side_effect=PDESolver.solve_pde) as solve:
+            response = self.post(items)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(solve.call_count, 2)
+        results = response.json()['results']
+        self.assertEqual([r['status'] for r in results], ['success', 'success', 'success', 'error', 'error'])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(results[1]['method'], 'Wave Equation Solver')
+    
+    def test_key_budget_bounds_canonicalization(self):
+        """Test pathological items fail fast and items past the key budget are grouped by exact text"""
+        items = [{'equation': 'u_t = (((9**99)**99)**99)**99'}, {'equation': 'u_t = u_xx'},
+                 {'equation': 'u_t  =  u_xx'}, {'equation': 'u_t = u_xx'}]
+        with mock.patch('pde_solver.batch.cached_solve_pde', side_effect=PDESolver.solve_pde) as solve:
+            started = time.monotonic()
+            results = solve_batch(items)
+            self.assertLess(time.monotonic() - started, 5)
+            self.assertEqual(solve.call_count, 2)
+            solve.reset_mock()
+            self.assertEqual(solve_batch(items, key_budget=0)[1:], results[1:])
+            self.assertEqual(solve.call_count, 3)
+        self.assertEqual(results[0]['status'], 'error')
+    
+    def test_ndjson_stream(self):
+        """Test streamed results carry their item index"""
+        items = [{'equation': 'u_t = u_xx'}, {'equation': 'u_xx + u_yy = 0'}]
+        with mock.patch('pde_solver.batch.cached_solve_pde', side_effect=PDESolver.solve_pde):
+            response = self.post(items, HTTP_ACCEPT='application/x-ndjson')
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        results = {line['index']: line for line in map(json.loads, lines)}
+        self.assertEqual(results[1]['method'], 'Laplace Equation Solver')
+        self.assertEqual(len(results), 2)
+    
+    def test_ndjson_disconnect_cancels_pending(self):
+        """Test closing the stream early drops the solves that have not started"""
+        def slow_solve(equation, bc, ic):
+            time.sleep(0.2)
+            return {'solution': equation, 'method': 'Test', 'status': 'success'}
+        
+        items = [{'equation': f'u_t = {k}*u_xx'} for k in range(2, 8)]
+        with self.settings(PDE_SOLVE_BATCH={'CONCURRENCY': 1}), \
+                mock.patch('pde_solver.batch.cached_solve_pde', side_effect=slow_solve) as solve:
+            response = self.post(items, HTTP_ACCEPT='application/x-ndjson')
+            self.assertIn('index', json.loads(next(iter(response.streaming_content))))
+            started = time.monotonic()
+            response.close()
+            self.assertLess(time.monotonic() - started, 0.15)
+            time.sleep(0.5)
+            self.assertLessEqual(solve.call_count, 2)
+    
+    def test_rejects_bad_bodies(self):
+        """Test non-array, empty and oversized bodies are rejected"""
+        self.assertEqual(self.post({'equation': 'u_t = u_xx'}).status_code, 400)
+        self.assertEqual(self.post([]).status_code, 400)
+        with self.settings(PDE_SOLVE_BATCH={'MAX_ITEMS': 1}):
+            self.assertEqual(self.post([{'equation': 'u_t = u_xx'}] * 2).status_code, 400)
+        self.assertEqual(self.client.get(reverse('solve_batch_api')).status_code, 405)
+
+
+class ParameterSweepTestCase(TestCase):
+    """Test lambdified evaluation of symbolic solutions over parameter sweeps"""
+    
+    def sweep(self, body):
+        return self.client.post(reverse('solve_sweep_api'), json.dumps(body), content_type='application/json')
+    
+    def test_evaluate_grid(self):
+        """Test one vectorized call covers the parameter and variable axes"""
+        expression = PDESolver.solve_pde("u_t = D*u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")['expression']
+        axes = sweep_axes({'D': [0.5, 1.0]}, {'t': [0.0, 0.1], 'x': {'start': 0, 'stop': 1, 'num': 5}})
+        self.assertEqual([name for name, _ in axes], ['D', 'x', 't'])
+        values = evaluate_grid(expression, axes)
+        self.assertEqual(values.shape, (2, 5, 2))
+        self.assertAlmostEqual(values[1, 2, 1], np.exp(-np.pi ** 2 * 0.1))
+        self.assertAlmostEqual(values[0, 2, 1], np.exp(-0.5 * np.pi ** 2 * 0.1))
+    
+    def test_truncated_series(self):
+        """Test infinite sine series are summed to a fixed number of terms"""
+        expression = PDESolver.solve_pde("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=x*(1 - x)")['expression']
+        values = evaluate_grid(expression, sweep_axes({}, {'x': [0.5], 't': [0.0]}), terms=201)
+        self.assertAlmostEqual(values[0, 0], 0.25, places=6)
+    
+    def test_missing_parameter(self):
+        """Test a parameter left without values is reported"""
+        expression = PDESolver.solve_pde("u_t = D*u_xx", "", "u(x,0)=sin(x)")['expression']
+        with self.assertRaises(ValueError):
+            evaluate_grid(expression, sweep_axes({}, {'x': [0.0], 't': [0.0]}))
+    
+    def test_sweep_api(self):
+        """Test the endpoint returns a .npy array with the axis names in a header"""
+        with mock.patch('pde_solver.views.cached_solve_pde', side_effect=PDESolver.solve_pde):
+            response = self.sweep({
+                'equation': 'u_tt = c^2*u_xx',
+                'boundary_conditions': 'u(0,t)=0, u(1,t)=0',
+                'initial_conditions': 'u(x,0)=sin(pi*x)',
+                'parameters': {'c': [1.0, 2.0, 3.0]},
+                'grid': {'x': [0.5], 't': {'start': 0, 'stop': 1, 'num': 3}},
+                'dtype': 'float32',
+            })
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['X-Sweep-Axes'], 'c,x,t')
+            values = np.load(io.BytesIO(response.content))
+            self.assertEqual((values.shape, values.dtype), ((3, 1, 3), np.float32))
+            np.testing.assert_allclose(values[:, 0, 2], np.cos(np.pi * np.array([1.0, 2.0, 3.0])), atol=1e-6)
+            
+            self.assertEqual(self.sweep({'equation': 'u_t = u_xx', 'parameters': {'q': [1]}}).status_code, 400)
+            self.assertEqual(self.sweep({'equation': 'u_t = u_xx', 'grid': {'x': [0.0]}}).status_code, 422)
+    
+    def test_sweep_terms_are_bounded(self):
+        """Test sweep terms must be positive and are capped at MAX_SERIES_TERMS"""
+        body = {
+            'equation': 'u_t = D*u_xx',
+            'boundary_conditions': 'u(0,t)=0, u(1,t)=0',
+            'initial_conditions': 'u(x,0)=x*(1 - x)',
+            'parameters': {'D': [1.0, 2.0]}, 'grid': {'x': [0.5], 't': [0.0]},
+        }
+        with mock.patch('pde_solver.views.cached_solve_pde', side_effect=PDESolver.solve_pde):
+            for terms in (0, -5, 'all'):
+                self.assertEqual(self.sweep(dict(body, terms=terms)).status_code, 400)
+            with self.settings(PDE_EVALUATION={'MAX_SERIES_TERMS': 3}), \
+                    mock.patch('pde_solver.evaluation.truncate_series', wraps=truncate_series) as truncate:
+                self.assertEqual(self.sweep(dict(body, terms=200000)).status_code, 200)
+            self.assertEqual(truncate.call_args[0][1], 3)
+    
+    def test_oversized_series_sweep_rejected(self):
+        """Test a sweep needing more than MAX_SERIES_POINTS term evaluations is refused unevaluated"""
+        body = {
+            'equation': 'u_t = D*u_xx',
+            'boundary_conditions': 'u(0,t)=0, u(1,t)=0',
+            'initial_conditions': 'u(x,0)=x*(1 - x)',
+            'parameters': {'D': {'start': 0.1, 'stop': 1, 'num': 100}},
+            'grid': {'x': {'start': 0, 'stop': 1, 'num': 1000}, 't': {'start': 0, 'stop': 1, 'num': 100}},
+            'terms': 1000,
+        }
+        with mock.patch('pde_solver.views.cached_solve_pde', side_effect=PDESolver.solve_pde), \
+                mock.patch('pde_solver.evaluation._fill') as fill:
+            response = self.sweep(body)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('term evaluations', response.json()['message'])
+            fill.assert_not_called()
+            self.assertEqual(self.sweep(dict(body, grid={'x': [0.5], 't': [0.0]})).status_code, 200)
+
+
+class SolutionSamplingTestCase(TestCase):
+    """Test sampling stored solutions through their compiled expression"""
+    
+    def setUp(self):
+        result = PDESolver.solve_pde("u_t = D*u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")
+        self.solution = PDESolution.objects.create(
+            equation="u_t = D*u_xx",
+            solution=result['solution'],
+            expression=result['expression'],
+            method_used=result['method'],
+        )
+    
+    def sample(self, query):
+        return self.client.get(reverse('sample_solution', args=[self.solution.pk]) + query)
+    
+    def test_sample_npy(self):
+        """Test a grid sample matches the closed form"""
+        response = self.sample('?x=0:1:11&t=0,0.1&D=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Sample-Axes'], 'x,t')
+        values = np.load(io.BytesIO(response.content))
+        self.assertEqual(values.shape, (11, 2))
+        self.assertAlmostEqual(values[5, 1], np.exp(-2 * np.pi ** 2 * 0.1))
+    
+    def test_sample_json_and_errors(self):
+        """Test the JSON format and rejected queries"""
+        data = self.sample('?x=0.5&t=0&D=1&format=json').json()
+        self.assertAlmostEqual(data['u'][0][0], 1.0)
+        self.assertEqual(self.sample('?x=0:1:11&t=0').status_code, 400)
+        self.assertEqual(self.sample('').status_code, 400)
+        self.assertEqual(self.sample('?x=0.5&t=0&D=1&backend=fortran').status_code, 400)
+        self.solution.expression = ''
+        self.solution.save()
+        self.assertEqual(self.sample('?x=0.5').status_code, 422)
+    
+    def test_oversized_axes_rejected_before_allocation(self):
+        """Test ranges beyond MAX_POINTS, alone or across axes, are refused without building them"""
+        with mock.patch('pde_solver.evaluation.np.linspace', wraps=np.linspace) as linspace:
+            self.assertEqual(self.sample('?x=0:1:300000000&t=0&D=1').status_code, 400)
+            linspace.assert_not_called()
+            url = reverse('download_solution', args=[self.solution.pk]) + '?t=0:1:100000&x=0:1:1000&D=1'
+            self.assertEqual(self.client.get(url).status_code, 400)
+            self.assertEqual(linspace.call_count, 1)
+        with self.assertRaises(ValueError):
+            sweep_axes({'D': {'start': 0, 'stop': 1, 'num': 10 ** 4}}, {'x': {'start': 0, 'stop': 1, 'num': 10 ** 4}})
+        self.assertEqual(len(sweep_axes({'D': [1, 2]}, {'x': {'start': 0, 'stop': 1, 'num': 5}})[1][1]), 5)
+    
+    def test_json_and_series_limits(self):
+        """Test JSON samples beyond MAX_JSON_VALUES and oversized series grids are refused unevaluated"""
+        with mock.patch('pde_solver.evaluation._fill') as fill:
+            with self.settings(PDE_EVALUATION={'MAX_JSON_VALUES': 100}):
+                response = self.sample('?x=0:1:101&t=0&D=1&format=json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('JSON', response.json()['message'])
+            self.solution.expression = PDESolver.solve_pde(
+                "u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=x*(1 - x)")['expression']
+            self.solution.save()
+            self.assertEqual(self.sample('?x=0:1:1000000&t=0:1:10&terms=1000').status_code, 400)
+            fill.assert_not_called()
+    
+    def test_series_terms_are_bounded(self):
+        """Test non-positive terms are rejected and large ones capped at MAX_SERIES_TERMS"""
+        for terms in ('0', '-3', 'many'):
+            self.assertEqual(self.sample(f'?x=0.5&t=0&D=1&terms={terms}').status_code, 400)
+            url = reverse('download_solution', args=[self.solution.pk]) + f'?x=0:1:11&t=0&D=1&terms={terms}'
+            self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.sample('?x=0.5&t=0&D=1&terms=200000').status_code, 200)
+        self.assertEqual(series_terms('200000'), 1000)
+        with self.settings(PDE_EVALUATION={'MAX_SERIES_TERMS': 20}):
+            self.assertEqual(series_terms(50), 20)
+        self.assertIsNone(series_terms(None))
+    
+    def test_detail_links_sampling(self):
+        """Test the detail page links to a sample covering the solution's variables"""
+        response = self.client.get(reverse('solution_detail', args=[self.solution.pk]))
+        self.assertContains(response, 'x=0:1:101&amp;t=0:1:101&amp;D=1&amp;format=json')
+    
+    def test_chunked_evaluation(self):
+        """Test chunked evaluation matches a single vectorized call"""
+        axes = [('x', np.linspace(0, 1, 37)), ('t', np.linspace(0, 1, 23))]
+        expected = evaluate_grid(self.solution.expression, axes, fixed={'D': 1.0})
+        with self.settings(PDE_EVALUATION={'CHUNK_POINTS': 5}):
+            chunked = evaluate_grid(self.solution.expression, axes, fixed={'D': 1.0})
+        np.testing.assert_array_equal(chunked, expected)
+    
+    def test_compiled_once_per_solution(self):
+        """Test repeated samples reuse the compiled function"""
+        compiled_for_solution.cache_clear()
+        self.sample('?x=0.5&t=0&D=1')
+        self.sample('?x=0.1,0.2&t=0&D=3')
+        info = compiled_for_solution.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 1))
+
+
+class SolutionArrayTestCase(TestCase):
+    """Test .npy storage of numeric results and sliced reads"""
+    
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = self.settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.solution = PDESolution.objects.create(equation="u_t = u_xx", solution="numeric", method_used="FD")
+    
+    def test_store_and_mmap_load(self):
+        """Test arrays round-trip through memory-mapped .npy files"""
+        frames = np.arange(24, dtype=np.float64).reshape(4, 6)
+        array = SolutionArray.store(self.solution, 'frames', frames)
+        self.assertEqual((array.shape, array.dtype, array.nbytes), ([4, 6], '<f8', 192))
+        loaded = array.load()
+        self.assertIsInstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded[2], frames[2])
+    
+    def test_files_deleted_with_solution(self):
+        """Test deleting the solution removes the array files"""
+        path = SolutionArray.store(self.solution, 'u', np.zeros(5)).file.path
+        self.assertTrue(os.path.exists(path))
+        self.solution.delete()
+        self.assertFalse(os.path.exists(path))
+    
+    def test_slice_api(self):
+        """Test listing arrays and reading a time step or sub-region"""
+        SolutionArray.store(self.solution, 'frames', np.arange(24.0).reshape(4, 6))
+        listing = self.client.get(reverse('solution_arrays', args=[self.solution.pk])).json()['arrays']
+        self.assertEqual(listing[0]['shape'], [4, 6])
+        url = reverse('solution_array', args=[self.solution.pk, 'frames'])
+        self.assertEqual(self.client.get(url + '?index=-1').json()['values'], [18, 19, 20, 21, 22, 23])
+        self.assertEqual(self.client.get(url + '?index=1:3,0').json()['values'], [6, 12])
+        self.assertEqual(self.client.get(url + '?index=9').status_code, 400)
+        self.assertEqual(self.client.get(url + '?index=a').status_code, 400)
+        with self.settings(PDE_EVALUATION={'MAX_JSON_VALUES': 10}):
+            self.assertEqual(self.client.get(url).status_code, 400)
+    
+    def test_numeric_form_stores_arrays(self):
+        """Test a numeric solve from the form saves its grids as arrays"""
+        with mock.patch('pde_solver.views.sandboxed_solve_pde', side_effect=PDESolver.solve_pde):
+            response = self.client.post(reverse('solve_pde'), {
+                'equation': 'u_t = u_xx',
+                'boundary_conditions': 'u(0,t)=0, u(1,t)=0',
+                'initial_conditions': 'u(x,0)=sin(pi*x)',
+                'mode': 'numeric',
+            })
+        self.assertEqual(response.status_code, 302)
+        solution = PDESolution.objects.get(initial_conditions='u(x,0)=sin(pi*x)')
+        u = solution.arrays.get(name='u')
+        self.assertEqual(u.shape, [101])
+        self.assertAlmostEqual(float(u.load()[50]), np.exp(-np.pi ** 2 * 0.1), places=3)
+        detail = self.client.get(reverse('solution_detail', args=[solution.pk]))
+        self.assertContains(detail, '101 · &lt;f8')
+
+
+class SolutionDownloadTestCase(TestCase):
+    """Test streamed, range-sliced downloads of solution fields"""
+    
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = self.settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.frames = np.arange(60, dtype=np.float64).reshape(5, 12)
+        self.numeric = PDESolution.objects.create(equation="u_t = u_xx", solution="numeric", method_used="FD")
+        SolutionArray.store(self.numeric, 'frames', self.frames)
+        SolutionArray.store(self.numeric, 'u', self.frames[-1])
+        result = PDESolver.solve_pde("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")
+        self.closed = PDESolution.objects.create(
+            equation="u_t = u_xx", solution=result['solution'], expression=result['expression'], method_used="CF"
+        )
+    
+    def download(self, solution, query):
+        response = self.client.get(reverse('download_solution', args=[solution.pk]) + query)
+        if response.status_code != 200:
+            return response, None
+        content = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return response, content
+    
+    def test_raw_frames_with_range_and_stride(self):
+        """Test time-step ranges and spatial strides on stored frames"""
+        response, content = self.download(self.numeric, '?steps=1:4&stride=3')
+        self.assertEqual(response['X-Shape'], '3,4')
+        self.assertEqual(response['X-Dtype'], '<f8')
+        values = np.frombuffer(content, dtype='<f8').reshape(3, 4)
+        np.testing.assert_array_equal(values, self.frames[1:4, ::3])
+    
+    def test_npy_downsampled_float32(self):
+        """Test block-mean downsampling into a float32 .npy stream"""
+        response, content = self.download(self.numeric, '?steps=-1&downsample=4&format=npy&dtype=float32')
+        values = np.load(io.BytesIO(content))
+        self.assertEqual((values.shape, values.dtype), ((1, 3), np.float32))
+        np.testing.assert_allclose(values[0], self.frames[-1].reshape(3, 4).mean(axis=1))
+    
+    def test_gzip_chunks_constant_block_size(self):
+        """Test compressed output and that the field is produced in bounded blocks"""
+        with self.settings(PDE_EVALUATION={'CHUNK_POINTS': 24}):
+            stream = FieldStream.from_array(SolutionArray.objects.get(name='frames').load())
+            self.assertEqual([block.shape for block in stream.blocks()], [(2, 12), (2, 12), (1, 12)])
+            response, content = self.download(self.numeric, '?array=u&compress=gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        np.testing.assert_array_equal(np.frombuffer(content, dtype='<f8'), self.frames[-1])
+    
+    def test_expression_grid(self):
+        """Test closed-form solutions are evaluated on the requested grid, time outermost"""
+        with self.settings(PDE_EVALUATION={'CHUNK_POINTS': 16}):
+            response, content = self.download(self.closed, '?x=0:1:21&t=0:0.1:6&stride=2&format=npy')
+        values = np.load(io.BytesIO(content))
+        self.assertEqual(values.shape, (6, 11))
+        self.assertAlmostEqual(values[-1, 5], np.exp(-np.pi ** 2 * 0.1))
+    
+    def test_errors(self):
+        """Test invalid selections are rejected before streaming"""
+        for query in ('?format=csv', '?stride=0', '?steps=a', '?array=missing', '?dtype=int8'):
+            self.assertEqual(self.download(self.numeric, query)[0].status_code, 400, query)
+        self.assertEqual(self.download(self.closed, '')[0].status_code, 400)
+        self.assertEqual(self.download(self.closed, '?x=0:1:3')[0].status_code, 400)
+    
+    def test_oversized_series_download_rejected(self):
+        """Test a series download needing more than MAX_SERIES_POINTS term evaluations is refused unevaluated"""
+        result = PDESolver.solve_pde("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=x*(1 - x)")
+        series = PDESolution.objects.create(
+            equation="u_t = u_xx", solution=result['solution'], expression=result['expression'], method_used="CF"
+        )
+        with mock.patch('pde_solver.evaluation._fill') as fill:
+            response, _ = self.download(series, '?t=0:1:1000&x=0:1:1000&terms=1000')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('term evaluations', response.json()['message'])
+            fill.assert_not_called()
+
+
+class SolutionPlotTestCase(TestCase):
+    """Test cached server-side plots"""
+    
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = self.settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        result = PDESolver.solve_pde("u_t = D*u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")
+        self.solution = PDESolution.objects.create(
+            equation="u_t = D*u_xx", solution=result['solution'], expression=result['expression'], method_used="CF"
+        )
+    
+    def fake_render(self, field, path, output, size):
+        with open(path, 'wb') as f:
+            f.write(b'image')
+    
+    def test_plot_field(self):
+        """Test closed forms are evaluated as a u(x, t) heatmap and numeric frames are thinned"""
+        kind, (x_label, xs), (y_label, ys), values = plot_field(self.solution)
+        self.assertEqual((kind, x_label, y_label, values.shape), ('heatmap', 'x', 't', (101, 101)))
+        self.assertAlmostEqual(values[0, 50], 1.0)
+        
+        numeric = PDESolution.objects.create(equation="u_t = u_xx", solution="numeric", method_used="FD")
+        SolutionArray.store(numeric, 'frames', np.zeros((1000, 50)))
+        SolutionArray.store(numeric, 'times', np.linspace(0, 1, 1000))
+        SolutionArray.store(numeric, 'x', np.linspace(0, 1, 50))
+        kind, (_, xs), (_, ts), values = plot_field(numeric)
+        self.assertEqual((kind, values.shape, ts.shape, xs.shape), ('heatmap', (334, 50), (334,), (50,)))
+    
+    def test_rendered_once_with_conditional_get(self):
+        """Test the plot is rendered once and revalidated with ETag"""
+        url = reverse('solution_plot', args=[self.solution.pk, 'png'])
+        with mock.patch('pde_solver.plots.matplotlib', object()), \
+                mock.patch('pde_solver.plots.render_field', side_effect=self.fake_render) as render:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), b'image')
+            self.assertEqual(response['Content-Type'], 'image/png')
+            self.assertIn('Last-Modified', response)
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(cached.status_code, 304)
+            self.assertEqual(self.client.get(url + '?size=full').status_code, 200)
+            self.assertEqual(render.call_count, 2)
+            
+            listing = self.client.get(reverse('solution_list'))
+            self.assertContains(listing, url)
+        
+        self.solution.delete()
+        self.assertFalse(os.path.exists(os.path.join(self.media.name, 'plots', str(self.solution.pk))))
+    
+    def test_concurrent_render_keeps_current_file(self):
+        """Test stale cleanup spares the current file and a plot removed before it is served is redrawn"""
+        url = reverse('solution_plot', args=[self.solution.pk, 'png'])
+        with mock.patch('pde_solver.plots.matplotlib', object()), \
+                mock.patch('pde_solver.plots.render_field', side_effect=self.fake_render) as render:
+            path = plot_file(self.solution)
+            stale = os.path.join(os.path.dirname(path), 'thumb-1.png')
+            open(stale, 'wb').close()
+            os.remove(path)
+            self.assertEqual(plot_file(self.solution), path)
+            self.assertFalse(os.path.exists(stale))
+            
+            def open_after_removal(name, *args):
+                # Another request's render removes the file between plot_file and open
+                if render.call_count == 2:
+                    os.remove(name)
+                return open(name, *args)
+            with mock.patch('pde_solver.plots.open', side_effect=open_after_removal, create=True):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), b'image')
+            self.assertEqual(render.call_count, 3)
+    
+    def test_unavailable_and_invalid(self):
+        """Test missing matplotlib and unknown formats are reported"""
+        url = reverse('solution_plot', args=[self.solution.pk, 'png'])
+        with mock.patch('pde_solver.plots.matplotlib', None):
+            self.assertEqual(self.client.get(url).status_code, 503)
+            self.assertNotContains(self.client.get(reverse('solution_list')), url)
+        self.assertEqual(self.client.get(reverse('solution_plot', args=[self.solution.pk, 'gif'])).status_code, 400)
+    
+    @unittest.skipUnless(plotting_available(), "matplotlib is not installed")
+    def test_render_png_and_svg(self):
+        """Test real headless rendering"""
+        with open(plot_file(self.solution, 'png', 'thumb'), 'rb') as f:
+            self.assertEqual(f.read(8), b'\x89PNG\r\n\x1a\n')
+        with open(plot_file(self.solution, 'svg', 'full'), 'rb') as f:
+            self.assertIn(b'<svg', f.read())
+
+
+class SolutionPaginationTestCase(TestCase):
+    """Test keyset pagination, deferred list columns and the cached count"""
+    
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        PDESolution.objects.bulk_create(
+            PDESolution(equation=f"u_t = {i}*u_xx", solution="S" * 1000, method_used="Heat" if i % 2 else "Wave")
+            for i in range(25)
+        )
+        # bulk_create gives every row the same created_at, so the id alone orders them
+        self.newest_first = list(PDESolution.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+    
+    def test_pages_cover_rows_once_in_order(self):
+        """Test following next cursors walks every row newest first, ties broken by id"""
+        seen, cursor = [], None
+        while True:
+            page = keyset_page(PDESolution.objects.all(), 10, after=cursor)
+            seen += [row.pk for row in page.object_list]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.newest_first)
+    
+    def test_previous_cursor_returns_to_the_newer_page(self):
+        """Test going back from the second page gives the first page"""
+        first = keyset_page(PDESolution.objects.all(), 10)
+        self.assertIsNone(first.previous_cursor)
+        second = keyset_page(PDESolution.objects.all(), 10, after=first.next_cursor)
+        back = keyset_page(PDESolution.objects.all(), 10, before=second.previous_cursor)
+        self.assertEqual([row.pk for row in back.object_list], [row.pk for row in first.object_list])
+        self.assertIsNone(back.previous_cursor)
+    
+    def test_cursor_round_trip(self):
+        """Test cursors decode to the row position and reject garbage"""
+        row = PDESolution.objects.first()
+        self.assertEqual(decode_cursor(encode_cursor(row)), (row.created_at, row.pk))
+        for cursor in ('not-a-cursor', encode_cursor(row)[:-4], '!!'):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+    
+    def test_list_view_pages(self):
+        """Test the list view shows cursor links and 404s on a bad cursor"""
+        response = self.client.get(reverse('solution_list'))
+        self.assertEqual([s.pk for s in response.context['solutions']], self.newest_first[:10])
+        self.assertContains(response, f"after={response.context['page_obj'].next_cursor}")
+        last = self.client.get(reverse('solution_list'), {'after': encode_cursor(PDESolution.objects.get(pk=self.newest_first[19]))})
+        self.assertEqual([s.pk for s in last.context['solutions']], self.newest_first[20:])
+        self.assertEqual(self.client.get(reverse('solution_list'), {'after': 'bogus'}).status_code, 404)
+    
+    def test_list_view_defers_solution(self):
+        """Test list rows load a preview instead of the full solution text"""
+        response = self.client.get(reverse('solution_list'))
+        row = response.context['solutions'][0]
+        self.assertIn('solution', row.get_deferred_fields())
+        self.assertEqual(len(row.solution_preview), 301)
+    
+    def test_list_view_filters_by_method(self):
+        """Test the method filter"""
+        response = self.client.get(reverse('solution_list'), {'method': 'Wave'})
+        self.assertTrue(all(s.method_used == 'Wave' for s in response.context['solutions']))
+        self.assertEqual(len(response.context['solutions']), 10)
+    
+    def test_list_view_query_count(self):
+        """Test the list page costs one row query once the count is cached"""
+        self.client.get(reverse('solution_list'))
+        with self.assertNumQueries(1):
+            self.client.get(reverse('solution_list'))
+    
+    def test_approximate_count_is_cached(self):
+        """Test the count is computed once per timeout"""
+        self.assertEqual(approximate_count(PDESolution), 25)
+        PDESolution.objects.create(equation="u_t = u_xx", solution="s", method_used="Heat")
+        with self.assertNumQueries(0):
+            self.assertEqual(approximate_count(PDESolution), 25)
+        cache.clear()
+        self.assertEqual(approximate_count(PDESolution), 26)
+    
+    def test_seed_solutions_command(self):
+        """Test seeding bulk inserts rows"""
+        call_command('seed_solutions', count=12, batch_size=5, solution_size=256, stdout=StringIO())
+        self.assertEqual(PDESolution.objects.count(), 37)
+
+
+class SolutionSearchTestCase(TestCase):
+    """Test full-text search over saved solutions"""
+    
+    def setUp(self):
+        self.heat = PDESolution.objects.create(
+            equation="u_t = D*u_xx", boundary_conditions="u(0,t) = 0", solution="Separation of variables",
+            method_used="Closed-Form Heat Solution",
+        )
+        self.wave = PDESolution.objects.create(
+            equation="u_tt = c^2*u_xx", initial_conditions="u(x,0) = exp(-x**2)", solution="d'Alembert formula",
+            method_used="Closed-Form Wave Solution",
+        )
+        self.laplace = PDESolution.objects.create(
+            equation="u_xx + u_yy = 0", solution="Harmonic function", method_used="Laplace",
+        )
+    
+    def search(self, text):
+        return [s.pk for s in search_solutions(text, PDESolution.objects.all())]
+    
+    def test_uses_index(self):
+        """Test the test database has the FTS5 index"""
+        self.assertEqual(search_backend(), 'fts5')
+    
+    def test_matches_every_word(self):
+        """Test words are ANDed across columns and identifiers stay whole"""
+        self.assertEqual(sorted(self.search("u_xx")), sorted([self.heat.pk, self.wave.pk, self.laplace.pk]))
+        self.assertEqual(self.search("u_xx heat"), [self.heat.pk])
+        self.assertEqual(self.search("alembert"), [self.wave.pk])
+        self.assertEqual(self.search("u_yy"), [self.laplace.pk])
+        self.assertEqual(self.search("u_yy heat"), [])
+    
+    def test_prefix_and_operators(self):
+        """Test the last word matches as a prefix and query syntax is ignored"""
+        self.assertEqual(self.search("harmon"), [self.laplace.pk])
+        self.assertEqual(self.search('"wave" -(*:'), [self.wave.pk])
+        self.assertEqual(self.search("  "), [])
+    
+    def test_index_follows_updates_and_deletes(self):
+        """Test the triggers keep the index in sync with save, update and delete"""
+        self.heat.solution = "Fourier series"
+        self.heat.save()
+        self.assertEqual(self.search("fourier"), [self.heat.pk])
+        self.assertEqual(self.search("separation"), [])
+        PDESolution.objects.filter(pk=self.wave.pk).update(solution="Characteristics")
+        self.assertEqual(self.search("characteristics"), [self.wave.pk])
+        self.laplace.delete()
+        self.assertEqual(self.search("harmonic"), [])
+    
+    def test_ranks_better_matches_first(self):
+        """Test a word matched twice outranks a single match"""
+        PDESolution.objects.create(equation="u_t = u_xx", solution="heat heat heat", method_used="Heat")
+        results = search_solutions("heat", PDESolution.objects.all())
+        self.assertEqual(len(results), 2)
+        self.assertLessEqual(results[0].rank, results[1].rank)
+    
+    def test_search_view(self):
+        """Test the search page lists matches and redirects an empty search"""
+        response = self.client.get(reverse('solution_search'), {'q': 'wave'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s.pk for s in response.context['solutions']], [self.wave.pk])
+        self.assertContains(response, "1 match for")
+        response = self.client.get(reverse('solution_search'), {'q': 'u_xx', 'method': 'Laplace'})
+        self.assertEqual([s.pk for s in response.context['solutions']], [self.laplace.pk])
+        self.assertContains(self.client.get(reverse('solution_search'), {'q': 'nothing'}), "No matches")
+        self.assertRedirects(self.client.get(reverse('solution_search'), {'q': ''}), reverse('solution_list'))
+    
+    def test_admin_search(self):
+        """Test the admin changelist searches through the index"""
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        response = self.client.get(reverse('admin:pde_solver_pdesolution_changelist'), {'q': 'alembert'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s.pk for s in response.context['cl'].result_list], [self.wave.pk])
+
+
+class SolutionDedupeTestCase(TestCase):
+    """Test solve-once storage of identical inputs and the dedupe_solutions command"""
+    
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = self.settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+    
+    def submit(self, equation, bc='', ic='', mode='symbolic'):
+        return self.client.post(reverse('solve_pde'), {
+            'equation': equation, 'boundary_conditions': bc, 'initial_conditions': ic, 'mode': mode,
+        })
+    
+    def test_identical_inputs_are_solved_once(self):
+        """Test resubmits link to the stored row instead of solving again"""
+        self.submit("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")
+        with mock.patch('pde_solver.views.cached_solve_pde') as solve:
+            response = self.submit("u_t=u_xx", "u(1,t) = 0,u(0,t) = 0", "u(x,0)=sin(pi*x)")
+        solve.assert_not_called()
+        self.assertRedirects(response, reverse('solution_list'))
+        solution = PDESolution.objects.get()
+        self.assertEqual(len(solution.input_hash), 64)
+        self.assertEqual(solution.submissions.count(), 2)
+        detail = self.client.get(reverse('solution_detail', args=[solution.pk]))
+        self.assertContains(detail, "2 times")
+    
+    def test_modes_and_inputs_are_distinct(self):
+        """Test different conditions or modes get their own rows"""
+        self.submit("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")
+        self.submit("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(2*pi*x)")
+        self.submit("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)", mode='numeric')
+        self.assertEqual(PDESolution.objects.count(), 3)
+        self.assertEqual(SolutionSubmission.objects.count(), 3)
+    
+    def test_failed_solves_are_not_canonical(self):
+        """Test an error result is stored without a hash so it is retried"""
+        failure = {'solution': 'Error solving PDE: timeout', 'method': 'N/A', 'status': 'error'}
+        with mock.patch('pde_solver.views.cached_solve_pde', return_value=failure):
+            self.submit("u_t = u_xx")
+        self.submit("u_t = u_xx")
+        self.assertEqual(PDESolution.objects.count(), 2)
+        self.assertEqual(PDESolution.objects.filter(input_hash__isnull=False).count(), 1)
+    
+    def test_input_hash(self):
+        """Test the hash ignores spacing and condition order but not the mode"""
+        self.assertEqual(input_hash("u_t = u_xx", "u(0,t)=0, u(1,t)=0"), input_hash("u_t=u_xx", "u(1,t)=0,u(0,t)=0"))
+        self.assertNotEqual(input_hash("u_t = u_xx"), input_hash("u_t = u_xx", mode='numeric'))
+        self.assertEqual(input_hash("not ( a pde"), input_hash("not(a pde"))
+    
+    def test_dedupe_command(self):
+        """Test legacy copies merge into the oldest row, keeping their submission times"""
+        rows = [
+            PDESolution.objects.create(equation=equation, solution="s", method_used="Heat")
+            for equation in ("u_t = u_xx", "u_t=u_xx", "u_tt = u_xx", "u_t =  u_xx", "u_tt=u_xx")
+        ]
+        failed = PDESolution.objects.create(equation="u_t = u_xx", solution="Error", method_used="N/A")
+        SolutionArray.store(rows[3], 'u', np.zeros(3))
+        
+        call_command('dedupe_solutions', dry_run=True, stdout=StringIO())
+        self.assertEqual(PDESolution.objects.count(), 6)
+        out = StringIO()
+        call_command('dedupe_solutions', batch_size=2, stdout=out)
+        self.assertIn('Merged 2 duplicate solutions out of 5', out.getvalue())
+        
+        # rows[3] has arrays, so it is a numeric solve and stays separate
+        self.assertEqual(set(PDESolution.objects.values_list('pk', flat=True)), {rows[0].pk, rows[2].pk, rows[3].pk, failed.pk})
+        self.assertEqual(rows[0].submissions.count(), 2)
+        self.assertEqual(rows[2].submissions.count(), 2)
+        self.assertEqual(
+            sorted(rows[0].submissions.values_list('created_at', flat=True)), [rows[0].created_at, rows[1].created_at]
+        )
+        self.assertIsNone(PDESolution.objects.get(pk=failed.pk).input_hash)
+        
+        # Later submissions link to the merged rows
+        with mock.patch('pde_solver.views.cached_solve_pde') as solve:
+            self.submit("u_tt = u_xx")
+        solve.assert_not_called()
+        self.assertEqual(rows[2].submissions.count(), 3)
+        
+        out = StringIO()
+        call_command('dedupe_solutions', stdout=out)
+        self.assertIn('Merged 0 duplicate solutions out of 0', out.getvalue())
+
+
+class MetricsTestCase(TestCase):
+    """Test the in-process histograms, the metrics endpoint and Server-Timing"""
+    
+    def test_histogram_samples(self):
+        """Test buckets render cumulatively with sum and count"""
+        histogram = Histogram('test_seconds', 'Test', ('stage',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, 'parse')
+        self.assertEqual(list(histogram.samples()), [
+            'test_seconds_bucket{stage="parse",le="0.1"} 1',
+            'test_seconds_bucket{stage="parse",le="1.0"} 3',
+            'test_seconds_bucket{stage="parse",le="+Inf"} 4',
+            'test_seconds_sum{stage="parse"} 6.05',
+            'test_seconds_count{stage="parse"} 4',
+        ])
+    
+    def test_counter_escapes_labels(self):
+        """Test label values are escaped"""
+        counter = Counter('test_total', 'Test', ('method',))
+        counter.inc('say "hi"\n')
+        counter.inc('say "hi"\n', amount=2)
+        self.assertEqual(list(counter.samples()), [r'test_total{method="say \"hi\"\n"} 3'])
+    
+    def test_stage_records_errors(self):
+        """Test a failing stage is timed, counted by exception type and re-raised"""
+        registry = get_registry()
+        with collect_stages() as stages:
+            with self.assertRaises(KeyError):
+                with stage('test_stage'):
+                    raise KeyError('x')
+        self.assertEqual([(name, error) for name, _, error in stages], [('test_stage', 'KeyError')])
+        self.assertEqual(registry.stage_errors.value('test_stage', 'KeyError'), 1)
+    
+    def test_solver_stages_and_results(self):
+        """Test solve_pde times its stages and solves are counted by method and status"""
+        registry = get_registry()
+        before = registry.solves.value('Closed-Form Heat Solution', 'success')
+        with self.settings(PDE_SOLVER_SANDBOX={'ENABLED': False}), collect_stages() as stages:
+            sandboxed_solve_pde("u_t = u_xx", "u(0,t)=0, u(1,t)=0", "u(x,0)=sin(pi*x)")
+        self.assertEqual([name for name, _, _ in stages], ['parse', 'classify', 'closed_form', 'render'])
+        self.assertEqual(registry.solves.value('Closed-Form Heat Solution', 'success'), before + 1)
+    
+    def test_sandbox_returns_stages(self):
+        """Test stage timings recorded in a sandbox child reach the parent"""
+        pool = SandboxPool(processes=1, timeout=30)
+        self.addCleanup(pool.close)
+        with collect_stages() as stages:
+            result = pool.solve("u_tt = u_xx + u_yy")
+        self.assertEqual(result['status'], 'success')
+        self.assertIn('parse', [name for name, _, _ in stages])
+    
+    def test_metrics_endpoint(self):
+        """Test requests are counted by URL name and exposed in Prometheus format"""
+        self.client.get(reverse('solution_list'))
+        self.client.get('/no-such-page/')
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn('# TYPE pde_http_request_duration_seconds histogram', text)
+        self.assertIn('pde_http_request_duration_seconds_count{view="solution_list",method="GET",status="200"}', text)
+        self.assertIn('view="unmatched",method="GET",status="404"', text)
+        self.assertIn('pde_stage_duration_seconds_count{stage="db_read"}', text)
+    
+    def test_solution_cache_counters(self):
+        """Test solution cache hits by tier, misses and evictions are exported"""
+        registry = get_registry()
+        before = [registry.cache_hits.value('memory'), registry.cache_hits.value('backend'),
+                  registry.cache_misses.value(), registry.cache_evictions.value()]
+        writer = SolutionCache(max_entries=1, backend='default')
+        writer.set('a', {'status': 'success'})
+        writer.set('b', {'status': 'success'})
+        writer.get('b')
+        SolutionCache(backend='default').get('a')
+        writer.get('missing')
+        after = [registry.cache_hits.value('memory'), registry.cache_hits.value('backend'),
+                 registry.cache_misses.value(), registry.cache_evictions.value()]
+        self.assertEqual([a - b for a, b in zip(after, before)], [1, 1, 1, 1])
+        text = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('# TYPE pde_solution_cache_hits_total counter', text)
+        self.assertIn(f'pde_solution_cache_hits_total{{tier="backend"}} {after[1]}', text)
+        self.assertIn(f'pde_solution_cache_misses_total {after[2]}', text)
+    
+    def test_server_timing_header(self):
+        """Test the Server-Timing header is only added when enabled"""
+        self.assertNotIn('Server-Timing', self.client.get(reverse('solution_list')))
+        with self.settings(PDE_METRICS={'SERVER_TIMING': True}, PDE_SOLVER_SANDBOX={'ENABLED': False}):
+            response = Client().post(reverse('solve_pde'), {'equation': 'u_t = u_xx', 'mode': 'symbolic'})
+        timing = response['Server-Timing']
+        for name in ('cache', 'db_read', 'db_write', 'total'):
+            self.assertRegex(timing, rf'(^|, ){name};dur=\d+\.\d\d')
+    
+    def test_disabled(self):
+        """Test the middleware and endpoint switch off"""
+        with self.settings(PDE_METRICS={'ENABLED': False, 'SERVER_TIMING': True}):
+            client = Client()
+            self.assertNotIn('Server-Timing', client.get(reverse('home')))
+            self.assertEqual(client.get(reverse('metrics')).status_code, 404)
+
+
+class AsyncSolveTestCase(TestCase):
+    """Test the async solve/list endpoints and the bounded solve executor"""
+    
+    def test_executor_bounds_pending_calls(self):
+        """Test submits beyond max_pending are refused until a slot frees up"""
+        executor = BoundedExecutor(1, 2)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        futures = [executor.submit(release.wait, 5), executor.submit(release.wait, 5)]
+        with self.assertRaises(ExecutorBusy):
+            executor.submit(release.wait, 5)
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        executor.submit(int).result(timeout=5)
+        self.assertEqual(executor.pending, 0)
+    
+    def test_full_executor_returns_503(self):
+        """Test the solve API answers 503 with Retry-After when the queue is full"""
+        executor = BoundedExecutor(1, 1)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        executor.submit(release.wait, 5)
+        self.addCleanup(release.set)
+        before = get_registry().rejections.value()
+        with mock.patch('pde_solver.views.get_solve_executor', return_value=executor), \
+                self.settings(PDE_ASYNC_SOLVE={'RETRY_AFTER': 7}):
+            response = self.client.post(reverse('solve_pde_api'), {'equation': 'u_t = u_xx'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertEqual(get_registry().rejections.value(), before + 1)
+    
+    async def test_async_solve(self):
+        """Test the solve API through the async client"""
+        response = await self.async_client.post(reverse('solve_pde_api'), {
+            'equation': 'u_t = u_xx', 'boundary_conditions': 'u(0,t)=0, u(1,t)=0', 'initial_conditions': 'u(x,0)=sin(pi*x)',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['method'], 'Closed-Form Heat Solution')
+    
+    async def test_concurrent_solves_share_the_pool(self):
+        """Test concurrent requests all complete through the executor"""
+        responses = await asyncio.gather(*(
+            self.async_client.post(reverse('solve_pde_api'), {'equation': f'u_t = {k}*u_xx'}) for k in range(1, 5)
+        ))
+        self.assertEqual([r.status_code for r in responses], [200] * 4)
+    
+    async def test_async_solution_list(self):
+        """Test the JSON listing pages with cursors through the async ORM"""
+        for i in range(3):
+            await PDESolution.objects.acreate(equation=f"u_t = {i}*u_xx", solution="s", method_used="Heat")
+        await PDESolution.objects.acreate(equation="u_xx + u_yy = 0", solution="s", method_used="Laplace")
+        response = await self.async_client.get(reverse('solutions_api'), {'size': 2, 'method': 'Heat'})
+        data = response.json()
+        self.assertEqual([r['equation'] for r in data['results']], ["u_t = 2*u_xx", "u_t = 1*u_xx"])
+        self.assertIsNone(data['previous'])
+        response = await self.async_client.get(reverse('solutions_api'), {'size': 2, 'method': 'Heat', 'after': data['next']})
+        data = response.json()
+        self.assertEqual([r['equation'] for r in data['results']], ["u_t = 0*u_xx"])
+        self.assertIsNone(data['next'])
+        self.assertEqual((await self.async_client.get(reverse('solutions_api'), {'after': 'bad'})).status_code, 400)
+    
+    async def test_async_job_status(self):
+        """Test job polling through the async ORM"""
+        job = await SolveJob.objects.acreate(equation="u_t = u_xx")
+        response = await self.async_client.get(reverse('solve_job_status', args=[job.pk]))
+        self.assertEqual(response.json()['status'], 'queued')
+        self.assertEqual((await self.async_client.get(reverse('solve_job_status', args=[job.pk + 1]))).status_code, 404)
+
+
+class ProgressStreamTestCase(TransactionTestCase):
+    """Test the Server-Sent Events progress stream and run cancellation"""
+    
+    HEAT = {'equation': 'u_t = u_xx', 'boundary_conditions': 'u(0,t)=0, u(1,t)=0', 'initial_conditions': 'u(x,0)=sin(pi*x)'}
+    
+    def setUp(self):
+        get_solution_cache().clear()
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = self.settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+    
+    def parse(self, body):
+        """(event, data) pairs of an SSE body, skipping keep-alive comments"""
+        events = []
+        for message in body.split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in message.splitlines() if not line.startswith(':'))
+            if fields:
+                events.append((fields['event'], json.loads(fields['data'])))
+        return events
+    
+    def events(self, response):
+        if response.streaming:
+            return self.parse(b''.join(response.streaming_content).decode())
+        return self.parse(response.content.decode())
+    
+    def slow_solve(self, *args):
+        return sandboxed_solve_pde("u_t = u_xx", mode='numeric', options={'nx': 10 ** 6, 'steps': 10 ** 4})
+    
+    def test_stream_reports_stages_and_saves(self):
+        """Test stage, classification and result events precede the stored solution"""
+        response = self.client.post(reverse('solve_events'), self.HEAT)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self.events(response)
+        names = [name for name, _ in events]
+        self.assertEqual((names[0], names[-1]), ('run', 'done'))
+        stages = [data['stage'] for name, data in events if name == 'stage']
+        self.assertEqual(stages[:3], ['cache', 'parse', 'classify'])
+        self.assertEqual(stages[-2:], ['save', 'store_arrays'])
+        self.assertEqual(dict(events)['classified']['family'], 'heat')
+        self.assertLess(names.index('result'), names.index('done'))
+        elapsed = [data['elapsed'] for name, data in events if name != 'run']
+        self.assertEqual(elapsed, sorted(elapsed))
+        
+        solution = PDESolution.objects.get()
+        self.assertEqual(dict(events)['done']['url'], reverse('solution_detail', args=[solution.pk]))
+        self.assertEqual(dict(events)['result']['solution'], solution.solution)
+        
+        # Identical inputs get one event for the stored row
+        events = self.events(self.client.post(reverse('solve_events'), self.HEAT))
+        self.assertEqual([(name, data['id'], data['reused']) for name, data in events], [('done', solution.pk, True)])
+        self.assertEqual(solution.submissions.count(), 2)
+    
+    def test_numeric_stream_reports_steps(self):
+        """Test numeric solves report their time steps and store arrays"""
+        events = self.events(self.client.post(reverse('solve_events'), dict(self.HEAT, mode='numeric')))
+        steps = [data['step'] for name, data in events if name == 'step']
+        self.assertEqual(steps[:2], [0, 5])
+        self.assertEqual({data['steps'] for name, data in events if name == 'step'}, {100})
+        self.assertTrue(PDESolution.objects.get().arrays.exists())
+    
+    def test_cancel_endpoint(self):
+        """Test a cancelled run kills its solve quickly and saves nothing"""
+        self.assertEqual(self.client.post(reverse('cancel_solve_run', args=['0' * 32])).status_code, 404)
+        with mock.patch('pde_solver.views.solve_input', self.slow_solve):
+            response = self.client.post(reverse('solve_events'), {'equation': 'u_t = u_xx', 'mode': 'numeric'})
+        chunks = iter(response.streaming_content)
+        (name, run), = self.parse(next(chunks).decode())
+        self.assertEqual(name, 'run')
+        self.assertEqual(self.client.post(run['cancel_url']).status_code, 202)
+        events = self.parse(b''.join(chunks).decode())
+        self.assertEqual(events[-1][0], 'cancelled')
+        self.assertLess(events[-1][1]['elapsed'], 10)
+        self.assertFalse(PDESolution.objects.exists())
+        self.assertEqual(self.client.post(run['cancel_url']).status_code, 404)
+    
+    def test_disconnect_cancels(self):
+        """Test closing the stream early stops the run"""
+        with mock.patch('pde_solver.views.solve_input', self.slow_solve):
+            response = self.client.post(reverse('solve_events'), {'equation': 'u_t = u_xx', 'mode': 'numeric'})
+        (_, run), = self.parse(next(iter(response.streaming_content)).decode())
+        response.close()
+        deadline = time.monotonic() + 10
+        while cache.get(f"pde_run:{run['id']}") and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertIsNone(cache.get(f"pde_run:{run['id']}"))
+        self.assertFalse(PDESolution.objects.exists())
+    
+    def test_sandbox_cancel_replaces_child(self):
+        """Test cancelled() stops a sandboxed solve mid-run and the pool keeps working"""
+        pool = SandboxPool(processes=1, timeout=30)
+        self.addCleanup(pool.close)
+        pid = next(iter(pool._children)).process.pid
+        events = []
+        start = time.monotonic()
+        result = pool.solve("u_t = u_xx", mode='numeric', options={'nx': 10 ** 6, 'steps': 10 ** 4},
+                            progress=lambda event, data: events.append(event), cancelled=lambda: 'step' in events)
+        self.assertEqual(result['status'], 'cancelled')
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertNotEqual(next(iter(pool._children)).process.pid, pid)
+        self.assertEqual(pool.solve("u_t = u_xx")['status'], 'success')
+    
+    async def test_async_stream(self):
+        """Test the stream under ASGI is an async iterator ending with the stored solution"""
+        response = await self.async_client.post(reverse('solve_events'), self.HEAT)
+        body = ''.join([chunk.decode() async for chunk in response.streaming_content])
+        events = self.parse(body)
+        self.assertEqual((events[0][0], events[-1][0]), ('run', 'done'))
+        self.assertTrue(await PDESolution.objects.filter(pk=events[-1][1]['id']).aexists())
+
+
 class PDEFormTestCase(TestCase):
     """Test PDEInputForm"""
     
@@ -5,6 +5,20 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('solve/', views.PDESolverView.as_view(), name='solve_pde'),
     path('solutions/', views.SolutionListView.as_view(), name='solution_list'),
+    path('solutions/search/', views.SolutionSearchView.as_view(), name='solution_search'),
     path('solution/<int:pk>/', views.SolutionDetailView.as_view(), name='solution_detail'),
+    path('solution/<int:pk>/sample/', views.sample_solution, name='sample_solution'),
+    path('solution/<int:pk>/download/', views.download_solution, name='download_solution'),
+    path('solution/<int:pk>/plot.<str:output>', views.solution_plot, name='solution_plot'),
+    path('solution/<int:pk>/arrays/', views.solution_arrays, name='solution_arrays'),
+    path('solution/<int:pk>/arrays/<str:name>/', views.solution_array, name='solution_array'),
+    path('metrics/', views.metrics, name='metrics'),
     path('api/solve/', views.solve_pde_api, name='solve_pde_api'),
+    path('api/solve/events/', views.solve_events, name='solve_events'),
+    path('api/solve/runs/<slug:run_id>/cancel/', views.cancel_solve_run, name='cancel_solve_run'),
+    path('api/solutions/', views.solutions_api, name='solutions_api'),
+    path('api/solve/batch/', views.solve_batch_api, name='solve_batch_api'),
+    path('api/solve/sweep/', views.solve_sweep_api, name='solve_sweep_api'),
+    path('api/jobs/', views.submit_solve_job, name='submit_solve_job'),
+    path('api/jobs/<int:pk>/', views.solve_job_status, name='solve_job_status'),
 ]
@@ -1,16 +1,49 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, DetailView, CreateView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib import messages
-from django.http import JsonResponse
-from .models import PDESolution
+import io
+import json
+import os
+from functools import partial
+import numpy as np
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Substr
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .models import PDESolution, SolutionArray, SolutionSubmission, SolveJob
 from .forms import PDEInputForm
-from .solver import PDESolver, COMMON_SOLUTIONS
+from .solver import COMMON_SOLUTIONS
+from .cache import cached_solve_pde, input_hash
+from .sandbox import sandboxed_solve_pde
+from .batch import batch_config, iter_ndjson, solve_batch
+from .evaluation import (
+    PARAMETERS, bounded_axes, compiled_for_solution, evaluate_grid, evaluation_config, query_axis, series_terms,
+    sweep_axes,
+)
+from .parser import VARIABLES
+from .streaming import DTYPES, FORMATS, FieldStream, parse_slice
+from .metrics import get_registry, metrics_config, stage
+from .offload import ExecutorBusy, get_solve_executor, offload_config
+from .progress import SolveRun, cancel_run, sse_event
+from .pagination import akeyset_page, approximate_count, keyset_page
+from .search import search_solutions
+from .plots import PLOT_FORMATS, PLOT_SIZES, open_plot, plotting_available
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def solve_input(equation, boundary_conditions='', initial_conditions='', mode='symbolic'):
+    """Solve one submitted input; numeric results carry arrays and bypass the solution cache"""
+    if mode == 'numeric':
+        return sandboxed_solve_pde(equation, boundary_conditions, initial_conditions, mode='numeric')
+    return cached_solve_pde(equation, boundary_conditions, initial_conditions)
+
+
 class PDESolverView(CreateView):
     """View for solving PDEs"""
     model = PDESolution
@@ -21,28 +54,39 @@ class PDESolverView(CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['common_solutions'] = COMMON_SOLUTIONS
-        context['recent_solutions'] = PDESolution.objects.all()[:5]
+        context['recent_solutions'] = PDESolution.objects.only('equation', 'created_at')[:5]
         return context
     
     def form_valid(self, form):
-        """Solve the PDE when form is submitted"""
+        """Solve the PDE when form is submitted, or reuse the stored solution of identical inputs"""
         equation = form.cleaned_data['equation']
         boundary_conditions = form.cleaned_data.get('boundary_conditions', '')
         initial_conditions = form.cleaned_data.get('initial_conditions', '')
+        mode = form.cleaned_data.get('mode') or 'symbolic'
         
-        # Solve the PDE
-        result = PDESolver.solve_pde(
-            equation,
-            boundary_conditions,
-            initial_conditions
-        )
+        key = input_hash(equation, boundary_conditions, initial_conditions, mode)
+        existing = PDESolution.objects.filter(input_hash=key).only('pk').first()
+        if existing is not None:
+            return self.reuse(existing)
         
-        # Save the solution
-        form.instance.solution = result['solution']
-        form.instance.method_used = result['method']
+        result = solve_input(equation, boundary_conditions, initial_conditions, mode)
         
+        # Save the solution; failures are not canonical, so a later submit retries them
+        solution, created = form.instance.save_result(result, key)
+        if not created:
+            # A concurrent submit stored the same inputs first
+            return self.reuse(solution)
+        self.object = solution
         messages.success(self.request, 'PDE solved successfully!')
-        return super().form_valid(form)
+        return redirect(self.get_success_url())
+    
+    def reuse(self, solution):
+        """Record a submission of already solved inputs against their stored solution"""
+        self.object = solution
+        SolutionSubmission.objects.create(solution=solution)
+        messages.success(self.request, 'PDE solved successfully! These inputs were solved before; '
+                                       'the stored solution was reused.')
+        return redirect(self.get_success_url())
 
 
 class SolutionListView(ListView):
@@ -51,6 +95,56 @@ class SolutionListView(ListView):
     template_name = 'pde_solver/solution_list.html'
     context_object_name = 'solutions'
     paginate_by = 10
+    
+    def get_queryset(self):
+        # Only the listed columns plus a preview of the (large) Markdown solution;
+        # rows with stored arrays are flagged in the same query for the plot previews
+        queryset = PDESolution.objects.only(*PDESolution.LIST_FIELDS).annotate(
+            solution_preview=Substr('solution', 1, 301),
+            has_arrays=Exists(SolutionArray.objects.filter(solution=OuterRef('pk'))),
+        )
+        method = self.request.GET.get('method')
+        if method:
+            queryset = queryset.filter(method_used=method)
+        return queryset
+    
+    def paginate_queryset(self, queryset, page_size):
+        """Keyset pagination on (created_at, id) via ?after= / ?before= cursors instead of OFFSET"""
+        try:
+            page = keyset_page(
+                queryset, page_size, after=self.request.GET.get('after'), before=self.request.GET.get('before')
+            )
+        except ValueError:
+            raise Http404("Invalid page cursor")
+        return None, page, page.object_list, bool(page.next_cursor or page.previous_cursor)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['plots_enabled'] = plotting_available()
+        context['total_solutions'] = approximate_count(PDESolution, settings.PDE_COUNT_CACHE_TIMEOUT)
+        context['method'] = self.request.GET.get('method', '')
+        return context
+
+
+class SolutionSearchView(SolutionListView):
+    """Full-text search over saved solutions (?q=), best matches first"""
+    
+    def get(self, request, *args, **kwargs):
+        if not request.GET.get('q', '').strip():
+            return redirect('solution_list')
+        return super().get(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        return search_solutions(self.request.GET.get('q', ''), super().get_queryset())
+    
+    def paginate_queryset(self, queryset, page_size):
+        # Results are ordered by rank, not (created_at, id), so page numbers are used
+        return super(SolutionListView, self).paginate_queryset(queryset, page_size)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        return context
 
 
 class SolutionDetailView(DetailView):
@@ -58,10 +152,256 @@ class SolutionDetailView(DetailView):
     model = PDESolution
     template_name = 'pde_solver/solution_detail.html'
     context_object_name = 'solution'
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['arrays'] = self.object.arrays.all()
+        context['submissions'] = self.object.submissions.count()
+        context['plots_enabled'] = plotting_available() and (self.object.expression or context['arrays'])
+        if self.object.expression:
+            # Default sampling link: every variable u depends on over [0, 1], parameters set to 1
+            names = [name for name in (*VARIABLES, *PARAMETERS) if name in self.object.expression_names()]
+            query = [f'{name}=0:1:101' if name in VARIABLES else f'{name}=1' for name in names]
+            context['sample_query'] = '&'.join(query + ['format=json'])
+        return context
+
+
+def array_index(text, ndim):
+    """
+    NumPy index from a query such as '3', '10:20' or '-1,0:50:2' (one entry per axis).
+
+    Missing trailing axes are taken whole.
+    """
+    index = []
+    for part in (text.split(',') if text else []):
+        part = part.strip()
+        try:
+            if ':' in part:
+                bounds = [int(bound) if bound.strip() else None for bound in part.split(':')]
+                if len(bounds) > 3 or bounds[2:] == [0]:
+                    raise ValueError
+                index.append(slice(*bounds))
+            else:
+                index.append(int(part))
+        except ValueError:
+            raise ValueError(f"Invalid index '{part}'; use integers and start:stop:step slices")
+    if len(index) > ndim:
+        raise ValueError(f"Too many indices for an array with {ndim} dimensions")
+    return tuple(index)
+
+
+def solution_arrays(request, pk):
+    """API endpoint listing the stored arrays of a solution with their shape and dtype"""
+    solution = get_object_or_404(PDESolution.objects.only('pk'), pk=pk)
+    return JsonResponse({'arrays': [
+        {
+            'name': array.name,
+            'shape': array.shape,
+            'dtype': array.dtype,
+            'url': reverse('solution_array', args=[solution.pk, array.name]),
+        }
+        for array in solution.arrays.all()
+    ]})
+
+
+def solution_array(request, pk, name):
+    """
+    API endpoint for a slice of a stored array, e.g. ``?index=-1`` for the last
+    frame or ``?index=0:10,5`` for a sub-region.
+
+    The file is memory-mapped, so only the selected elements are read.
+    """
+    array = get_object_or_404(SolutionArray, solution_id=pk, name=name)
+    values = array.load()
+    try:
+        part = values[array_index(request.GET.get('index', ''), values.ndim)]
+    except (ValueError, IndexError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    max_values = evaluation_config()['MAX_JSON_VALUES']
+    if np.size(part) > max_values:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Selection has {np.size(part)} values; narrow it with ?index= (at most {max_values})',
+        }, status=400)
+    part = np.asarray(part)
+    return JsonResponse({'name': array.name, 'shape': list(part.shape), 'dtype': array.dtype, 'values': part.tolist()})
+
+
+def download_solution(request, pk):
+    """
+    Stream a solution field as binary, fetching only the requested part.
+
+    The field is a stored array (``array=frames``; by default 'frames', then
+    'u') or, for closed-form solutions, u evaluated on a grid given like the
+    sample endpoint (``t=0:1:101&x=0:1:1001``, time outermost). Options:
+
+    - ``steps=start:stop:step`` rows of the first axis (time steps of frames)
+    - ``stride=k`` every k-th point of the other axes
+    - ``downsample=k`` mean of k-point blocks along the other axes
+    - ``format=raw|npy``, ``dtype=float64|float32``, ``compress=gzip``
+
+    Raw output is little-endian and C-ordered with the shape in X-Shape. The
+    response is generated block by block, so worker memory stays constant.
+    """
+    solution = get_object_or_404(PDESolution.objects.only('pk', 'expression'), pk=pk)
+    try:
+        output = request.GET.get('format', 'raw')
+        if output not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        dtype = DTYPES.get(request.GET.get('dtype', 'float64'))
+        if dtype is None:
+            raise ValueError(f"dtype must be one of {', '.join(DTYPES)}")
+        compress = request.GET.get('compress', '')
+        if compress not in ('', 'gzip'):
+            raise ValueError("compress must be 'gzip'")
+        selection = {
+            'steps': parse_slice(request.GET.get('steps', '')),
+            'stride': int(request.GET.get('stride', 1)),
+            'downsample': int(request.GET.get('downsample', 1)),
+            'dtype': dtype,
+        }
+        if selection['stride'] < 1 or selection['downsample'] < 1:
+            raise ValueError("stride and downsample must be positive")
+        
+        names = [request.GET['array']] if 'array' in request.GET else ['frames', 'u']
+        stored = {array.name: array for array in solution.arrays.filter(name__in=names)}
+        array = next((stored[name] for name in names if name in stored), None)
+        axis_order = ('t',) + tuple(name for name in VARIABLES if name != 't')
+        if array is not None and not any(name in request.GET for name in VARIABLES):
+            stream = FieldStream.from_array(array.load(), **selection)
+            label = array.name
+        elif 'array' in request.GET:
+            raise ValueError(f"No stored array named '{request.GET['array']}'")
+        elif solution.expression:
+            specs = [(name, request.GET[name]) for name in axis_order if name in request.GET]
+            axes = bounded_axes(specs, query_axis)
+            if not axes:
+                raise ValueError("Give the grid to evaluate, e.g. ?t=0:1:101&x=0:1:1001")
+            fixed = {name: float(request.GET[name]) for name in PARAMETERS if name in request.GET}
+            terms = series_terms(request.GET.get('terms'))
+            stream = FieldStream.from_expression(solution.expression, axes, fixed, terms, **selection)
+            label = 'u'
+        else:
+            return JsonResponse({'status': 'error', 'message': 'This solution has no arrays or expression'},
+                                status=422)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    
+    response = StreamingHttpResponse(stream.iter_bytes(output, compress == 'gzip'),
+                                     content_type='application/octet-stream')
+    extension = 'npy' if output == 'npy' else 'bin'
+    if compress:
+        response['Content-Encoding'] = 'gzip'
+    response['Content-Disposition'] = f'attachment; filename="solution-{solution.pk}-{label}.{extension}"'
+    response['X-Shape'] = ','.join(str(size) for size in stream.shape)
+    response['X-Dtype'] = stream.dtype.str
+    return response
+
+
+def solution_plot(request, pk, output):
+    """
+    Plot of a solution (heatmap of u(x, t), contours of u(x, y)) as PNG or SVG.
+
+    ``?size=thumb`` (default) or ``full``. The image is rendered once with a
+    headless Matplotlib backend and then served from disk with ETag and
+    Last-Modified, so repeat views are answered with 304 Not Modified.
+    """
+    solution = get_object_or_404(PDESolution.objects.only('pk', 'expression', 'updated_at'), pk=pk)
+    size = request.GET.get('size', 'thumb')
+    if output not in PLOT_FORMATS or size not in PLOT_SIZES:
+        return JsonResponse({'status': 'error', 'message': 'Unknown plot format or size'}, status=400)
+    try:
+        with stage('plot'):
+            image = open_plot(solution, output, size)
+    except RuntimeError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=503)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Cannot plot solution {pk}: {str(e)}")
+        image = None
+    if image is None:
+        return JsonResponse({'status': 'error', 'message': 'Nothing to plot for this solution'}, status=404)
+    
+    # Stat the open file: a concurrent render may already have removed its path
+    stat = os.fstat(image.fileno())
+    etag = f'"{os.path.basename(image.name)}-{stat.st_size}"'
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        response = FileResponse(image, content_type=PLOT_FORMATS[output])
+    else:
+        image.close()
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = 'public, max-age=86400'
+    return response
+
 
+def sample_solution(request, pk):
+    """
+    Sample a stored solution's u on a grid, e.g. ``?x=0:1:101&t=0:0.5:51&D=0.1``.
 
-def solve_pde_api(request):
-    """API endpoint for solving PDEs (AJAX)"""
+    Variables (x, y, z, t) take 'start:stop:num' ranges or comma separated
+    values; parameters (c, D, k, L) take single values. Optional ``backend``
+    ('numpy' or 'numexpr') and ``terms``. The compiled function is cached per
+    solution and the grid is evaluated in bounded chunks. Returns a .npy array
+    with axes in x, y, z, t order, or JSON with ``format=json`` for grids of
+    at most PDE_EVALUATION['MAX_JSON_VALUES'] points.
+    """
+    solution = get_object_or_404(PDESolution.objects.only('pk', 'expression'), pk=pk)
+    if not solution.expression:
+        return JsonResponse({'status': 'error', 'message': 'This solution has no explicit expression to sample'},
+                            status=422)
+    
+    try:
+        axes = bounded_axes([(name, request.GET[name]) for name in VARIABLES if name in request.GET], query_axis)
+        if not axes:
+            raise ValueError("Give at least one variable, e.g. ?x=0:1:101&t=0:1:11")
+        fixed = {name: float(request.GET[name]) for name in PARAMETERS if name in request.GET}
+        terms = series_terms(request.GET.get('terms'))
+        points = int(np.prod([len(values) for _, values in axes]))
+        max_values = evaluation_config()['MAX_JSON_VALUES']
+        if request.GET.get('format') == 'json' and points > max_values:
+            raise ValueError(f'Grid has {points} points; JSON is limited to {max_values}, '
+                             f'omit format=json for .npy or use the download endpoint')
+        values = evaluate_grid(
+            solution.expression, axes, terms, fixed=fixed, backend=request.GET.get('backend'),
+            compiled=partial(compiled_for_solution, solution.pk),
+        )
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'axes': {name: grid.tolist() for name, grid in axes},
+            'u': np.where(np.isfinite(values), values, None).tolist(),
+        })
+    buffer = io.BytesIO()
+    np.save(buffer, values)
+    response = HttpResponse(buffer.getvalue(), content_type='application/octet-stream')
+    response['Content-Disposition'] = f'attachment; filename="solution-{solution.pk}.npy"'
+    response['X-Sample-Axes'] = ','.join(name for name, _ in axes)
+    return response
+
+
+def busy_response():
+    """503 telling the client when to retry, for solves refused by the bounded executor"""
+    get_registry().rejections.inc()
+    retry_after = offload_config()['RETRY_AFTER']
+    response = JsonResponse({
+        'status': 'error',
+        'message': f'The solver is at capacity; retry in {retry_after} seconds',
+    }, status=503)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+async def solve_pde_api(request):
+    """
+    API endpoint for solving PDEs (AJAX).
+
+    Async: the blocking solve runs in the bounded solve executor, so under
+    ASGI a waiting client holds no thread. When the executor queue is full
+    the request is refused with 503 and a Retry-After header.
+    """
     if request.method == 'POST':
         equation = request.POST.get('equation', '')
         boundary_conditions = request.POST.get('boundary_conditions', '')
@@ -71,12 +411,15 @@ def solve_pde_api(request):
             return JsonResponse({'status': 'error', 'message': 'Equation is required'}, status=400)
         
         try:
-            result = PDESolver.solve_pde(
+            result = await get_solve_executor().run(
+                cached_solve_pde,
                 equation,
                 boundary_conditions,
                 initial_conditions
             )
             return JsonResponse(result)
+        except ExecutorBusy:
+            return busy_response()
         except Exception as e:
             logger.error(f"Error solving PDE: {str(e)}")
             return JsonResponse({
@@ -87,11 +430,216 @@ def solve_pde_api(request):
     return JsonResponse({'status': 'error', 'message': 'Only POST requests allowed'}, status=405)
 
 
+def solve_events(request):
+    """
+    API endpoint that solves the form's PDE and streams its progress as Server-Sent Events.
+
+    Events: ``run`` (id and cancel URL), ``stage``, ``classified``,
+    ``fallback``, ``step`` (numeric time steps), ``result`` (before saving),
+    then ``done`` with the stored solution, ``cancelled`` or ``error``.
+    Each carries the seconds elapsed since the request. Inputs solved before
+    get a single ``done`` event.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Only POST requests allowed'}, status=405)
+    
+    form = PDEInputForm(request.POST)
+    if not form.is_valid():
+        field, errors = next(iter(form.errors.items()))
+        return JsonResponse({'status': 'error', 'message': f'{field}: {errors[0]}'}, status=400)
+    equation = form.cleaned_data['equation']
+    boundary_conditions = form.cleaned_data.get('boundary_conditions', '')
+    initial_conditions = form.cleaned_data.get('initial_conditions', '')
+    mode = form.cleaned_data.get('mode') or 'symbolic'
+    
+    key = input_hash(equation, boundary_conditions, initial_conditions, mode)
+    existing = PDESolution.objects.filter(input_hash=key).only('pk').first()
+    if existing is not None:
+        SolutionSubmission.objects.create(solution=existing)
+        url = reverse('solution_detail', args=[existing.pk])
+        return HttpResponse(sse_event('done', {'id': existing.pk, 'url': url, 'reused': True, 'elapsed': 0.0}),
+                            content_type='text/event-stream')
+    
+    run = SolveRun(
+        partial(solve_input, equation, boundary_conditions, initial_conditions, mode),
+        partial(form.instance.save_result, key=key),
+    )
+    try:
+        run.start(get_solve_executor())
+    except ExecutorBusy:
+        return busy_response()
+    
+    # Django 4.2 buffers iterators of the other kind, so match the server's
+    response = StreamingHttpResponse(
+        run.astream() if isinstance(request, ASGIRequest) else run.stream(),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def cancel_solve_run(request, run_id):
+    """API endpoint stopping a streamed solve; its sandbox process is killed and nothing is saved"""
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Only POST requests allowed'}, status=405)
+    if not cancel_run(run_id):
+        raise Http404("No such run")
+    return JsonResponse({'status': 'cancelling', 'id': run_id}, status=202)
+
+
+async def solutions_api(request):
+    """
+    API endpoint listing saved solutions as JSON, newest first.
+
+    Async, through the async ORM. Takes the list page's ``after``/``before``
+    cursors and ``method`` filter, plus ``size`` (at most 100).
+    """
+    try:
+        size = min(100, max(1, int(request.GET.get('size', 20))))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'size must be an integer'}, status=400)
+    queryset = PDESolution.objects.only('equation', 'method_used', 'expression', 'created_at')
+    if request.GET.get('method'):
+        queryset = queryset.filter(method_used=request.GET['method'])
+    try:
+        page = await akeyset_page(queryset, size, after=request.GET.get('after'), before=request.GET.get('before'))
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({
+        'results': [{
+            'id': solution.pk,
+            'equation': solution.equation,
+            'method': solution.method_used,
+            'expression': solution.expression,
+            'created_at': solution.created_at.isoformat(),
+            'url': reverse('solution_detail', args=[solution.pk]),
+        } for solution in page.object_list],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+def solve_batch_api(request):
+    """
+    API endpoint for solving a JSON array of PDEs in one request.
+
+    The body is a list of {equation, boundary_conditions, initial_conditions}
+    objects. By default the response is ``{"results": [...]}`` in input order.
+    With ``?stream=1`` (or ``Accept: application/x-ndjson``) it is NDJSON, one
+    ``{"index": i, ...result}`` line per item as its solve finishes.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Only POST requests allowed'}, status=405)
+    
+    try:
+        items = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({'status': 'error', 'message': 'Body must be a JSON array'}, status=400)
+    if not isinstance(items, list) or not items:
+        return JsonResponse({'status': 'error', 'message': 'Body must be a non-empty JSON array'}, status=400)
+    max_items = batch_config()['MAX_ITEMS']
+    if len(items) > max_items:
+        return JsonResponse({'status': 'error', 'message': f'At most {max_items} items per batch'}, status=400)
+    
+    if request.GET.get('stream') or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        return StreamingHttpResponse(iter_ndjson(items), content_type='application/x-ndjson')
+    return JsonResponse({'results': solve_batch(items)})
+
+
+def solve_sweep_api(request):
+    """
+    API endpoint for evaluating one symbolic solution over a parameter sweep.
+
+    The JSON body holds ``equation``, ``boundary_conditions``,
+    ``initial_conditions``, ``parameters`` (e.g. ``{"D": [0.1, 1.0]}``) and
+    ``grid`` (e.g. ``{"x": {"start": 0, "stop": 1, "num": 101}, "t": [0, 0.1]}``),
+    plus optional ``dtype`` ('float32' or 'float64') and ``terms`` for infinite
+    series. The PDE is solved once with the parameters left symbolic and the
+    lambdified solution is evaluated over the whole grid in one call. The
+    response is a .npy array with one axis per parameter, then per variable;
+    the axis names are listed in the X-Sweep-Axes header.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Only POST requests allowed'}, status=405)
+    
+    try:
+        body = json.loads(request.body)
+        if not isinstance(body, dict) or not body.get('equation'):
+            raise ValueError("Equation is required")
+        dtype = {'float32': np.float32, 'float64': np.float64}.get(body.get('dtype', 'float64'))
+        if dtype is None:
+            raise ValueError("dtype must be 'float32' or 'float64'")
+        axes = sweep_axes(body.get('parameters', {}), body.get('grid', {}))
+        terms = series_terms(body.get('terms'))
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    
+    result = cached_solve_pde(body['equation'], body.get('boundary_conditions', ''), body.get('initial_conditions', ''))
+    if result['status'] != 'success':
+        return JsonResponse(result, status=422)
+    if 'expression' not in result:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'No closed-form solution for these conditions; a sweep needs an explicit u',
+            'method': result['method'],
+        }, status=422)
+    
+    try:
+        values = evaluate_grid(result['expression'], axes, terms, dtype)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    
+    buffer = io.BytesIO()
+    np.save(buffer, values)
+    response = HttpResponse(buffer.getvalue(), content_type='application/octet-stream')
+    response['Content-Disposition'] = 'attachment; filename="sweep.npy"'
+    response['X-Sweep-Axes'] = ','.join(name for name, _ in axes)
+    return response
+
+
+def submit_solve_job(request):
+    """API endpoint that queues a PDE solve for the worker pool"""
+    if request.method == 'POST':
+        equation = request.POST.get('equation', '')
+        if not equation:
+            return JsonResponse({'status': 'error', 'message': 'Equation is required'}, status=400)
+        
+        job = SolveJob.objects.create(
+            equation=equation,
+            boundary_conditions=request.POST.get('boundary_conditions', ''),
+            initial_conditions=request.POST.get('initial_conditions', ''),
+        )
+        return JsonResponse({
+            'id': job.pk,
+            'status': job.status,
+            'poll_url': reverse('solve_job_status', args=[job.pk]),
+        }, status=202)
+    
+    return JsonResponse({'status': 'error', 'message': 'Only POST requests allowed'}, status=405)
+
+
+async def solve_job_status(request, pk):
+    """API endpoint for polling a queued solve"""
+    try:
+        job = await SolveJob.objects.aget(pk=pk)
+    except SolveJob.DoesNotExist:
+        raise Http404("No such job")
+    return JsonResponse(job.as_dict())
+
+
+def metrics(request):
+    """Request, stage, solver and solution cache metrics of this process in Prometheus text format"""
+    if not metrics_config()['ENABLED']:
+        return JsonResponse({'status': 'error', 'message': 'Metrics are disabled'}, status=404)
+    return HttpResponse(get_registry().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def home(request):
     """Home page view"""
     context = {
-        'total_solutions': PDESolution.objects.count(),
-        'recent_solutions': PDESolution.objects.all()[:3],
+        'total_solutions': approximate_count(PDESolution, settings.PDE_COUNT_CACHE_TIMEOUT),
+        'recent_solutions': PDESolution.objects.only('equation', 'method_used', 'created_at')[:3],
         'common_solutions': COMMON_SOLUTIONS,
     }
     return render(request, 'pde_solver/home.html', context)